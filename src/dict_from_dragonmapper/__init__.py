@@ -1 +1,27 @@
-from dict_from_dragonmapper.api import word_to_ipa
+from importlib import import_module
+
+# the modules are imported on first access because the transcription imports many modules which
+# would slow down the start of the CLI
+LAZY_EXPORTS = {
+  "get_syllable_cache_stats": "dict_from_dragonmapper.api",
+  "iter_word_ipa": "dict_from_dragonmapper.api",
+  "iter_words_to_ipa": "dict_from_dragonmapper.api",
+  "set_syllable_cache_size": "dict_from_dragonmapper.api",
+  "word_to_ipa": "dict_from_dragonmapper.api",
+  "words_to_ipa": "dict_from_dragonmapper.api",
+  "Transcriber": "dict_from_dragonmapper.transcriber",
+}
+
+__all__ = list(LAZY_EXPORTS)
+
+
+def __getattr__(name: str):
+  if name not in LAZY_EXPORTS:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  result = getattr(import_module(LAZY_EXPORTS[name]), name)
+  globals()[name] = result
+  return result
+
+
+def __dir__():
+  return sorted(set(globals()) | set(LAZY_EXPORTS))
@@ -1,19 +1,138 @@
-from typing import Tuple
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Generator, Iterable, List, Optional, Tuple
 
 from ordered_set import OrderedSet
 
+from dict_from_dragonmapper.cache import CacheStats
+from dict_from_dragonmapper.chunks import get_chunks, get_max_pending_chunks, iter_chunk_results
+from dict_from_dragonmapper.transcription import (configure_syllable_cache, is_transcribable,
+                                                  try_word_to_ipa)
+from dict_from_dragonmapper.transcription import \
+  get_syllable_cache_stats as transcription_get_syllable_cache_stats
+from dict_from_dragonmapper.transcription import iter_word_ipa as transcription_iter_word_ipa
 from dict_from_dragonmapper.transcription import word_to_ipa as transcription_word_to_ipa
 
+# importing the pool would load `multiprocessing` for each transcription
+if TYPE_CHECKING:
+  from multiprocessing.pool import Pool
 
-def word_to_ipa(word: str) -> OrderedSet[Tuple[str, ...]]:
+
+# amount of words which are transcribed together, e.g., by one process of the pool
+DEFAULT_BATCH_CHUNKSIZE = 1000
+
+
+def word_to_ipa(word: str, max_pronunciations: Optional[int] = None) -> OrderedSet[Tuple[str, ...]]:
+  validate_word(word)
+  validate_max_pronunciations(max_pronunciations)
+
+  if len(word) == 0:
+    return OrderedSet()
+
+  result = transcription_word_to_ipa(word, max_pronunciations)
+  return result
+
+
+def iter_word_ipa(word: str) -> Generator[Tuple[str, ...], None, None]:
+  # yields the pronunciations of `word_to_ipa` one after another, therefore the pronunciations of
+  # words with many polyphonic syllables can be taken without creating all of them
+  validate_word(word)
+
+  if len(word) == 0:
+    return
+
+  yield from transcription_iter_word_ipa(word)
+
+
+def words_to_ipa(words: Iterable[str], max_pronunciations: Optional[int] = None, pool: Optional["Pool"] = None, chunksize: int = DEFAULT_BATCH_CHUNKSIZE, n_jobs: Optional[int] = None) -> List[OrderedSet[Tuple[str, ...]]]:
+  # returns the transcriptions in the order of the words; each word is only transcribed once and
+  # repeated words share their transcriptions
+  words = list(iter_validated_words(words))
+  unique_words = OrderedSet(words)
+  transcriptions = dict(zip(
+    unique_words,
+    iter_words_to_ipa(unique_words, max_pronunciations, pool, chunksize, n_jobs)
+  ))
+  result = [transcriptions[word] for word in words]
+  return result
+
+
+def iter_words_to_ipa(words: Iterable[str], max_pronunciations: Optional[int] = None, pool: Optional["Pool"] = None, chunksize: int = DEFAULT_BATCH_CHUNKSIZE, n_jobs: Optional[int] = None) -> Generator[OrderedSet[Tuple[str, ...]], None, None]:
+  # yields the transcriptions in the order of the words; words which can't be transcribed have
+  # no transcriptions; repeated words are transcribed once per chunk; `n_jobs` is the amount of
+  # processes of the pool, it defaults to the amount of CPUs like the pool does
+  validate_max_pronunciations(max_pronunciations)
+  if not isinstance(chunksize, int):
+    raise ValueError("Parameter chunksize: Value needs to be of type 'int'!")
+  if chunksize <= 0:
+    raise ValueError("Parameter chunksize: Value needs to be greater than zero!")
+  if n_jobs is not None:
+    if not isinstance(n_jobs, int):
+      raise ValueError("Parameter n_jobs: Value needs to be of type 'int'!")
+    if n_jobs <= 0:
+      raise ValueError("Parameter n_jobs: Value needs to be greater than zero!")
+
+  method = partial(transcribe_words, max_pronunciations=max_pronunciations)
+  chunks = get_chunks(iter_validated_words(words), chunksize)
+  if pool is None:
+    chunk_results = map(method, chunks)
+  else:
+    # in contrast to `imap` the words are only read while the results are taken
+    chunk_results = (
+      chunk_result
+      for _, chunk_result in iter_chunk_results(
+        pool, method, chunks, get_max_pending_chunks(n_jobs))
+    )
+  for chunk_result in chunk_results:
+    yield from chunk_result
+
+
+def transcribe_words(words: Tuple[str, ...], max_pronunciations: Optional[int]) -> List[OrderedSet[Tuple[str, ...]]]:
+  transcriptions: Dict[str, OrderedSet[Tuple[str, ...]]] = {}
+  for word in words:
+    if word in transcriptions:
+      continue
+    if len(word) == 0 or not is_transcribable(word):
+      transcriptions[word] = OrderedSet()
+      continue
+    word_IPAs = try_word_to_ipa(word, max_pronunciations)
+    transcriptions[word] = OrderedSet() if word_IPAs is None else word_IPAs
+  # repeated words refer to the same transcriptions which are therefore only transferred once
+  # from a process of the pool
+  result = [transcriptions[word] for word in words]
+  return result
+
+
+def iter_validated_words(words: Iterable[str]) -> Generator[str, None, None]:
+  for word in words:
+    validate_word(word)
+    yield word
+
+
+def validate_word(word: str) -> None:
   if not isinstance(word, str):
     raise ValueError("Parameter word: Value needs to be of type 'str'!")
 
   if " " in word:
     raise ValueError("Parameter word: Words containing space are not allowed!")
 
-  if len(word) == 0:
-    return tuple()
 
-  result = transcription_word_to_ipa(word)
-  return result
+def validate_max_pronunciations(max_pronunciations: Optional[int]) -> None:
+  if max_pronunciations is not None:
+    if not isinstance(max_pronunciations, int):
+      raise ValueError("Parameter max_pronunciations: Value needs to be of type 'int'!")
+    if max_pronunciations <= 0:
+      raise ValueError("Parameter max_pronunciations: Value needs to be greater than zero!")
+
+
+def set_syllable_cache_size(size: int) -> None:
+  if not isinstance(size, int):
+    raise ValueError("Parameter size: Value needs to be of type 'int'!")
+
+  if size < 0:
+    raise ValueError("Parameter size: Value needs to be greater than or equal to zero!")
+
+  configure_syllable_cache(size)
+
+
+def get_syllable_cache_stats() -> CacheStats:
+  return transcription_get_syllable_cache_stats()
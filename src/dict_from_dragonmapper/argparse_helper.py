@@ -1,13 +1,16 @@
 import argparse
 import codecs
+import glob
 from argparse import ArgumentParser, ArgumentTypeError
 from functools import partial
 from multiprocessing import cpu_count
 from pathlib import Path
-from typing import Callable, List, Optional, TypeVar
+from typing import Callable, List, Optional, Tuple, TypeVar
 
 from ordered_set import OrderedSet
 
+from dict_from_dragonmapper.streams import STDIO_PATH
+
 T = TypeVar("T")
 
 DEFAULT_ENCODING = "UTF-8"
@@ -112,6 +115,21 @@ def parse_existing_file(value: str) -> Path:
   return path
 
 
+def parse_existing_files_or_stdio(value: str) -> List[Path]:
+  # glob patterns are expanded, e.g., if they were quoted to not exceed the maximum length of the
+  # command line
+  if value == str(STDIO_PATH):
+    return [STDIO_PATH]
+  path = parse_path(value)
+  if path.is_file() or not any(character in value for character in "*?["):
+    return [parse_existing_file(value)]
+  paths = sorted(Path(match) for match in glob.glob(value, recursive=True))
+  result = [path for path in paths if path.is_file()]
+  if len(result) == 0:
+    raise ArgumentTypeError("No files were found!")
+  return result
+
+
 def parse_existing_directory(value: str) -> Path:
   path = parse_path(value)
   if not path.is_dir():
@@ -197,3 +215,15 @@ def parse_non_negative_integer(value: str) -> int:
   if not value >= 0:
     raise ArgumentTypeError("Value needs to be greater than or equal to zero!")
   return value
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+  # e.g., 2/10 for the second of ten shards
+  value = parse_required(value)
+  parts = value.split("/")
+  if len(parts) != 2 or not all(part.isdigit() for part in parts):
+    raise ArgumentTypeError("Value needs to be of format K/N!")
+  shard, shards = int(parts[0]), int(parts[1])
+  if not 1 <= shard <= shards:
+    raise ArgumentTypeError("K needs to be between 1 and N!")
+  return shard, shards
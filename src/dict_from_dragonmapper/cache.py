@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass()
+class CacheStats():
+  hits: int = 0
+  misses: int = 0
+  evictions: int = 0
+  # lookups which were answered before reaching the cache, e.g., by the hanzi table; they are not
+  # part of the hit ratio
+  table_hits: int = 0
+
+  def update(self, other: "CacheStats") -> None:
+    self.hits += other.hits
+    self.misses += other.misses
+    self.evictions += other.evictions
+    self.table_hits += other.table_hits
+
+  def get_hit_ratio(self) -> Optional[float]:
+    total = self.hits + self.misses
+    if total == 0:
+      return None
+    return self.hits / total
+
+
+class LRUCache(Generic[T]):
+  """Least-recently-used cache with a fixed amount of entries; a size of zero disables caching."""
+
+  def __init__(self, maxsize: int) -> None:
+    assert maxsize >= 0
+    self.maxsize = maxsize
+    self.stats = CacheStats()
+    self.__entries: OrderedDict = OrderedDict()
+
+  def __len__(self) -> int:
+    return len(self.__entries)
+
+  def lookup(self, key: Hashable) -> Tuple[bool, Optional[T]]:
+    entries = self.__entries
+    if key in entries:
+      entries.move_to_end(key)
+      self.stats.hits += 1
+      return True, entries[key]
+    self.stats.misses += 1
+    return False, None
+
+  def add(self, key: Hashable, value: T) -> None:
+    if self.maxsize == 0:
+      return
+    entries = self.__entries
+    entries[key] = value
+    entries.move_to_end(key)
+    if len(entries) > self.maxsize:
+      entries.popitem(last=False)
+      self.stats.evictions += 1
+
+  def pop_stats(self) -> CacheStats:
+    result = self.stats
+    self.stats = CacheStats()
+    return result
+
+  def clear(self) -> None:
+    self.__entries.clear()
@@ -0,0 +1,52 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from dict_from_dragonmapper.dictionary_writer import WriterCheckpoint
+
+# needs to be increased if the layout of the checkpoint changes
+CHECKPOINT_FORMAT = 1
+
+DEFAULT_CHECKPOINT_INTERVAL = 100000
+
+
+@dataclass()
+class Checkpoint():
+  # amount of words of the vocabulary which were written to the dictionary or the unresolved words
+  words: int
+  writer: WriterCheckpoint
+  # contains all values which need to be the same to resume the run
+  key: str
+
+
+def get_checkpoint_key(*values: Any) -> str:
+  result = json.dumps((CHECKPOINT_FORMAT, *values), ensure_ascii=False, default=str)
+  return result
+
+
+def save_checkpoint(checkpoint: Checkpoint, path: Path) -> None:
+  # the checkpoint is replaced at once to not leave an incomplete checkpoint if the run is stopped
+  # while it is written
+  path.parent.mkdir(parents=True, exist_ok=True)
+  serialized = {
+    "format": CHECKPOINT_FORMAT,
+    **asdict(checkpoint),
+  }
+  tmp_path = path.with_name(path.name + ".tmp")
+  tmp_path.write_text(json.dumps(serialized, ensure_ascii=False), encoding="UTF-8")
+  os.replace(tmp_path, path)
+
+
+def load_checkpoint(path: Path) -> Optional[Checkpoint]:
+  # returns None if the checkpoint was created with another format
+  serialized = json.loads(path.read_text(encoding="UTF-8"))
+  if serialized.get("format") != CHECKPOINT_FORMAT:
+    return None
+  result = Checkpoint(
+    words=serialized["words"],
+    writer=WriterCheckpoint(**serialized["writer"]),
+    key=serialized["key"],
+  )
+  return result
@@ -0,0 +1,118 @@
+import os
+from collections import deque
+from itertools import islice
+from threading import Condition, Thread
+from typing import (TYPE_CHECKING, Callable, Deque, Generator, Iterable, List, Optional, Tuple,
+                    TypeVar)
+
+# the pool is only needed for the annotations, importing it would load `multiprocessing` for
+# each transcription of the API
+if TYPE_CHECKING:
+  from multiprocessing.pool import AsyncResult, Pool
+
+T = TypeVar("T")
+
+MAX_PENDING_CHUNKS_PER_PROCESS = 2
+
+# seconds after which the words of a stream which were read so far are transcribed even if the
+# chunk is not full yet; finished results are also passed on in this interval
+STREAM_TIMEOUT = 0.1
+
+
+def get_chunks(words: Iterable[str], chunksize: int) -> Generator[Tuple[str, ...], None, None]:
+  iterator = iter(words)
+  while chunk := tuple(islice(iterator, chunksize)):
+    yield chunk
+
+
+def get_streamed_chunks(words: Iterable[str], chunksize: int, timeout: float) -> Generator[Optional[Tuple[str, ...]], None, None]:
+  # the words are read by a thread, therefore waiting for the next words doesn't block; the words
+  # which were read so far are yielded if no chunk was filled within `timeout` seconds and None is
+  # yielded if there were no words
+  condition = Condition()
+  # the reading waits until the last full chunk was taken
+  full_chunks: Deque[Tuple[str, ...]] = deque()
+  # contains the words of the chunk which is currently read
+  words_buffer: List[str] = []
+  is_finished = False
+  # is set if the chunks are not taken anymore, e.g., because the generator was closed
+  is_stopped = False
+  # is raised again after the chunks which were read before were taken
+  error: Optional[Exception] = None
+
+  def read_words() -> None:
+    nonlocal is_finished, error
+    try:
+      for word in words:
+        with condition:
+          if is_stopped:
+            break
+          words_buffer.append(word)
+          if len(words_buffer) == chunksize:
+            full_chunks.append(tuple(words_buffer))
+            words_buffer.clear()
+            condition.notify()
+            condition.wait_for(lambda: len(full_chunks) == 0 or is_stopped)
+            if is_stopped:
+              break
+    except Exception as ex:
+      error = ex
+    with condition:
+      is_finished = True
+      condition.notify()
+
+  # the thread doesn't keep the program running while it waits for the next word
+  reader = Thread(target=read_words, daemon=True)
+  reader.start()
+  try:
+    while True:
+      with condition:
+        condition.wait_for(lambda: len(full_chunks) > 0 or is_finished, timeout)
+        if len(full_chunks) > 0:
+          chunk = full_chunks.popleft()
+          condition.notify()
+        else:
+          chunk = tuple(words_buffer)
+          words_buffer.clear()
+          reading_finished = is_finished
+      if len(chunk) > 0:
+        yield chunk
+      elif reading_finished:
+        break
+      else:
+        yield None
+  finally:
+    # the thread stops after the word which it currently waits for
+    with condition:
+      is_stopped = True
+      condition.notify_all()
+  if error is not None:
+    raise error
+
+
+def iter_chunk_results(pool: "Pool", method: Callable[[Tuple[str, ...]], T], chunks: Iterable[Optional[Tuple[str, ...]]], max_pending_chunks: int) -> Generator[Tuple[Tuple[str, ...], T], None, None]:
+  # yields each chunk together with its result in the order of the chunks; in contrast to `imap`
+  # the next chunks are only taken if less than `max_pending_chunks` chunks are waiting for their
+  # results, therefore the words can be streamed without reading all of them into memory; the
+  # chunks can contain None to only yield the results which are finished so far
+  assert max_pending_chunks > 0
+  pending: Deque[Tuple[Tuple[str, ...], "AsyncResult"]] = deque()
+  for chunk in chunks:
+    if chunk is not None:
+      pending.append((chunk, pool.apply_async(method, (chunk,))))
+    # results which are finished early are kept back until the results of all previous chunks
+    # are yielded
+    while len(pending) >= max_pending_chunks or (len(pending) > 0 and pending[0][1].ready()):
+      finished_chunk, result = pending.popleft()
+      yield finished_chunk, result.get()
+  while len(pending) > 0:
+    finished_chunk, result = pending.popleft()
+    yield finished_chunk, result.get()
+
+
+def get_max_pending_chunks(n_jobs: Optional[int]) -> int:
+  # each process has one chunk to work on and one chunk which is waiting; without an amount of
+  # processes the pool has one process per CPU like `Pool` by default
+  if n_jobs is None:
+    n_jobs = os.cpu_count() or 1
+  return MAX_PENDING_CHUNKS_PER_PROCESS * n_jobs
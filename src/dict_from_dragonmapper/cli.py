@@ -2,35 +2,105 @@ import argparse
 import logging
 import sys
 from argparse import ArgumentParser
-from importlib.metadata import version
 from logging import getLogger
-from typing import Callable, Generator, List, Tuple
-
-from dict_from_dragonmapper.main import get_app_try_add_vocabulary_from_pronunciations_parser
-
-__version__ = version("dict-from-dragonmapper")
+from typing import Callable, Generator, List, Optional, Tuple
 
 INVOKE_HANDLER_VAR = "invoke_handler"
 
+# command which is used if no command is given to stay compatible with the former usage
+DEFAULT_COMMAND = "create"
+
 
 Parsers = Generator[Tuple[str, str, Callable], None, None]
 
 
+def get_version() -> str:
+  # the version is only retrieved if it is needed because importing the metadata takes long
+  from importlib.metadata import version
+  return version("dict-from-dragonmapper")
+
+
+def __getattr__(name: str):
+  # `__version__` is resolved on first access
+  if name != "__version__":
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  result = get_version()
+  globals()[name] = result
+  return result
+
+
 def formatter(prog):
   return argparse.ArgumentDefaultsHelpFormatter(prog, max_help_position=40)
 
 
-def _init_parser():
+class VersionAction(argparse.Action):
+  # the version is only retrieved if it is printed
+  def __init__(self, option_strings: List[str], dest: str = argparse.SUPPRESS, default: str = argparse.SUPPRESS, help: str = "show program's version number and exit") -> None:
+    super().__init__(option_strings=option_strings, dest=dest, default=default, nargs=0, help=help)
+
+  def __call__(self, parser: ArgumentParser, namespace: argparse.Namespace, values, option_string: Optional[str] = None) -> None:
+    print(f"{parser.prog} {get_version()}")
+    parser.exit()
+
+
+# the parsers are imported only if their command is used because the transcription imports
+# many modules which would slow down the start of all other commands
+
+
+def get_create_parser(parser: ArgumentParser) -> Callable:
+  from dict_from_dragonmapper.main import get_app_try_add_vocabulary_from_pronunciations_parser
+  return get_app_try_add_vocabulary_from_pronunciations_parser(parser)
+
+
+def get_build_table_parser(parser: ArgumentParser) -> Callable:
+  from dict_from_dragonmapper.main import get_build_hanzi_table_parser
+  return get_build_hanzi_table_parser(parser)
+
+
+def get_verify_tables_parser(parser: ArgumentParser) -> Callable:
+  from dict_from_dragonmapper.main import get_verify_tables_parser
+  return get_verify_tables_parser(parser)
+
+
+def get_merge_parser(parser: ArgumentParser) -> Callable:
+  from dict_from_dragonmapper.main import get_merge_parser
+  return get_merge_parser(parser)
+
+
+def get_parsers() -> Parsers:
+  yield DEFAULT_COMMAND, "create dictionary from vocabulary", get_create_parser
+  yield "build-table", "build table containing the transcriptions of all characters", get_build_table_parser
+  yield "verify-tables", "verify that the precomputed tables match the transcription", get_verify_tables_parser
+  yield "merge", "join the dictionaries or unresolved words of the shards of a vocabulary", get_merge_parser
+
+
+def _init_parser(command: Optional[str] = None):
+  # only the arguments of the given command are added, all other commands are only listed
   main_parser = ArgumentParser(formatter_class=formatter)
-  main_parser.add_argument('-v', '--version', action='version', version='%(prog)s ' + __version__)
-  method = get_app_try_add_vocabulary_from_pronunciations_parser(main_parser)
-  main_parser.set_defaults(**{
-      INVOKE_HANDLER_VAR: method,
-  })
+  main_parser.add_argument('-v', '--version', action=VersionAction)
+  subparsers = main_parser.add_subparsers(help="description", metavar="COMMAND")
+
+  for method_command, description, method in get_parsers():
+    method_parser = subparsers.add_parser(
+      method_command, help=description, formatter_class=formatter)
+    if method_command != command:
+      continue
+    invoke_method = method(method_parser)
+    method_parser.set_defaults(**{
+      INVOKE_HANDLER_VAR: invoke_method,
+    })
 
   return main_parser
 
 
+def insert_default_command(args: List[str]) -> List[str]:
+  commands = {command for command, _, _ in get_parsers()}
+  first_arg = args[0]
+  if first_arg in commands or first_arg in {"-h", "--help", "-v", "--version"}:
+    return args
+  return [DEFAULT_COMMAND] + args
+
+
 def configure_logger(productive: bool) -> None:
   loglevel = logging.INFO if productive else logging.DEBUG
   main_logger = getLogger()
@@ -55,24 +125,29 @@ def parse_args(args: List[str], productive: bool = False):
   logger = getLogger(__name__)
   logger.debug("Received args:")
   logger.debug(args)
-  parser = _init_parser()
   if len(args) == 0:
+    parser = _init_parser()
     parser.print_help()
     return
 
+  args = insert_default_command(args)
+  parser = _init_parser(args[0])
   received_args = parser.parse_args(args)
   params = vars(received_args)
 
   if INVOKE_HANDLER_VAR in params:
-    invoke_handler: Callable[[ArgumentParser], None] = params.pop(INVOKE_HANDLER_VAR)
-    invoke_handler(received_args)
+    invoke_handler: Callable[[ArgumentParser], bool] = params.pop(INVOKE_HANDLER_VAR)
+    success = invoke_handler(received_args)
+    return success
   else:
     parser.print_help()
 
 
 def run(productive: bool):
   arguments = sys.argv[1:]
-  parse_args(arguments, productive)
+  success = parse_args(arguments, productive)
+  if success is False:
+    sys.exit(1)
 
 
 def run_prod():
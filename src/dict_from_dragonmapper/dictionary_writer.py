@@ -0,0 +1,133 @@
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, TextIO
+
+from pronunciation_dictionary import Pronunciations, SerializationOptions, Word, serialize
+
+from dict_from_dragonmapper.streams import (COMPRESSION_AUTO, get_compression, is_stdio,
+                                            open_output)
+
+
+@dataclass()
+class WriterCheckpoint():
+  # sizes of the files in bytes; the OOV file isn't created if no OOV word was written
+  dictionary_size: int
+  oov_size: Optional[int]
+  written_entries: int
+  written_oov_words: int
+
+
+class DictionaryWriter():
+  """Writes dictionary entries and OOV words directly to their files in the order they are passed.
+
+  The resulting files are the same as the ones written by `save_dict` and by joining the OOV words
+  with line breaks. The OOV file is only created if at least one OOV word was written. Both can be
+  written to stdout by passing `-` as path and are compressed depending on their extension or the
+  given compression. Uncompressed lines which are written to stdout end with a line break and are
+  passed on as soon as an entry is written.
+
+  A writer which is created with a checkpoint continues the files like they were when the checkpoint
+  was taken, i.e., everything which was written afterwards is removed. This is only supported for
+  uncompressed files.
+  """
+
+  def __init__(self, dictionary_path: Path, encoding: str, options: SerializationOptions, oov_path: Optional[Path], oov_encoding: str, compression: str = COMPRESSION_AUTO, checkpoint: Optional[WriterCheckpoint] = None) -> None:
+    self.dictionary_path = dictionary_path
+    self.encoding = encoding
+    self.options = options
+    self.oov_path = oov_path
+    self.oov_encoding = oov_encoding
+    self.compression = compression
+    self.checkpoint = checkpoint
+    self.written_entries = 0
+    self.written_oov_words = 0
+    self.__dictionary_file: Optional[TextIO] = None
+    self.__oov_file: Optional[TextIO] = None
+    self.__dictionary_is_empty = True
+    # in files the lines are separated by line breaks, i.e., the last line of an entry is only
+    # completed if another entry follows; a program which reads the lines from a pipe needs each
+    # line to be completed and passed on at once
+    self.__is_dictionary_pipe = is_pipe(dictionary_path, compression)
+    self.__is_oov_pipe = oov_path is not None and is_pipe(oov_path, compression)
+
+  def __enter__(self) -> "DictionaryWriter":
+    if self.checkpoint is None:
+      self.__dictionary_file = open_output(self.dictionary_path, self.encoding, self.compression)
+      return self
+
+    os.truncate(self.dictionary_path, self.checkpoint.dictionary_size)
+    self.__dictionary_file = open_output(
+      self.dictionary_path, self.encoding, self.compression, append=True)
+    self.__dictionary_is_empty = self.checkpoint.written_entries == 0
+    self.written_entries = self.checkpoint.written_entries
+    if self.oov_path is not None:
+      if self.checkpoint.oov_size is None:
+        self.oov_path.unlink(missing_ok=True)
+      else:
+        os.truncate(self.oov_path, self.checkpoint.oov_size)
+        self.__oov_file = open_output(self.oov_path, self.oov_encoding, self.compression, append=True)
+    self.written_oov_words = self.checkpoint.written_oov_words
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.close()
+
+  def write_entry(self, word: Word, pronunciations: Pronunciations) -> None:
+    assert self.__dictionary_file is not None
+    assert len(pronunciations) > 0
+    lines = serialize(OrderedDict(((word, pronunciations),)), self.options)
+    if self.__is_dictionary_pipe:
+      self.__dictionary_file.write("".join(f"{line}\n" for line in lines))
+      self.__dictionary_file.flush()
+    else:
+      for line in lines:
+        if not self.__dictionary_is_empty:
+          self.__dictionary_file.write("\n")
+        self.__dictionary_file.write(line)
+        self.__dictionary_is_empty = False
+    self.written_entries += 1
+
+  def write_oov(self, word: Word) -> None:
+    if self.oov_path is not None:
+      if self.__oov_file is None:
+        self.__oov_file = open_output(self.oov_path, self.oov_encoding, self.compression)
+      elif not self.__is_oov_pipe:
+        self.__oov_file.write("\n")
+      if self.__is_oov_pipe:
+        self.__oov_file.write(f"{word}\n")
+        self.__oov_file.flush()
+      else:
+        self.__oov_file.write(word)
+    self.written_oov_words += 1
+
+  def get_checkpoint(self) -> WriterCheckpoint:
+    assert self.__dictionary_file is not None
+    self.flush()
+    result = WriterCheckpoint(
+      dictionary_size=self.__dictionary_file.tell(),
+      oov_size=None if self.__oov_file is None else self.__oov_file.tell(),
+      written_entries=self.written_entries,
+      written_oov_words=self.written_oov_words,
+    )
+    return result
+
+  def flush(self) -> None:
+    if self.__dictionary_file is not None:
+      self.__dictionary_file.flush()
+    if self.__oov_file is not None:
+      self.__oov_file.flush()
+
+  def close(self) -> None:
+    if self.__dictionary_file is not None:
+      self.__dictionary_file.close()
+      self.__dictionary_file = None
+    if self.__oov_file is not None:
+      self.__oov_file.close()
+      self.__oov_file = None
+
+
+def is_pipe(path: Path, compression: str) -> bool:
+  # compressed data can't be read before the compression is finished anyway
+  return is_stdio(path) and get_compression(path, compression) is None
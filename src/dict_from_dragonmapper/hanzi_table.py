@@ -0,0 +1,191 @@
+import gzip
+import hashlib
+import json
+import os
+import sys
+from functools import lru_cache
+from importlib.metadata import version
+from logging import getLogger
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dragonmapper.data import load_data_file
+from tqdm import tqdm
+
+from dict_from_dragonmapper import ipa2symb, ipa_symbols, transcription
+from dict_from_dragonmapper.transcription import (get_pinyin_table, set_hanzi_table,
+                                                  try_syllable_to_ipa)
+
+HanziTable = Dict[str, Tuple[Tuple[str, ...], ...]]
+PinyinTable = Dict[str, Tuple[str, ...]]
+
+# needs to be increased if the transcription of the characters changes
+HANZI_TABLE_FORMAT = 2
+
+# the transcription of the characters depends on the code of these modules
+TRANSCRIPTION_MODULES = (ipa2symb, ipa_symbols, transcription)
+
+# errors which occur on reading a damaged table
+HANZI_TABLE_READ_ERRORS = (OSError, EOFError, ValueError, KeyError, IndexError, TypeError)
+
+
+def get_user_cache_dir() -> Path:
+  # the directory is only accessible by the current user in contrast to the temporary directory
+  if sys.platform == "win32":
+    local_app_data = os.environ.get("LOCALAPPDATA")
+    if local_app_data:
+      return Path(local_app_data)
+    return Path.home() / "AppData" / "Local"
+  if sys.platform == "darwin":
+    return Path.home() / "Library" / "Caches"
+  xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+  if xdg_cache_home:
+    return Path(xdg_cache_home)
+  return Path.home() / ".cache"
+
+
+DEFAULT_HANZI_TABLE_PATH = get_user_cache_dir() / "dict-from-dragonmapper" / "hanzi-ipa.json.gz"
+
+
+@lru_cache(maxsize=None)
+def get_transcription_hash() -> str:
+  # changes of the transcription invalidate the table even if the version was not increased
+  result = hashlib.sha256()
+  for module in TRANSCRIPTION_MODULES:
+    result.update(Path(module.__file__).read_bytes())
+  return result.hexdigest()[:16]
+
+
+def get_hanzi_table_version() -> str:
+  result = f"{HANZI_TABLE_FORMAT}-{version('dict-from-dragonmapper')}-{version('dragonmapper')}-{get_transcription_hash()}"
+  return result
+
+
+def get_dragonmapper_characters() -> List[str]:
+  lines = load_data_file("hanzi_pinyin_characters.tsv")
+  result = [line.split("\t")[0] for line in lines]
+  return result
+
+
+def build_hanzi_table() -> HanziTable:
+  # only characters which could be transcribed are contained, all others are transcribed
+  # character by character like before
+  result = {}
+  for character in tqdm(get_dragonmapper_characters(), unit="characters"):
+    character_IPAs = try_syllable_to_ipa(character)
+    if character_IPAs is not None:
+      result[character] = tuple(character_IPAs)
+  return result
+
+
+def save_hanzi_table(table: HanziTable, path: Path, pinyin_table: Optional[PinyinTable] = None) -> None:
+  # the pinyin table which was used to build the hanzi table is stored with it to be able to verify
+  # it later; each syllable transcription is stored once and referenced by its index
+  if pinyin_table is None:
+    pinyin_table = get_pinyin_table()
+  syllables: Dict[Tuple[str, ...], int] = {}
+  content = {
+    character: [
+      syllables.setdefault(character_IPA, len(syllables))
+      for character_IPA in character_IPAs
+    ]
+    for character, character_IPAs in table.items()
+  }
+  pinyin_content = {
+    pinyin: syllables.setdefault(pinyin_IPA, len(syllables))
+    for pinyin, pinyin_IPA in pinyin_table.items()
+  }
+  serialized = {
+    "version": get_hanzi_table_version(),
+    "syllables": [list(syllable) for syllable in syllables],
+    "table": content,
+    "pinyin": pinyin_content,
+  }
+  path.parent.mkdir(parents=True, exist_ok=True)
+  # write to a temporary file first to not expose partially written tables to concurrent runs
+  tmp_path = path.parent / f".{path.name}.{os.getpid()}.tmp"
+  with gzip.open(tmp_path, mode="wt", encoding="UTF-8") as file:
+    json.dump(serialized, file, ensure_ascii=False, separators=(",", ":"))
+  tmp_path.replace(path)
+
+
+def read_serialized_table(path: Path) -> Optional[Dict]:
+  # returns None if the table was created with another version
+  with gzip.open(path, mode="rt", encoding="UTF-8") as file:
+    serialized = json.load(file)
+  if not isinstance(serialized, dict):
+    raise ValueError("Hanzi table is not a JSON object!")
+  if serialized.get("version") != get_hanzi_table_version():
+    return None
+  is_valid = (
+    isinstance(serialized.get("syllables"), list)
+    and isinstance(serialized.get("table"), dict)
+    and isinstance(serialized.get("pinyin"), dict)
+  )
+  if not is_valid:
+    raise ValueError("Hanzi table has an invalid format!")
+  return serialized
+
+
+def load_hanzi_table(path: Path) -> Optional[HanziTable]:
+  # returns None if the table was created with another version
+  serialized = read_serialized_table(path)
+  if serialized is None:
+    return None
+  syllables = [tuple(syllable) for syllable in serialized["syllables"]]
+  get_syllable = syllables.__getitem__
+  result = {
+    character: tuple(map(get_syllable, syllable_indices))
+    for character, syllable_indices in serialized["table"].items()
+  }
+  return result
+
+
+def load_pinyin_table(path: Path) -> Optional[PinyinTable]:
+  # returns the pinyin table which was used to build the hanzi table; None if the table was created
+  # with another version
+  serialized = read_serialized_table(path)
+  if serialized is None:
+    return None
+  syllables = serialized["syllables"]
+  result = {
+    pinyin: tuple(syllables[syllable_index])
+    for pinyin, syllable_index in serialized["pinyin"].items()
+  }
+  return result
+
+
+def load_or_build_hanzi_table(path: Path) -> Tuple[HanziTable, bool]:
+  # returns the table and whether it is stored at the path, i.e., could be loaded from it again
+  logger = getLogger(__name__)
+  if path.is_file():
+    try:
+      table = load_hanzi_table(path)
+    except HANZI_TABLE_READ_ERRORS as ex:
+      logger.warning(f"Hanzi table \"{path.absolute()}\" couldn't be read and will be rebuilt.")
+      logger.debug(ex)
+      table = None
+    if table is not None:
+      return table, True
+    logger.info(f"Hanzi table \"{path.absolute()}\" is outdated and will be rebuilt.")
+  logger.info("Building hanzi table...")
+  table = build_hanzi_table()
+  try:
+    save_hanzi_table(table, path)
+  except OSError as ex:
+    logger.warning(f"Hanzi table couldn't be written to \"{path.absolute()}\".")
+    logger.debug(ex)
+    return table, False
+  logger.info(f"Written hanzi table to: \"{path.absolute()}\".")
+  return table, True
+
+
+def prepare_hanzi_table(path: Path) -> Optional[Path]:
+  # sets the table for the transcription before the processes are started, therefore forked
+  # processes share it; returns the path only if the table is saved there because processes which
+  # are not forked can only load a table which was saved
+  table, is_saved = load_or_build_hanzi_table(path)
+  set_hanzi_table(table)
+  if not is_saved:
+    return None
+  return path
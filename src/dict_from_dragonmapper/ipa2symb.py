@@ -1,40 +1,71 @@
-from typing import Optional, Set, Tuple
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 from dict_from_dragonmapper.ipa_symbols import APPENDIX, PUNCTUATION_AND_WHITESPACE, STRESSES, TIES
 
+# the symbols of the syllables repeat, therefore only a few symbols need to be kept
+DEFAULT_FUSION_CACHE_SIZE = 1000
+
+# amount of combinations of fusion and ignore symbols whose mergers are kept for
+# `merge_fusion_with_ignore`; usually the same few combinations are merged again and again
+FUSION_MERGERS_SIZE = 16
+
 
 def merge_fusion_with_ignore(symbols: Tuple[str, ...], fusion_symbols: Set[str], ignore: Set[str]) -> Tuple[str, ...]:
-  aux_symbols = list(symbols)
-  fused_symbols = []
-  while len(aux_symbols) != 0:
-    next_fused_symbols, processed_index = get_next_fused_symbols_and_index(
-      aux_symbols, fusion_symbols, ignore)
-    fused_symbols.append(next_fused_symbols)
-    del aux_symbols[:processed_index + 1]
-  return tuple(fused_symbols)
-
-
-def get_next_fused_symbols_and_index(symbols: Tuple[str, ...], fusion_symbols: Set[str], ignore: Set[str]) -> Tuple[str, int]:
-  first_symbol_without_ignore_symbols = strip_off_ignore(symbols[0], ignore)
-  if first_symbol_without_ignore_symbols not in fusion_symbols:
-    return symbols[0], 0
-  fused_fusion_symbols, processed_index = get_next_consecutive_fusion_symbols_and_index(
-    symbols, fusion_symbols, ignore)
-  return fused_fusion_symbols, processed_index
-
-
-def get_next_consecutive_fusion_symbols_and_index(symbols: Tuple[str, ...], fusion_symbols: Set[str], ignore: Set[str]) -> Tuple[str, int]:
-  assert strip_off_ignore(symbols[0], ignore) in fusion_symbols
-  consecutive_fusion_symbols = symbols[0]
-  processed_index = 0
-  for symbol in symbols[1:]:
-    symbol_without_ignore = strip_off_ignore(symbol, ignore)
-    if symbol_without_ignore in fusion_symbols:
-      consecutive_fusion_symbols += symbol
-      processed_index += 1
-    else:
-      break
-  return consecutive_fusion_symbols, processed_index
+  # consecutive symbols which are fusion symbols after removing the ignore symbols are joined
+  return get_fusion_merger(fusion_symbols, ignore).merge(symbols)
+
+
+class FusionMerger():
+  """Merges symbols like `merge_fusion_with_ignore` for fixed fusion and ignore symbols; whether a
+  symbol is a fusion symbol is kept for the first `cache_size` symbols."""
+
+  def __init__(self, fusion_symbols: Set[str], ignore: Set[str], cache_size: int = DEFAULT_FUSION_CACHE_SIZE) -> None:
+    self.fusion_symbols = frozenset(fusion_symbols)
+    self.ignore = frozenset(ignore)
+    self.cache_size = cache_size
+    # the symbols repeat, therefore the first symbols are kept instead of the least recently used
+    # ones which is faster to look up
+    self.__is_fusion_symbol: Dict[str, bool] = {}
+
+  def is_fusion_symbol(self, symbol: str) -> bool:
+    result = strip_off_ignore(symbol, self.ignore) in self.fusion_symbols
+    if len(self.__is_fusion_symbol) < self.cache_size:
+      self.__is_fusion_symbol[symbol] = result
+    return result
+
+  def merge(self, symbols: Tuple[str, ...]) -> Tuple[str, ...]:
+    is_fusion_symbol = self.__is_fusion_symbol
+    fused_symbols = []
+    fused_symbol: Optional[str] = None
+    for symbol in symbols:
+      is_fusion = is_fusion_symbol.get(symbol)
+      if is_fusion is None:
+        is_fusion = self.is_fusion_symbol(symbol)
+      if is_fusion:
+        fused_symbol = symbol if fused_symbol is None else fused_symbol + symbol
+        continue
+      if fused_symbol is not None:
+        fused_symbols.append(fused_symbol)
+        fused_symbol = None
+      fused_symbols.append(symbol)
+    if fused_symbol is not None:
+      fused_symbols.append(fused_symbol)
+    return tuple(fused_symbols)
+
+
+# contains the mergers of the first combinations of fusion and ignore symbols
+FUSION_MERGERS: Dict[Tuple[FrozenSet[str], FrozenSet[str]], FusionMerger] = {}
+
+
+def get_fusion_merger(fusion_symbols: Set[str], ignore: Set[str]) -> FusionMerger:
+  key = (frozenset(fusion_symbols), frozenset(ignore))
+  result = FUSION_MERGERS.get(key)
+  if result is None:
+    result = FusionMerger(*key)
+    if len(FUSION_MERGERS) < FUSION_MERGERS_SIZE:
+      FUSION_MERGERS[key] = result
+  return result
 
 
 def strip_off_ignore(symbol: str, ignore: Set[str]) -> str:
@@ -43,9 +74,57 @@ def strip_off_ignore(symbol: str, ignore: Set[str]) -> str:
   return symbol
 
 
+def get_character_class(characters: Iterable[str], negate: bool = False) -> str:
+  escaped = "".join(re.escape(character) for character in sorted(characters))
+  return f"[{'^' if negate else ''}{escaped}]"
+
+
+def get_ipa_symbol_pattern(stresses: bool) -> str:
+  # matches one symbol like `parse_ipa_symbols_to_symbols` would return it for single characters,
+  # i.e., symbols joined with ties, followed by their appendix and preceded by their stresses
+  tie = get_character_class(TIES)
+  no_tie = get_character_class(TIES | PUNCTUATION_AND_WHITESPACE, negate=True)
+  appendix = get_character_class(APPENDIX)
+  stress = get_character_class(STRESSES)
+  # appendix symbols which start a tied symbol are not merged to the previous symbol
+  single_appendix = f"{appendix}(?!{tie}+{no_tie})"
+  if not stresses:
+    return (
+      f"{single_appendix}"
+      f"|{no_tie}(?:{tie}+{no_tie})*(?:{single_appendix})*"
+      f"|{tie}(?:{single_appendix})*"
+      f"|."
+    )
+  # stresses which are not followed by a symbol they could be merged to remain single symbols
+  single_stress = f"{stress}(?!{tie}+{no_tie})(?!{single_appendix})"
+  result = (
+    f"(?:{single_stress})*(?:"
+    f"{single_appendix}"
+    f"|(?!{single_stress}){no_tie}(?:{tie}+{no_tie})*(?:{single_appendix})*"
+    f"|{tie}(?:{single_appendix})*"
+    f")|(?P<stresses>(?:{single_stress})+)"
+    f"|."
+  )
+  return result
+
+
+IPA_SYMBOL_PATTERN = re.compile(get_ipa_symbol_pattern(stresses=False), re.DOTALL)
+
+IPA_SYMBOL_WITH_STRESSES_PATTERN = re.compile(get_ipa_symbol_pattern(stresses=True), re.DOTALL)
+
+STRESS_PATTERN = re.compile(get_character_class(STRESSES))
+
+
 def parse_ipa_to_symbols(sentence: str) -> Tuple[str, ...]:
-  all_symbols = tuple(sentence)
-  return parse_ipa_symbols_to_symbols(all_symbols)
+  if STRESS_PATTERN.search(sentence) is None:
+    return tuple(IPA_SYMBOL_PATTERN.findall(sentence))
+  result: List[str] = []
+  for match in IPA_SYMBOL_WITH_STRESSES_PATTERN.finditer(sentence):
+    if match.lastgroup == "stresses":
+      result.extend(match.group())
+    else:
+      result.append(match.group())
+  return tuple(result)
 
 
 def parse_ipa_symbols_to_symbols(all_symbols: Tuple[str, ...]) -> Tuple[str, ...]:
@@ -73,44 +152,27 @@ def parse_ipa_symbols_to_symbols(all_symbols: Tuple[str, ...]) -> Tuple[str, ...
 
 
 def merge_together(symbols: Tuple[str, ...], merge_symbols: Set[str], ignore_merge_symbols: Set[str]) -> Tuple[str, ...]:
+  # symbols are joined if they are separated by merge symbols, e.g., t͡s
   merge_or_ignore_merge_symbols = merge_symbols.union(ignore_merge_symbols)
-  j = 0
+  symbols_count = len(symbols)
   merged_symbols = []
-  while j < len(symbols):
-    new_symbol, j = get_next_merged_together_symbol_and_index(
-      symbols, j, merge_symbols, merge_or_ignore_merge_symbols)
+  j = 0
+  while j < symbols_count:
+    new_symbol = symbols[j]
+    j += 1
+    if new_symbol not in merge_or_ignore_merge_symbols:
+      while j < symbols_count:
+        k = j
+        while k < symbols_count and symbols[k] in merge_symbols:
+          k += 1
+        if k == j or k == symbols_count or symbols[k] in merge_or_ignore_merge_symbols:
+          break
+        new_symbol += "".join(symbols[j:k + 1])
+        j = k + 1
     merged_symbols.append(new_symbol)
   return tuple(merged_symbols)
 
 
-def get_next_merged_together_symbol_and_index(symbols: Tuple[str, ...], j, merge_symbols: Set[str], merge_or_ignore_merge_symbols: Set[str]):
-  assert merge_symbols.issubset(merge_or_ignore_merge_symbols)
-  assert j < len(symbols)
-  new_symbol = symbols[j]
-  j += 1
-  while symbols[j - 1] not in merge_or_ignore_merge_symbols and j < len(symbols):
-    merge_symbol_concat, index = get_all_next_consecutive_merge_symbols(symbols[j:], merge_symbols)
-    if len(merge_symbol_concat) > 0 and symbols[j + index] not in merge_or_ignore_merge_symbols:
-      new_symbol += merge_symbol_concat + symbols[j + index]
-      j += index + 1
-    else:
-      break
-  return new_symbol, j
-
-
-def get_all_next_consecutive_merge_symbols(symbols: Tuple[str, ...], merge_symbols: Set[str]) -> Tuple[str, int]:
-  assert len(symbols) > 0
-  merge_symbol_concat = ""
-  index = None
-  for index, symbol in enumerate(symbols):
-    if symbol in merge_symbols:
-      merge_symbol_concat += symbol
-    else:
-      return merge_symbol_concat, index
-  assert index is not None
-  return merge_symbol_concat, index
-
-
 def merge_left(symbols: Tuple[str, ...], merge_symbols: Set[str], ignore_merge_symbols: Set[str], insert_symbol: Optional[str]) -> Tuple[str, ...]:
   if insert_symbol is None:
     insert_symbol = ""
@@ -121,27 +183,24 @@ def merge_left(symbols: Tuple[str, ...], merge_symbols: Set[str], ignore_merge_s
 
 
 def merge_left_core(symbols: Tuple[str, ...], merge_symbols: Set[str], ignore_merge_symbols: Set[str]) -> Tuple[Tuple[str, ...]]:
-  j = 0
-  reversed_symbols = symbols[::-1]
-  reversed_merged_symbols = []
-  while j < len(reversed_symbols):
-    new_symbol, j = get_next_merged_left_symbol_and_index(
-      reversed_symbols, j, merge_symbols, ignore_merge_symbols)
-    reversed_merged_symbols.append(new_symbol)
-  merged_symbols = reversed_merged_symbols[::-1]
+  # merge symbols are kept until the next symbol they can be merged to
+  merged_symbols = []
+  pending_merge_symbols: List[str] = []
+  for symbol in symbols:
+    if symbol in merge_symbols:
+      pending_merge_symbols.append(symbol)
+    elif symbol in ignore_merge_symbols:
+      merged_symbols.extend((merge_symbol,) for merge_symbol in pending_merge_symbols)
+      pending_merge_symbols.clear()
+      merged_symbols.append((symbol,))
+    else:
+      pending_merge_symbols.append(symbol)
+      merged_symbols.append(tuple(pending_merge_symbols))
+      pending_merge_symbols.clear()
+  merged_symbols.extend((merge_symbol,) for merge_symbol in pending_merge_symbols)
   return tuple(merged_symbols)
 
 
-def get_next_merged_left_symbol_and_index(symbols: Tuple[str, ...], j: int, merge_symbols: Set[str], ignore_merge_symbols: Set[str]) -> Tuple[str, int]:
-  new_symbol = [symbols[j]]
-  j += 1
-  if new_symbol[0] not in ignore_merge_symbols and new_symbol[0] not in merge_symbols:
-    while j < len(symbols) and symbols[j] in merge_symbols:
-      new_symbol.insert(0, symbols[j])
-      j += 1
-  return tuple(new_symbol), j
-
-
 def merge_right(symbols: Tuple[str, ...], merge_symbols: Set[str], ignore_merge_symbols: Set[str], insert_symbol: Optional[str]) -> Tuple[str, ...]:
   if insert_symbol is None:
     insert_symbol = ""
@@ -152,20 +211,14 @@ def merge_right(symbols: Tuple[str, ...], merge_symbols: Set[str], ignore_merge_
 
 
 def merge_right_core(symbols: Tuple[str, ...], merge_symbols: Set[str], ignore_merge_symbols: Set[str]) -> Tuple[Tuple[str, ...]]:
-  j = 0
+  symbols_count = len(symbols)
   merged_symbols = []
-  while j < len(symbols):
-    new_symbol, j = get_next_merged_right_symbol_and_index(
-      symbols, j, merge_symbols, ignore_merge_symbols)
-    merged_symbols.append(new_symbol)
+  j = 0
+  while j < symbols_count:
+    k = j + 1
+    if symbols[j] not in ignore_merge_symbols and symbols[j] not in merge_symbols:
+      while k < symbols_count and symbols[k] in merge_symbols:
+        k += 1
+    merged_symbols.append(symbols[j:k])
+    j = k
   return tuple(merged_symbols)
-
-
-def get_next_merged_right_symbol_and_index(symbols: Tuple[str, ...], j: int, merge_symbols: Set[str], ignore_merge_symbols: Set[str]) -> Tuple[str, int]:
-  new_symbol = [symbols[j]]
-  j += 1
-  if new_symbol[0] not in ignore_merge_symbols and new_symbol[0] not in merge_symbols:
-    while j < len(symbols) and symbols[j] in merge_symbols:
-      new_symbol.append(symbols[j])
-      j += 1
-  return tuple(new_symbol), j
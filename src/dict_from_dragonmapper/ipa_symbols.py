@@ -258,3 +258,8 @@ STRESSES = {
 }
 
 PUNCTUATION_AND_WHITESPACE = set(string.punctuation) | set(string.whitespace)
+
+# precomputed classes to not build them on each lookup
+VOWELS_AND_SCHWAS = frozenset(VOWELS | SCHWAS)
+
+TONE_CHARACTERS = "".join(sorted(TONES))
@@ -1,37 +1,81 @@
+import gc
+import os
+import time
 from argparse import ArgumentParser, Namespace
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from functools import partial
+from itertools import islice
 from logging import getLogger
+from multiprocessing import get_start_method
 from multiprocessing.pool import Pool
 from pathlib import Path
 from tempfile import gettempdir
-from typing import Dict, Optional, Tuple
+from typing import Callable, Deque, Dict, Generator, Iterable, List, Optional, Set, Sized, Tuple
 
 from ordered_set import OrderedSet
-from pronunciation_dictionary import (PronunciationDict, Pronunciations, SerializationOptions, Word,
-                                      save_dict)
+from pronunciation_dictionary import (DeserializationOptions, MultiprocessingOptions,
+                                      PronunciationDict, Pronunciations, SerializationOptions, Word,
+                                      deserialize)
 from tqdm import tqdm
-from word_to_pronunciation import Options, get_pronunciations_from_word
+from word_to_pronunciation import Options, get_cached_lookup, get_pronunciations_from_word
 
 from dict_from_dragonmapper.argparse_helper import (DEFAULT_PUNCTUATION, ConvertToOrderedSetAction,
                                                     add_chunksize_argument, add_encoding_argument,
                                                     add_maxtaskperchild_argument,
                                                     add_n_jobs_argument, add_serialization_group,
                                                     get_optional, parse_existing_file,
-                                                    parse_non_empty_or_whitespace, parse_path,
-                                                    parse_positive_float)
-from dict_from_dragonmapper.transcription import word_to_ipa
+                                                    parse_existing_files_or_stdio,
+                                                    parse_non_empty_or_whitespace,
+                                                    parse_non_negative_integer, parse_path,
+                                                    parse_positive_float, parse_positive_integer,
+                                                    parse_shard)
+from dict_from_dragonmapper import transcription
+from dict_from_dragonmapper.cache import CacheStats
+from dict_from_dragonmapper.chunks import (STREAM_TIMEOUT, get_chunks, get_max_pending_chunks,
+                                           get_streamed_chunks, iter_chunk_results)
+from dict_from_dragonmapper.checkpoint import (DEFAULT_CHECKPOINT_INTERVAL, Checkpoint,
+                                               get_checkpoint_key, load_checkpoint, save_checkpoint)
+from dict_from_dragonmapper.dictionary_writer import DictionaryWriter
+from dict_from_dragonmapper.hanzi_table import (DEFAULT_HANZI_TABLE_PATH, HANZI_TABLE_READ_ERRORS,
+                                                build_hanzi_table, get_dragonmapper_characters,
+                                                get_transcription_hash, load_hanzi_table,
+                                                load_pinyin_table, prepare_hanzi_table,
+                                                save_hanzi_table)
+from dict_from_dragonmapper.metrics import ChunkStats, RunMetrics, measure_phase, save_metrics
+from dict_from_dragonmapper.persistent_cache import (PERSISTENT_CACHE_WRITE_BATCH_SIZE,
+                                                     PersistentCache, get_options_key)
+from dict_from_dragonmapper.shards import get_shard_range, merge_files
+from dict_from_dragonmapper.streams import (COMPRESSION_AUTO, COMPRESSION_NONE, COMPRESSIONS,
+                                            get_compression, get_compression_extension, is_stdio,
+                                            open_input, open_output,
+                                            remove_compression_extension)
+from dict_from_dragonmapper.transcription import (DEFAULT_SYLLABLE_CACHE_SIZE,
+                                                  configure_syllable_cache, get_all_pinyin,
+                                                  is_transcribable, pop_syllable_cache_stats,
+                                                  preload_tables, set_hanzi_table,
+                                                  try_syllable_to_ipa,
+                                                  try_transcribe_pinyin_to_ipa, try_word_to_ipa)
+from dict_from_dragonmapper.vocabulary import iter_vocabularies, read_vocabularies, read_vocabulary
 
 
 def get_app_try_add_vocabulary_from_pronunciations_parser(parser: ArgumentParser):
   parser.description = "Command-line interface (CLI) to create a pronunciation dictionary by looking up IPA transcriptions using dragonmapper including the possibility of ignoring punctuation and splitting words on hyphens before transcribing them."
   default_oov_out = Path(gettempdir()) / "oov.txt"
-  # TODO support multiple files
-  parser.add_argument("vocabulary", metavar='VOCABULARY-PATH', type=parse_existing_file,
-                      help="file containing the vocabulary (words separated by line)")
+  parser.add_argument("vocabulary", metavar='VOCABULARY-PATH', type=parse_existing_files_or_stdio, nargs="+",
+                      help="files containing the vocabulary (words separated by line) or glob patterns matching them; words contained in multiple files are transcribed only once; use - to read the words from stdin while they are transcribed")
   add_encoding_argument(parser, "--vocabulary-encoding", "encoding of vocabulary")
   parser.add_argument("dictionary", metavar='DICTIONARY-PATH', type=parse_path,
-                      help="path to output the created dictionary")
+                      help="path to output the created dictionary; use - to write it to stdout")
+  parser.add_argument("--compression", choices=COMPRESSIONS, default=COMPRESSION_AUTO,
+                      help="compression of the vocabularies, dictionaries and unresolved words; auto detects it from the file extension (.gz, .bz2 or .xz), stdin and stdout are not compressed then")
+  parser.add_argument("--dictionary-per-vocabulary", action="store_true",
+                      help="write one dictionary per vocabulary file into the directory DICTIONARY-PATH instead of one dictionary containing all words; the dictionaries are named like the vocabulary files with the extension \".dict\" (followed by the extension of the compression if it is given)")
+  parser.add_argument("--shard", metavar="K/N", type=get_optional(parse_shard),
+                      help="only transcribe the K-th of N equally large parts of the vocabulary (after removing duplicates); the dictionaries and unresolved words of all parts can be joined with the command \"merge\"", default=None)
+  parser.add_argument("--existing-dictionary", metavar="EXISTING-DICTIONARY-PATH", type=get_optional(parse_existing_file),
+                      help="only transcribe the words which are not contained in this dictionary and take the pronunciations of all other words from it; it needs to be serialized with the same serialization arguments", default=None)
+  parser.add_argument("--prune", action="store_true",
+                      help="remove the words of the existing dictionary which are not contained in the vocabulary; otherwise they are added after the words of the vocabulary")
   parser.add_argument("--weight", type=parse_positive_float, metavar="WEIGHT",
                       help="weight to assign for each pronunciation", default=1.0)
   parser.add_argument("--trim", type=parse_non_empty_or_whitespace, metavar='TRIM-SYMBOL', nargs='*',
@@ -39,7 +83,31 @@ def get_app_try_add_vocabulary_from_pronunciations_parser(parser: ArgumentParser
   parser.add_argument("--split-on-hyphen", action="store_true",
                       help="split words on hyphen symbol before lookup")
   parser.add_argument("--oov-out", metavar="OOV-PATH", type=get_optional(parse_path),
-                      help="write out-of-vocabulary (OOV) words (i.e., words that can't transcribed) to this file (encoding will be the same as the one from the vocabulary file)", default=default_oov_out)
+                      help="write out-of-vocabulary (OOV) words (i.e., words that can't transcribed) to this file (encoding will be the same as the one from the vocabulary file); use - to write them to stdout", default=default_oov_out)
+  parser.add_argument("--max-pronunciations", type=get_optional(parse_positive_integer), metavar="NUMBER",
+                      help="maximum amount of pronunciations per word; the pronunciations are ranked by the sum of the positions of the readings of the characters, i.e., combinations of the first readings of all characters are preferred", default=None)
+  parser.add_argument("--hanzi-table", metavar="HANZI-TABLE-PATH", type=parse_path,
+                      help="path to the precompiled hanzi table; it will be built if it doesn't exist or is outdated", default=DEFAULT_HANZI_TABLE_PATH)
+  parser.add_argument("--no-preload", action="store_true",
+                      help="don't load the transcription tables before the processes are started; otherwise they are shared by all processes if more than one process is forked (default on Linux); dragonmapper is only loaded if no hanzi table is used")
+  parser.add_argument("--no-hanzi-table", action="store_true",
+                      help="don't use a precompiled hanzi table, i.e., transcribe each character separately")
+  parser.add_argument("--syllable-cache-size", type=parse_non_negative_integer, metavar="SIZE",
+                      help="amount of syllable transcriptions each process keeps cached (least recently used ones are removed first); 0 disables the cache", default=DEFAULT_SYLLABLE_CACHE_SIZE)
+  cache_group = parser.add_argument_group("cache arguments")
+  cache_group.add_argument("--cache", metavar="CACHE-PATH", type=get_optional(parse_path),
+                           help="reuse the pronunciations of words from previous runs by storing them in this database", default=None)
+  cache_group.add_argument("--cache-max-entries", metavar="NUMBER", type=get_optional(parse_positive_integer),
+                           help="remove the least recently used words from the cache if it contains more words than this", default=None)
+  checkpoint_group = parser.add_argument_group("checkpoint arguments")
+  checkpoint_group.add_argument("--checkpoint", metavar="CHECKPOINT-PATH", type=get_optional(parse_path),
+                                help="save the progress to this file regularly to be able to resume the run with --resume; the file is removed after the run is finished; only supported for one uncompressed dictionary file", default=None)
+  checkpoint_group.add_argument("--checkpoint-interval", metavar="NUMBER", type=parse_positive_integer,
+                                help="amount of words after which the progress is saved", default=DEFAULT_CHECKPOINT_INTERVAL)
+  checkpoint_group.add_argument("--resume", action="store_true",
+                                help="continue the run from the checkpoint if it exists, i.e., the words which were already written are skipped; the vocabulary and all arguments need to be the same as in the stopped run")
+  parser.add_argument("--profile-out", metavar="METRICS-PATH", type=get_optional(parse_path),
+                      help="write the durations of all phases of the run and further statistics as JSON to this file", default=None)
   add_serialization_group(parser)
   mp_group = parser.add_argument_group("multiprocessing arguments")
   add_n_jobs_argument(mp_group)
@@ -48,117 +116,665 @@ def get_app_try_add_vocabulary_from_pronunciations_parser(parser: ArgumentParser
   return get_pronunciations_files
 
 
-def get_pronunciations_files(ns: Namespace) -> bool:
-  assert ns.vocabulary.is_file()
+def get_build_hanzi_table_parser(parser: ArgumentParser):
+  parser.description = "Build the table containing the IPA transcriptions of all characters known to dragonmapper. The table is used to speed up the creation of dictionaries."
+  parser.add_argument("path", metavar="HANZI-TABLE-PATH", type=parse_path, nargs="?",
+                      help="path to output the table", default=DEFAULT_HANZI_TABLE_PATH)
+  return build_hanzi_table_file
+
+
+def build_hanzi_table_file(ns: Namespace) -> bool:
   logger = getLogger(__name__)
+  table = build_hanzi_table()
 
   try:
-    vocabulary_content = ns.vocabulary.read_text(ns.vocabulary_encoding)
+    save_hanzi_table(table, ns.path)
   except Exception as ex:
-    logger.error("Vocabulary couldn't be read.")
+    logger.error("Hanzi table couldn't be written.")
+    logger.debug(ex)
     return False
 
-  vocabulary_words = OrderedSet(vocabulary_content.splitlines())
-  trim_symbols = ''.join(ns.trim)
-  options = Options(trim_symbols, ns.split_on_hyphen, False, False, ns.weight)
+  logger.info(f"Written hanzi table containing {len(table)} characters to: \"{ns.path.absolute()}\".")
+  return True
 
-  dictionary_instance, unresolved_words = get_pronunciations(
-    vocabulary_words, ns.weight, options, ns.n_jobs, ns.maxtasksperchild, ns.chunksize)
 
-  s_options = SerializationOptions(ns.parts_sep, ns.include_numbers, ns.include_weights)
+def get_merge_parser(parser: ArgumentParser):
+  parser.description = "Join the dictionaries or unresolved words which were created for the shards of a vocabulary (see --shard) in the order of the shards, i.e., in the order of the vocabulary."
+  parser.add_argument("paths", metavar="PATH", type=parse_path, nargs="+",
+                      help="dictionaries or files containing the unresolved words of the shards in the order of the shards")
+  parser.add_argument("output", metavar="OUTPUT-PATH", type=parse_path,
+                      help="path to output the joined dictionary or unresolved words; use - to write them to stdout")
+  add_encoding_argument(parser, "--encoding", "encoding of the files")
+  parser.add_argument("--compression", choices=COMPRESSIONS, default=COMPRESSION_AUTO,
+                      help="compression of the files; auto detects it from the file extension (.gz, .bz2 or .xz)")
+  parser.add_argument("--ignore-missing", action="store_true",
+                      help="skip files which don't exist, e.g., the unresolved words of shards without unresolved words")
+  return merge_shard_files
+
+
+def merge_shard_files(ns: Namespace) -> bool:
+  logger = getLogger(__name__)
+  paths = []
+  for path in ns.paths:
+    if path.is_file():
+      paths.append(path)
+    elif ns.ignore_missing:
+      logger.info(f"Skipped \"{path.absolute()}\" because it doesn't exist.")
+    else:
+      logger.error(f"File \"{path.absolute()}\" was not found!")
+      return False
+
+  try:
+    merge_files(paths, ns.output, ns.encoding, ns.compression)
+  except (OSError, UnicodeError) as ex:
+    logger.error("Files couldn't be merged.")
+    logger.debug(ex)
+    return False
+
+  if not is_stdio(ns.output):
+    logger.info(f"Written {len(paths)} merged files to: \"{ns.output.absolute()}\".")
+  return True
+
+
+def get_verify_tables_parser(parser: ArgumentParser):
+  parser.description = "Verify that the hanzi table and the pinyin table which was used to build it return the same transcriptions as transcribing each pinyin or character with the current transcription."
+  parser.add_argument("--hanzi-table", metavar="HANZI-TABLE-PATH", type=parse_path,
+                      help="path to the hanzi table; the verification fails if it doesn't exist", default=DEFAULT_HANZI_TABLE_PATH)
+  return verify_tables
+
+
+def verify_tables(ns: Namespace) -> bool:
+  logger = getLogger(__name__)
+
+  if not ns.hanzi_table.is_file():
+    logger.error(f"Hanzi table doesn't exist: \"{ns.hanzi_table.absolute()}\"!")
+    return False
 
   try:
-    save_dict(dictionary_instance, ns.dictionary, ns.serialization_encoding, s_options)
+    pinyin_table = load_pinyin_table(ns.hanzi_table)
+    hanzi_table = load_hanzi_table(ns.hanzi_table)
   except Exception as ex:
-    logger.error("Dictionary couldn't be written.")
+    logger.error("Hanzi table couldn't be read.")
     logger.debug(ex)
     return False
 
-  logger.info(f"Written dictionary to: \"{ns.dictionary.absolute()}\".")
+  if pinyin_table is None or hanzi_table is None:
+    logger.error("Hanzi table is outdated!")
+    return False
+
+  is_valid = True
+  # pinyin which can't be transcribed are not contained in the table
+  for pinyin in get_all_pinyin() | OrderedSet(pinyin_table):
+    expected_IPA = try_transcribe_pinyin_to_ipa(pinyin)
+    pinyin_IPA = pinyin_table.get(pinyin)
+    if pinyin_IPA != expected_IPA:
+      logger.error(
+        f"Pinyin table: \"{pinyin}\" is transcribed as {get_ipa_description(pinyin_IPA)} instead of {get_ipa_description(expected_IPA)}!")
+      is_valid = False
+  logger.info(f"Verified pinyin table containing {len(pinyin_table)} pinyin.")
+
+  for character in tqdm(get_dragonmapper_characters(), unit="characters"):
+    expected_IPAs = try_syllable_to_ipa(character)
+    if expected_IPAs is not None:
+      expected_IPAs = tuple(expected_IPAs)
+    character_IPAs = hanzi_table.get(character)
+    if character_IPAs != expected_IPAs:
+      logger.error(f"Hanzi table: Transcriptions of \"{character}\" differ!")
+      is_valid = False
+  logger.info(f"Verified hanzi table containing {len(hanzi_table)} characters.")
+
+  return is_valid
+
+
+def get_ipa_description(ipa: Optional[Tuple[str, ...]]) -> str:
+  if ipa is None:
+    return "nothing"
+  return f"\"{' '.join(ipa)}\""
+
+
+def get_pronunciations_files(ns: Namespace) -> bool:
+  logger = getLogger(__name__)
+  # the same file could be matched by multiple patterns
+  vocabulary_paths = list(OrderedSet(path for paths in ns.vocabulary for path in paths))
+  assert all(is_stdio(path) or path.is_file() for path in vocabulary_paths)
+  read_stdin = any(is_stdio(path) for path in vocabulary_paths)
+
+  if ns.oov_out is not None and is_stdio(ns.dictionary) and is_stdio(ns.oov_out):
+    logger.error("Dictionary and unresolved words can't both be written to stdout!")
+    return False
+
+  dictionary_paths = None
+  if ns.dictionary_per_vocabulary:
+    if read_stdin or is_stdio(ns.dictionary):
+      logger.error("Dictionaries per vocabulary can't be read from stdin or written to stdout!")
+      return False
+    dictionary_paths = get_dictionary_paths(vocabulary_paths, ns.dictionary, ns.compression)
+    if len(set(dictionary_paths)) < len(dictionary_paths):
+      logger.error("Vocabulary files need to have different names to write one dictionary per vocabulary!")
+      return False
+
+  if ns.shard is not None and (read_stdin or dictionary_paths is not None):
+    logger.error("Shards can't be read from stdin or written to one dictionary per vocabulary!")
+    return False
+
+  if ns.existing_dictionary is not None and not ns.prune and (ns.shard is not None or ns.checkpoint is not None or dictionary_paths is not None):
+    # the remaining words of the existing dictionary belong to none of these outputs
+    logger.error("Shards, checkpoints and dictionaries per vocabulary need --prune if an existing dictionary is given!")
+    return False
+
+  if ns.checkpoint is not None:
+    output_paths = [ns.dictionary] if ns.oov_out is None else [ns.dictionary, ns.oov_out]
+    if dictionary_paths is not None or any(is_stdio(path) or get_compression(path, ns.compression) is not None for path in output_paths):
+      logger.error("Checkpoints are only supported for one uncompressed dictionary file!")
+      return False
+  elif ns.resume:
+    logger.error("A checkpoint is needed to resume the run!")
+    return False
+
+  metrics = None if ns.profile_out is None else RunMetrics()
+
+  vocabularies = None
+  if read_stdin:
+    # the words are transcribed while they are read
+    vocabulary_words = iter_vocabularies(vocabulary_paths, ns.vocabulary_encoding, ns.compression)
+  else:
+    try:
+      with measure_phase(metrics, "read_vocabulary"):
+        if dictionary_paths is None:
+          vocabulary_words = read_vocabularies(vocabulary_paths, ns.vocabulary_encoding, ns.compression)
+        else:
+          vocabularies = [read_vocabulary(path, ns.vocabulary_encoding, ns.compression) for path in vocabulary_paths]
+          vocabulary_words = OrderedSet(word for words in vocabularies for word in words)
+    except Exception as ex:
+      logger.error("Vocabulary couldn't be read.")
+      return False
+
+  if ns.shard is not None:
+    start, end = get_shard_range(len(vocabulary_words), *ns.shard)
+    vocabulary_words = vocabulary_words[start:end]
+    logger.info(f"Shard {ns.shard[0]}/{ns.shard[1]} contains the words {start + 1} to {end}.")
+
+  existing_dictionary = None
+  if ns.existing_dictionary is not None:
+    try:
+      with measure_phase(metrics, "read_existing_dictionary"):
+        existing_dictionary = read_dictionary(
+          ns.existing_dictionary, ns.serialization_encoding, ns.include_numbers, ns.include_weights,
+          MultiprocessingOptions(ns.n_jobs, ns.maxtasksperchild, ns.chunksize), ns.compression)
+    except Exception as ex:
+      logger.error("Existing dictionary couldn't be read.")
+      logger.debug(ex)
+      return False
+    logger.info(f"Read existing dictionary containing {len(existing_dictionary)} words.")
+
+  trim_symbols = ''.join(ns.trim)
+  options = Options(trim_symbols, ns.split_on_hyphen, False, False, ns.weight)
 
-  if len(unresolved_words) > 0:
+  hanzi_table_path = None if ns.no_hanzi_table else ns.hanzi_table
+
+  options_key = get_options_key(
+    options, ns.weight, ns.max_pronunciations, get_transcription_hash())
+
+  persistent_cache = None
+  if ns.cache is not None:
+    try:
+      persistent_cache = PersistentCache(ns.cache, options_key, ns.cache_max_entries)
+    except Exception as ex:
+      logger.error("Cache couldn't be opened.")
+      logger.debug(ex)
+      return False
+
+  s_options = SerializationOptions(ns.parts_sep, ns.include_numbers, ns.include_weights)
+
+  checkpoint_key = get_checkpoint_key(
+    options_key,
+    [(path.absolute(), None if is_stdio(path) else path.stat().st_size) for path in vocabulary_paths],
+    ns.dictionary.absolute(),
+    None if ns.oov_out is None else ns.oov_out.absolute(),
+    ns.serialization_encoding,
+    ns.parts_sep,
+    ns.include_numbers,
+    ns.include_weights,
+    ns.shard,
+    None if ns.existing_dictionary is None else (
+      ns.existing_dictionary.absolute(), ns.existing_dictionary.stat().st_size),
+    ns.prune,
+  )
+  resume_checkpoint = None
+  if ns.resume and ns.checkpoint.is_file():
+    try:
+      resume_checkpoint = load_checkpoint(ns.checkpoint)
+    except Exception as ex:
+      logger.error("Checkpoint couldn't be read.")
+      logger.debug(ex)
+      return False
+    if resume_checkpoint is None or resume_checkpoint.key != checkpoint_key:
+      logger.error("Checkpoint was created for another vocabulary or with other arguments!")
+      return False
+    logger.info(f"Resuming the run after {resume_checkpoint.words} words.")
+    # only words from stdin are streamed, all others keep their amount
+    if isinstance(vocabulary_words, Sized):
+      vocabulary_words = vocabulary_words[resume_checkpoint.words:]
+    else:
+      vocabulary_words = islice(vocabulary_words, resume_checkpoint.words, None)
+
+  get_entries = partial(
+    iter_pronunciations, weight=ns.weight, options=options, n_jobs=ns.n_jobs, maxtasksperchild=ns.maxtasksperchild,
+    chunksize=ns.chunksize, syllable_cache_size=ns.syllable_cache_size, hanzi_table_path=hanzi_table_path, persistent_cache=persistent_cache, max_pronunciations=ns.max_pronunciations, metrics=metrics, preload=not ns.no_preload)
+  if existing_dictionary is None:
+    entries = get_entries(vocabulary_words)
+  else:
+    entries = iter_pronunciations_with_existing(
+      vocabulary_words, existing_dictionary, get_entries, ns.prune)
+
+  try:
+    if dictionary_paths is None:
+      words_count = 0 if resume_checkpoint is None else resume_checkpoint.words
+      writer_checkpoint = None if resume_checkpoint is None else resume_checkpoint.writer
+      with DictionaryWriter(ns.dictionary, ns.serialization_encoding, s_options, ns.oov_out, "UTF-8", ns.compression, writer_checkpoint) as writer:
+        for word, pronunciations in entries:
+          if len(pronunciations) == 0:
+            with measure_phase(metrics, "write_oov"):
+              writer.write_oov(word)
+          else:
+            with measure_phase(metrics, "write_dictionary"):
+              writer.write_entry(word, pronunciations)
+          words_count += 1
+          if ns.checkpoint is not None and words_count % ns.checkpoint_interval == 0:
+            with measure_phase(metrics, "write_checkpoint"):
+              save_checkpoint(
+                Checkpoint(words_count, writer.get_checkpoint(), checkpoint_key), ns.checkpoint)
+      written_oov_words = writer.written_oov_words
+    else:
+      written_oov_words = write_dictionary_per_vocabulary(
+        entries, vocabularies, dictionary_paths, ns.serialization_encoding, s_options, ns.oov_out, "UTF-8", metrics, ns.compression)
+  except UnicodeDecodeError as ex:
+    # words from stdin are only decoded while the dictionary is written
+    logger.error("Vocabulary couldn't be read.")
+    logger.debug(ex)
+    return False
+  except OSError as ex:
+    logger.error("Dictionary or unresolved words couldn't be written.")
+    logger.debug(ex)
+    return False
+  finally:
+    entries.close()
+    if persistent_cache is not None:
+      persistent_cache.close()
+
+  if ns.checkpoint is not None:
+    # the run doesn't need to be resumed anymore
+    ns.checkpoint.unlink(missing_ok=True)
+
+  if dictionary_paths is not None:
+    logger.info(
+      f"Written {len(dictionary_paths)} dictionaries to: \"{ns.dictionary.absolute()}\".")
+  elif not is_stdio(ns.dictionary):
+    logger.info(f"Written dictionary to: \"{ns.dictionary.absolute()}\".")
+
+  if written_oov_words > 0:
     logger.warning("Not all words were contained in the reference dictionary")
-    if ns.oov_out is not None:
-      unresolved_out_content = "\n".join(unresolved_words)
-      ns.oov_out.parent.mkdir(parents=True, exist_ok=True)
-      try:
-        ns.oov_out.write_text(unresolved_out_content, "UTF-8")
-      except Exception as ex:
-        logger.error("Unresolved output file couldn't be created!")
-        return False
+    if ns.oov_out is not None and not is_stdio(ns.oov_out):
       logger.info(f"Written unresolved vocabulary to: \"{ns.oov_out.absolute()}\".")
   else:
     logger.info("Complete vocabulary is contained in output!")
 
+  if metrics is not None:
+    metrics.oov_words = written_oov_words
+    try:
+      save_metrics(metrics, ns.profile_out)
+    except OSError as ex:
+      logger.warning(f"Metrics couldn't be written to \"{ns.profile_out.absolute()}\".")
+      logger.debug(ex)
+    else:
+      logger.info(f"Written metrics to: \"{ns.profile_out.absolute()}\".")
+
   return True
 
 
-def get_pronunciations(vocabulary: OrderedSet[Word], weight: float, options: Options, n_jobs: int, maxtasksperchild: Optional[int], chunksize: int) -> Tuple[PronunciationDict, OrderedSet[Word]]:
-  lookup_method = partial(
-    process_get_pronunciation,
+def read_dictionary(path: Path, encoding: str, include_numbers: bool, include_weights: bool, mp_options: MultiprocessingOptions, compression: str = COMPRESSION_AUTO) -> PronunciationDict:
+  with open_input(path, encoding, compression) as file:
+    lines = file.read().splitlines()
+  options = DeserializationOptions(False, include_numbers, False, include_weights)
+  result = deserialize(lines, options, mp_options)
+  return result
+
+
+def iter_pronunciations_with_existing(vocabulary: Iterable[Word], existing_dictionary: PronunciationDict, get_entries: Callable[..., Generator[Tuple[Word, Pronunciations], None, None]], prune: bool) -> Generator[Tuple[Word, Pronunciations], None, None]:
+  # only the words which are not contained in the existing dictionary are transcribed by
+  # `get_entries`, streamed words are passed together with the existing dictionary; the entries are yielded in the order of the vocabulary followed by the remaining entries of the
+  # existing dictionary if they are not pruned
+  used_existing_words: Set[Word] = set()
+  if isinstance(vocabulary, Sized):
+    # the missing words are passed at once, therefore they are transcribed in full chunks and their
+    # amount is known
+    entries = get_entries(OrderedSet(
+      word for word in vocabulary
+      if word not in existing_dictionary
+    ))
+    try:
+      for word in vocabulary:
+        if word in existing_dictionary:
+          used_existing_words.add(word)
+          yield word, existing_dictionary[word]
+          continue
+        entry = next(entries)
+        assert entry[0] == word
+        yield entry
+    finally:
+      entries.close()
+  else:
+    yield from iter_streamed_pronunciations_with_existing(
+      vocabulary, existing_dictionary, get_entries, used_existing_words)
+
+  if not prune:
+    for word, pronunciations in existing_dictionary.items():
+      if word not in used_existing_words:
+        yield word, pronunciations
+
+
+def iter_streamed_pronunciations_with_existing(vocabulary: Iterable[Word], existing_dictionary: PronunciationDict, get_entries: Callable[..., Generator[Tuple[Word, Pronunciations], None, None]], used_existing_words: Set[Word]) -> Generator[Tuple[Word, Pronunciations], None, None]:
+  # the words are read while the entries are retrieved, e.g., from stdin, therefore the existing
+  # entries are yielded together with the transcribed words which were read at the same time
+  entries = get_entries(vocabulary, known_entries=existing_dictionary)
+  try:
+    for word, pronunciations in entries:
+      if word in existing_dictionary:
+        used_existing_words.add(word)
+      yield word, pronunciations
+  finally:
+    entries.close()
+
+
+def get_dictionary_paths(vocabulary_paths: List[Path], directory: Path, compression: str = COMPRESSION_AUTO) -> List[Path]:
+  # the dictionaries are only compressed if a compression is given
+  extension = ".dict"
+  if compression not in (COMPRESSION_AUTO, COMPRESSION_NONE):
+    extension += get_compression_extension(compression)
+  result = [
+    directory / f"{remove_compression_extension(path).stem}{extension}"
+    for path in vocabulary_paths
+  ]
+  return result
+
+
+def write_dictionary_per_vocabulary(entries: Iterable[Tuple[Word, Pronunciations]], vocabularies: List[OrderedSet[Word]], dictionary_paths: List[Path], encoding: str, options: SerializationOptions, oov_path: Optional[Path], oov_encoding: str, metrics: Optional[RunMetrics] = None, compression: str = COMPRESSION_AUTO) -> int:
+  # the pronunciations of all words are kept until all words are transcribed because each
+  # vocabulary has its own order; the unresolved words of all vocabularies are written to one file
+  # and the amount of them is returned
+  assert len(vocabularies) == len(dictionary_paths)
+  resulting_dict, unresolved_words = get_dictionary(entries, metrics)
+
+  for vocabulary, dictionary_path in zip(vocabularies, dictionary_paths):
+    with measure_phase(metrics, "write_dictionary"):
+      with DictionaryWriter(dictionary_path, encoding, options, None, oov_encoding, compression) as writer:
+        for word in vocabulary:
+          if word in resulting_dict:
+            writer.write_entry(word, resulting_dict[word])
+
+  if oov_path is not None and len(unresolved_words) > 0:
+    with measure_phase(metrics, "write_oov"):
+      with open_output(oov_path, oov_encoding, compression) as oov_file:
+        oov_file.write("\n".join(unresolved_words))
+  return len(unresolved_words)
+
+
+def get_pronunciations(vocabulary: OrderedSet[Word], weight: float, options: Options, n_jobs: int, maxtasksperchild: Optional[int], chunksize: int, syllable_cache_size: int = DEFAULT_SYLLABLE_CACHE_SIZE, hanzi_table_path: Optional[Path] = None, persistent_cache: Optional[PersistentCache] = None, max_pronunciations: Optional[int] = None, metrics: Optional[RunMetrics] = None, preload: bool = True) -> Tuple[PronunciationDict, OrderedSet[Word]]:
+  entries = iter_pronunciations(vocabulary, weight, options, n_jobs, maxtasksperchild,
+                                chunksize, syllable_cache_size, hanzi_table_path, persistent_cache, max_pronunciations, metrics, preload)
+  resulting_dict, unresolved_words = get_dictionary(entries, metrics)
+  if metrics is not None:
+    metrics.oov_words = len(unresolved_words)
+  return resulting_dict, unresolved_words
+
+
+def iter_pronunciations(vocabulary: Iterable[Word], weight: float, options: Options, n_jobs: int, maxtasksperchild: Optional[int], chunksize: int, syllable_cache_size: int = DEFAULT_SYLLABLE_CACHE_SIZE, hanzi_table_path: Optional[Path] = None, persistent_cache: Optional[PersistentCache] = None, max_pronunciations: Optional[int] = None, metrics: Optional[RunMetrics] = None, preload: bool = True, known_entries: Optional[PronunciationDict] = None) -> Generator[Tuple[Word, Pronunciations], None, None]:
+  # yields the pronunciations of all words in the order of the vocabulary as soon as they are
+  # transcribed; words without pronunciations have empty pronunciations
+  if hanzi_table_path is not None:
+    with measure_phase(metrics, "load_hanzi_table"):
+      hanzi_table_path = prepare_hanzi_table(hanzi_table_path)
+
+  pool = create_pool(n_jobs, maxtasksperchild, syllable_cache_size, hanzi_table_path, preload, metrics)
+
+  with pool:
+    yield from iter_pronunciations_with_pool(
+      pool, vocabulary, weight, options, chunksize, persistent_cache, max_pronunciations, metrics, get_max_pending_chunks(n_jobs), known_entries)
+
+
+def create_pool(n_jobs: int, maxtasksperchild: Optional[int], syllable_cache_size: int, hanzi_table_path: Optional[Path], preload: bool = True, metrics: Optional[RunMetrics] = None) -> Pool:
+  # only forked processes share the memory of the main process; a single process shares nothing,
+  # therefore loading the tables in the main process would only cost time and memory
+  preload = preload and n_jobs > 1 and get_start_method() == "fork"
+  if preload:
+    # contains the import of the dictionaries of dragonmapper
+    with measure_phase(metrics, "preload_tables"):
+      preload_tables()
+    # the garbage collection of the forked processes won't touch the objects of the main process
+    # which keeps their memory shared
+    gc.freeze()
+  try:
+    with measure_phase(metrics, "start_pool"):
+      result = Pool(
+        processes=n_jobs,
+        initializer=__init_pool_prepare_cache_mp,
+        initargs=(syllable_cache_size, hanzi_table_path),
+        maxtasksperchild=maxtasksperchild,
+      )
+  finally:
+    if preload:
+      gc.unfreeze()
+  return result
+
+
+def iter_pronunciations_with_pool(pool: Pool, vocabulary: Iterable[Word], weight: float, options: Options, chunksize: int, persistent_cache: Optional[PersistentCache] = None, max_pronunciations: Optional[int] = None, metrics: Optional[RunMetrics] = None, max_pending_chunks: Optional[int] = None, known_entries: Optional[PronunciationDict] = None) -> Generator[Tuple[Word, Pronunciations], None, None]:
+  # the pool needs to be created with `create_pool`; the words need to be unique; the pronunciations
+  # of the words of `known_entries` are taken from it instead of transcribing them
+  if max_pending_chunks is None:
+    # the amount of processes of the pool is not known
+    max_pending_chunks = get_max_pending_chunks(None)
+  persistent_cache_path = None
+  persistent_cache_options_key = None
+  if persistent_cache is not None:
+    persistent_cache_path = persistent_cache.path
+    persistent_cache_options_key = persistent_cache.options_key
+
+  process_method = partial(
+    process_get_pronunciations,
     weight=weight,
     options=options,
+    max_pronunciations=max_pronunciations,
+    persistent_cache_path=persistent_cache_path,
+    persistent_cache_options_key=persistent_cache_options_key,
   )
 
-  with Pool(
-    processes=n_jobs,
-    initializer=__init_pool_prepare_cache_mp,
-    initargs=(vocabulary,),
-    maxtasksperchild=maxtasksperchild,
-  ) as pool:
-    entries = range(len(vocabulary))
-    iterator = pool.imap(lookup_method, entries, chunksize)
-    pronunciations_to_i = dict(tqdm(iterator, total=len(entries), unit="words"))
+  # words which were transcribed or retrieved from the persistent cache and not yet written to it
+  new_entries: List[Tuple[Word, Pronunciations]] = []
+  used_words: List[Word] = []
+  cached_words_count = 0
+  cache_stats = CacheStats()
 
-  return get_dictionary(pronunciations_to_i, vocabulary)
+  # each process only receives the words of its current chunk
+  if isinstance(vocabulary, Sized):
+    chunks = get_chunks(vocabulary, chunksize)
+  else:
+    # the words are streamed, e.g., from stdin, and each result is needed before further words
+    # might arrive
+    chunks = get_streamed_chunks(vocabulary, chunksize, STREAM_TIMEOUT)
+  if known_entries is None:
+    iterator = iter_chunk_results(pool, process_method, chunks, max_pending_chunks)
+  else:
+    iterator = iter_chunk_results_with_known_entries(
+      pool, process_method, chunks, max_pending_chunks, known_entries)
+  if metrics is not None:
+    # contains the time the results of the workers were awaited
+    iterator = metrics.iter_measured("transcribe", iterator)
+  # the amount of words is unknown if they are streamed
+  total = len(vocabulary) if isinstance(vocabulary, Sized) else None
+  words_count = 0
+  with tqdm(total=total, unit="words") as progress_bar:
+    for chunk, (chunk_results, chunk_stats) in iterator:
+      cache_stats.update(chunk_stats.cache_stats)
+      if metrics is not None:
+        metrics.add_chunk(chunk_stats)
+      for (pronunciations, is_cached), word in zip(chunk_results, chunk):
+        is_known = known_entries is not None and word in known_entries
+        if persistent_cache is not None and not is_known:
+          if is_cached:
+            cached_words_count += 1
+            used_words.append(word)
+          else:
+            new_entries.append((word, pronunciations))
+          if len(new_entries) + len(used_words) >= PERSISTENT_CACHE_WRITE_BATCH_SIZE:
+            with measure_phase(metrics, "write_cache"):
+              persistent_cache.add_many(new_entries)
+              persistent_cache.touch_many(used_words)
+            new_entries.clear()
+            used_words.clear()
+        yield word, pronunciations
+      progress_bar.update(len(chunk_results))
+      words_count += len(chunk)
+
+  log_cache_stats(cache_stats)
+
+  if persistent_cache is not None:
+    with measure_phase(metrics, "write_cache"):
+      persistent_cache.add_many(new_entries)
+      persistent_cache.touch_many(used_words)
+      if persistent_cache.max_entries is not None:
+        persistent_cache.prune(persistent_cache.max_entries)
+    if metrics is not None:
+      metrics.cached_words = cached_words_count
+    logger = getLogger(__name__)
+    logger.info(f"Retrieved {cached_words_count} of {words_count} words from cache.")
+
+
+def log_cache_stats(cache_stats: CacheStats) -> None:
+  logger = getLogger(__name__)
+  hit_ratio = cache_stats.get_hit_ratio()
+  hit_ratio_str = "-" if hit_ratio is None else f"{hit_ratio * 100:.2f}%"
+  logger.info(
+    f"Syllable cache: {cache_stats.hits} hits, {cache_stats.misses} misses ({hit_ratio_str} hit ratio), {cache_stats.evictions} evictions.")
+  logger.info(f"Hanzi table: {cache_stats.table_hits} syllables were taken from the table.")
 
 
-def get_dictionary(pronunciations_to_i: Dict[int, Pronunciations], vocabulary: OrderedSet[Word]) -> Tuple[PronunciationDict, OrderedSet[Word]]:
+def get_dictionary(entries: Iterable[Tuple[Word, Pronunciations]], metrics: Optional[RunMetrics] = None) -> Tuple[PronunciationDict, OrderedSet[Word]]:
   resulting_dict = OrderedDict()
   unresolved_words = OrderedSet()
 
-  for i, word in enumerate(vocabulary):
-    pronunciations = pronunciations_to_i[i]
-
-    if len(pronunciations) == 0:
-      unresolved_words.add(word)
-      continue
-    assert word not in resulting_dict
-    resulting_dict[word] = pronunciations
+  for word, pronunciations in entries:
+    with measure_phase(metrics, "get_dictionary"):
+      if len(pronunciations) == 0:
+        unresolved_words.add(word)
+        continue
+      assert word not in resulting_dict
+      resulting_dict[word] = pronunciations
 
   return resulting_dict, unresolved_words
 
 
-process_unique_words: OrderedSet[Word] = None
-
-
-def __init_pool_prepare_cache_mp(words: OrderedSet[Word]) -> None:
-  global process_unique_words
-  process_unique_words = words
-
+process_persistent_cache: Optional[PersistentCache] = None
+
+
+def __init_pool_prepare_cache_mp(syllable_cache_size: int, hanzi_table_path: Optional[Path]) -> None:
+  configure_syllable_cache(syllable_cache_size)
+  # processes which were forked already share the table of the parent process
+  if hanzi_table_path is not None and transcription.HANZI_TABLE is None:
+    # an exception would stop the process which would be restarted by the pool again and again
+    try:
+      hanzi_table = load_hanzi_table(hanzi_table_path)
+    except HANZI_TABLE_READ_ERRORS as ex:
+      logger = getLogger(__name__)
+      logger.warning(f"Hanzi table \"{hanzi_table_path.absolute()}\" couldn't be read, therefore each character is transcribed.")
+      logger.debug(ex)
+      hanzi_table = None
+    set_hanzi_table(hanzi_table)
+
+
+def prepare_process_persistent_cache(path: Optional[Path], options_key: Optional[str]) -> None:
+  # each process reads from its own connection, only the parent process writes; the connection is
+  # kept open for the following chunks
+  global process_persistent_cache
+  if process_persistent_cache is not None:
+    if path == process_persistent_cache.path and options_key == process_persistent_cache.options_key:
+      return
+    process_persistent_cache.close()
+    process_persistent_cache = None
+  if path is not None:
+    process_persistent_cache = PersistentCache(path, options_key, None, read_only=True)
+
+
+def iter_chunk_results_with_known_entries(pool: Pool, method: Callable[[Tuple[Word, ...]], Tuple[List[Tuple[Pronunciations, bool]], ChunkStats]], chunks: Iterable[Optional[Tuple[Word, ...]]], max_pending_chunks: int, known_entries: PronunciationDict) -> Generator[Tuple[Tuple[Word, ...], Tuple[List[Tuple[Pronunciations, bool]], ChunkStats]], None, None]:
+  # only the unknown words of each chunk are passed to the processes; the known words are yielded
+  # together with the results of their chunk, therefore they don't wait for further words
+  read_chunks: Deque[Tuple[Word, ...]] = deque()
+
+  def iter_unknown_chunks() -> Generator[Optional[Tuple[Word, ...]], None, None]:
+    for chunk in chunks:
+      if chunk is not None:
+        read_chunks.append(chunk)
+        chunk = tuple(word for word in chunk if word not in known_entries)
+      yield chunk
+
+  for _, (unknown_results, chunk_stats) in iter_chunk_results(pool, method, iter_unknown_chunks(), max_pending_chunks):
+    chunk = read_chunks.popleft()
+    unknown_results_iterator = iter(unknown_results)
+    chunk_results = [
+      (known_entries[word], False) if word in known_entries else next(unknown_results_iterator)
+      for word in chunk
+    ]
+    yield chunk, (chunk_results, chunk_stats)
+
+
+def process_get_pronunciations(words: Tuple[Word, ...], weight: float, options: Options, max_pronunciations: Optional[int], persistent_cache_path: Optional[Path] = None, persistent_cache_options_key: Optional[str] = None) -> Tuple[List[Tuple[Pronunciations, bool]], ChunkStats]:
+  start_wall = time.perf_counter()
+  start_cpu = time.process_time()
+  prepare_process_persistent_cache(persistent_cache_path, persistent_cache_options_key)
+  # words which differ only in the trimmed symbols or are split on hyphens share the same lookups,
+  # e.g. '『机具', '机具？' and '机具', therefore each lookup is only transcribed once per chunk
+  lookups: Dict[Word, Pronunciations] = {}
+  # the words of the chunk are looked up in the cache at once
+  cached_entries = {} if process_persistent_cache is None else process_persistent_cache.get_many(words)
+  result = [
+    (cached_entries[word], True) if word in cached_entries
+    else (get_pronunciation(word, weight, options, max_pronunciations, lookups), False)
+    for word in words
+  ]
+  chunk_stats = ChunkStats(
+    pid=os.getpid(),
+    words=len(words),
+    wall=time.perf_counter() - start_wall,
+    cpu=time.process_time() - start_cpu,
+    cache_stats=pop_syllable_cache_stats(),
+  )
+  return result, chunk_stats
 
-def process_get_pronunciation(word_i: int, weight: float, options: Options) -> Tuple[int, Pronunciations]:
-  global process_unique_words
-  assert 0 <= word_i < len(process_unique_words)
-  word = process_unique_words[word_i]
 
+def get_pronunciation(word: Word, weight: float, options: Options, max_pronunciations: Optional[int], lookups: Optional[Dict[Word, Pronunciations]] = None) -> Pronunciations:
   # TODO support all entries; also create all combinations with hyphen then
   lookup_method = partial(
     lookup_in_model,
     weight=weight,
+    max_pronunciations=max_pronunciations,
   )
+  if lookups is not None:
+    lookup_method = get_cached_lookup(lookup_method, lookups)
 
   pronunciations = get_pronunciations_from_word(word, lookup_method, options)
+  # words split on hyphens combine the pronunciations of their parts
+  if max_pronunciations is not None and len(pronunciations) > max_pronunciations:
+    pronunciations = OrderedDict(islice(pronunciations.items(), max_pronunciations))
   #logger = getLogger(__name__)
   # logger.debug(pronunciations)
-  return word_i, pronunciations
+  return pronunciations
 
 
-def lookup_in_model(word: Word, weight: float) -> Pronunciations:
+def lookup_in_model(word: Word, weight: float, max_pronunciations: Optional[int]) -> Pronunciations:
   assert len(word) > 0
-  try:
-    word_IPAs = word_to_ipa(word)
-  except ValueError as error:
+  if not is_transcribable(word):
+    return OrderedDict()
+  word_IPAs = try_word_to_ipa(word, max_pronunciations)
+  if word_IPAs is None:
     return OrderedDict()
   result = OrderedDict(
     (word_IPA, weight)
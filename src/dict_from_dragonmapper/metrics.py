@@ -0,0 +1,145 @@
+import json
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Generator, Iterable, Optional, TypeVar
+
+from dict_from_dragonmapper.cache import CacheStats
+
+try:
+  import resource
+except ImportError:
+  # not available on Windows
+  resource = None
+
+T = TypeVar("T")
+
+
+@dataclass()
+class PhaseMetrics():
+  wall: float = 0.0
+  cpu: float = 0.0
+  calls: int = 0
+
+
+@dataclass()
+class ChunkStats():
+  # is created by the worker process which transcribed the chunk
+  pid: int
+  words: int
+  wall: float
+  cpu: float
+  cache_stats: CacheStats = field(default_factory=CacheStats)
+
+
+@dataclass()
+class WorkerMetrics():
+  chunks: int = 0
+  words: int = 0
+  wall: float = 0.0
+  cpu: float = 0.0
+
+
+class RunMetrics():
+  """Collects the durations of the phases of a run and statistics about the transcription.
+
+  Wall and CPU time of each phase are summed up over all times the phase was measured. The CPU
+  time only contains the time of the current process, the CPU time of the workers is contained
+  in the worker metrics.
+  """
+
+  def __init__(self) -> None:
+    # CPU time which was needed to start the interpreter and import all modules
+    self.startup_cpu = time.process_time()
+    self.phases: Dict[str, PhaseMetrics] = {}
+    self.workers: Dict[int, WorkerMetrics] = {}
+    self.syllable_cache_stats = CacheStats()
+    self.words = 0
+    self.oov_words = 0
+    self.cached_words = 0
+    self.__start_wall = time.perf_counter()
+    self.__start_cpu = time.process_time()
+
+  def add_phase(self, name: str, wall: float, cpu: float) -> None:
+    phase = self.phases.setdefault(name, PhaseMetrics())
+    phase.wall += wall
+    phase.cpu += cpu
+    phase.calls += 1
+
+  @contextmanager
+  def measure(self, name: str) -> Generator[None, None, None]:
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+      yield
+    finally:
+      self.add_phase(name, time.perf_counter() - start_wall, time.process_time() - start_cpu)
+
+  def iter_measured(self, name: str, iterable: Iterable[T]) -> Generator[T, None, None]:
+    # only the time which is needed to retrieve the items is measured
+    iterator = iter(iterable)
+    while True:
+      with self.measure(name):
+        try:
+          item = next(iterator)
+        except StopIteration:
+          return
+      yield item
+
+  def add_chunk(self, chunk_stats: ChunkStats) -> None:
+    worker = self.workers.setdefault(chunk_stats.pid, WorkerMetrics())
+    worker.chunks += 1
+    worker.words += chunk_stats.words
+    worker.wall += chunk_stats.wall
+    worker.cpu += chunk_stats.cpu
+    self.words += chunk_stats.words
+    self.syllable_cache_stats.update(chunk_stats.cache_stats)
+
+  def to_dict(self) -> Dict[str, Any]:
+    wall = time.perf_counter() - self.__start_wall
+    cpu = time.process_time() - self.__start_cpu
+    result = {
+      "startup_cpu": self.startup_cpu,
+      "wall": wall,
+      "cpu": cpu,
+      "words": self.words,
+      "oov_words": self.oov_words,
+      "words_per_second": self.words / wall if wall > 0 else None,
+      "phases": {name: asdict(phase) for name, phase in self.phases.items()},
+      "workers": {str(pid): asdict(worker) for pid, worker in self.workers.items()},
+      "syllable_cache": {
+        **asdict(self.syllable_cache_stats),
+        "hit_ratio": self.syllable_cache_stats.get_hit_ratio(),
+      },
+      "persistent_cache": {
+        "hits": self.cached_words,
+      },
+      "peak_rss_bytes": get_peak_rss(),
+    }
+    return result
+
+
+def get_peak_rss() -> Optional[Dict[str, int]]:
+  # the peak of the children only contains processes which were already terminated
+  if resource is None:
+    return None
+  # macOS reports bytes, other systems kilobytes
+  factor = 1 if sys.platform == "darwin" else 1024
+  result = {
+    "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * factor,
+    "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * factor,
+  }
+  return result
+
+
+def measure_phase(metrics: Optional[RunMetrics], name: str) -> ContextManager:
+  if metrics is None:
+    return nullcontext()
+  return metrics.measure(name)
+
+
+def save_metrics(metrics: RunMetrics, path: Path) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(json.dumps(metrics.to_dict(), indent=2), encoding="UTF-8")
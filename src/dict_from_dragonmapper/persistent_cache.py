@@ -0,0 +1,157 @@
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from importlib.metadata import version
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pronunciation_dictionary import Pronunciations, Word
+from word_to_pronunciation import Options
+
+# needs to be increased if the layout of the database changes
+PERSISTENT_CACHE_FORMAT = 1
+
+# amount of words which are looked up with one query
+LOOKUP_BATCH_SIZE = 500
+
+# amount of words which are collected before they are written to the cache
+PERSISTENT_CACHE_WRITE_BATCH_SIZE = 10000
+
+
+def get_options_key(options: Options, weight: float, max_pronunciations: Optional[int], transcription_hash: str) -> str:
+  # all values which change the resulting pronunciations of a word; the hash of the transcription
+  # (see `hanzi_table.get_transcription_hash`) changes with the transcription even if the version
+  # was not increased
+  result = json.dumps((
+    PERSISTENT_CACHE_FORMAT,
+    version("dict-from-dragonmapper"),
+    version("dragonmapper"),
+    transcription_hash,
+    options.trim_symbols,
+    options.split_on_hyphen,
+    options.try_without_trimming,
+    options.try_without_splitting,
+    options.default_weight,
+    weight,
+    max_pronunciations,
+  ), ensure_ascii=False)
+  return result
+
+
+def serialize_pronunciations(pronunciations: Pronunciations) -> str:
+  result = json.dumps([
+    [pronunciation, weight]
+    for pronunciation, weight in pronunciations.items()
+  ], ensure_ascii=False, separators=(",", ":"))
+  return result
+
+
+def deserialize_pronunciations(serialized: str) -> Pronunciations:
+  result = OrderedDict(
+    (tuple(pronunciation), weight)
+    for pronunciation, weight in json.loads(serialized)
+  )
+  return result
+
+
+class PersistentCache():
+  """Stores the pronunciations of words in a SQLite database to reuse them in later runs.
+
+  Each process needs to open its own instance. Any amount of processes can read from the database
+  while one process writes to it.
+  """
+
+  def __init__(self, path: Path, options_key: str, max_entries: Optional[int], read_only: bool = False) -> None:
+    assert max_entries is None or max_entries > 0
+    self.path = path
+    self.options_key = options_key
+    self.max_entries = max_entries
+    if read_only:
+      self.__connection = sqlite3.connect(f"{path.absolute().as_uri()}?mode=ro", uri=True, timeout=60)
+      return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    self.__connection = sqlite3.connect(path, timeout=60)
+    # allows reading while another process is writing
+    self.__connection.execute("PRAGMA journal_mode=WAL")
+    with self.__connection:
+      self.__connection.execute("""
+        CREATE TABLE IF NOT EXISTS pronunciations (
+          options TEXT NOT NULL,
+          word TEXT NOT NULL,
+          pronunciations TEXT NOT NULL,
+          last_used INTEGER NOT NULL,
+          UNIQUE (options, word)
+        )
+      """)
+      self.__connection.execute(
+        "CREATE INDEX IF NOT EXISTS pronunciations_last_used ON pronunciations (last_used)")
+
+  def __enter__(self) -> "PersistentCache":
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.close()
+
+  def get_many(self, words: Iterable[Word]) -> Dict[Word, Pronunciations]:
+    result = {}
+    batch: List[Word] = []
+    for word in words:
+      batch.append(word)
+      if len(batch) == LOOKUP_BATCH_SIZE:
+        result.update(self.__get_batch(batch))
+        batch = []
+    if len(batch) > 0:
+      result.update(self.__get_batch(batch))
+    return result
+
+  def touch_many(self, words: Iterable[Word]) -> None:
+    # the usage is only tracked if entries need to be pruned
+    if self.max_entries is None:
+      return
+    with self.__connection:
+      self.__connection.executemany(
+        "UPDATE pronunciations SET last_used = ? WHERE options = ? AND word = ?",
+        ((time.time_ns(), self.options_key, word) for word in words)
+      )
+
+  def __get_batch(self, words: List[Word]) -> Dict[Word, Pronunciations]:
+    placeholders = ",".join("?" * len(words))
+    cursor = self.__connection.execute(
+      f"SELECT word, pronunciations FROM pronunciations WHERE options = ? AND word IN ({placeholders})",
+      (self.options_key, *words)
+    )
+    result = {
+      word: deserialize_pronunciations(serialized)
+      for word, serialized in cursor
+    }
+    return result
+
+  def add_many(self, entries: Iterable[Tuple[Word, Pronunciations]]) -> None:
+    with self.__connection:
+      self.__connection.executemany(
+        "INSERT OR REPLACE INTO pronunciations (options, word, pronunciations, last_used) VALUES (?, ?, ?, ?)",
+        (
+          (self.options_key, word, serialize_pronunciations(pronunciations), time.time_ns())
+          for word, pronunciations in entries
+        )
+      )
+
+  def __len__(self) -> int:
+    (result,) = self.__connection.execute("SELECT COUNT(*) FROM pronunciations").fetchone()
+    return result
+
+  def prune(self, max_entries: int) -> int:
+    # removes the least recently used entries of all options
+    surplus = len(self) - max_entries
+    if surplus <= 0:
+      return 0
+    with self.__connection:
+      self.__connection.execute(
+        "DELETE FROM pronunciations WHERE rowid IN (SELECT rowid FROM pronunciations ORDER BY last_used LIMIT ?)",
+        (surplus,)
+      )
+    return surplus
+
+  def close(self) -> None:
+    self.__connection.close()
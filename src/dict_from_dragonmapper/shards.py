@@ -0,0 +1,35 @@
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from dict_from_dragonmapper.streams import COMPRESSION_AUTO, open_input, open_output
+
+# amount of characters which are copied at once while merging
+MERGE_BLOCK_SIZE = 1024 * 1024
+
+
+def get_shard_range(count: int, shard: int, shards: int) -> Tuple[int, int]:
+  # returns start and end index of the words of the shard (1-based); the shards contain consecutive
+  # words, therefore joining their results in the order of the shards keeps the order of the words
+  assert 1 <= shard <= shards
+  start = (shard - 1) * count // shards
+  end = shard * count // shards
+  return start, end
+
+
+def merge_files(paths: Iterable[Path], output_path: Path, encoding: str, compression: str = COMPRESSION_AUTO) -> int:
+  # joins the lines of all files like they were written by `DictionaryWriter`, i.e., separated by
+  # line breaks without a line break at the end; returns the amount of files which weren't empty
+  result = 0
+  with open_output(output_path, encoding, compression) as output_file:
+    for path in paths:
+      with open_input(path, encoding, compression) as file:
+        block = file.read(MERGE_BLOCK_SIZE)
+        if len(block) == 0:
+          continue
+        if result > 0:
+          output_file.write("\n")
+        while len(block) > 0:
+          output_file.write(block)
+          block = file.read(MERGE_BLOCK_SIZE)
+      result += 1
+  return result
@@ -0,0 +1,91 @@
+import bz2
+import gzip
+import lzma
+import sys
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Optional, TextIO
+
+# path which is used to read from stdin or write to stdout
+STDIO_PATH = Path("-")
+
+# the compression is detected from the extension of the file
+COMPRESSION_AUTO = "auto"
+COMPRESSION_NONE = "none"
+
+COMPRESSION_OPENERS: Dict[str, Callable[..., TextIO]] = {
+  "gzip": gzip.open,
+  "bz2": bz2.open,
+  "xz": lzma.open,
+}
+
+COMPRESSION_EXTENSIONS = {
+  ".gz": "gzip",
+  ".bz2": "bz2",
+  ".xz": "xz",
+}
+
+COMPRESSIONS = (COMPRESSION_AUTO, COMPRESSION_NONE, *COMPRESSION_OPENERS)
+
+
+def is_stdio(path: Path) -> bool:
+  return path == STDIO_PATH
+
+
+def get_compression(path: Path, compression: str = COMPRESSION_AUTO) -> Optional[str]:
+  # returns None if the file is not compressed; stdin and stdout are only compressed if the
+  # compression is given
+  assert compression in COMPRESSIONS
+  if compression == COMPRESSION_NONE:
+    return None
+  if compression != COMPRESSION_AUTO:
+    return compression
+  if is_stdio(path):
+    return None
+  return COMPRESSION_EXTENSIONS.get(path.suffix.lower())
+
+
+def get_compression_extension(compression: str) -> str:
+  result = next(
+    extension for extension, extension_compression in COMPRESSION_EXTENSIONS.items()
+    if extension_compression == compression
+  )
+  return result
+
+
+def remove_compression_extension(path: Path) -> Path:
+  if path.suffix.lower() in COMPRESSION_EXTENSIONS:
+    return path.with_suffix("")
+  return path
+
+
+def open_input(path: Path, encoding: str, compression: str = COMPRESSION_AUTO) -> TextIO:
+  used_compression = get_compression(path, compression)
+  if is_stdio(path):
+    if used_compression is None:
+      # stdin itself is not closed on closing the returned file
+      return open(sys.stdin.fileno(), mode="r", encoding=encoding, closefd=False)
+    stdin: BinaryIO = open(sys.stdin.fileno(), mode="rb", closefd=False)
+    return COMPRESSION_OPENERS[used_compression](stdin, mode="rt", encoding=encoding)
+  if used_compression is None:
+    return path.open(mode="r", encoding=encoding)
+  return COMPRESSION_OPENERS[used_compression](path, mode="rt", encoding=encoding)
+
+
+def open_output(path: Path, encoding: str, compression: str = COMPRESSION_AUTO, append: bool = False) -> TextIO:
+  used_compression = get_compression(path, compression)
+  if is_stdio(path):
+    assert not append
+    # everything which was already printed needs to come first
+    sys.stdout.flush()
+    if used_compression is None:
+      # the lines are passed on as soon as they are written, e.g., to the next program of a
+      # pipeline
+      return open(sys.stdout.fileno(), mode="w", encoding=encoding, closefd=False, buffering=1)
+    # the compressed data is not buffered because closing the compressed file doesn't flush stdout
+    stdout: BinaryIO = open(sys.stdout.fileno(), mode="wb", buffering=0, closefd=False)
+    return COMPRESSION_OPENERS[used_compression](stdout, mode="wt", encoding=encoding)
+  path.parent.mkdir(parents=True, exist_ok=True)
+  mode = "a" if append else "w"
+  if used_compression is None:
+    return path.open(mode=mode, encoding=encoding)
+  return COMPRESSION_OPENERS[used_compression](path, mode=f"{mode}t", encoding=encoding)
@@ -0,0 +1,70 @@
+from multiprocessing.pool import Pool
+from pathlib import Path
+from typing import Generator, Iterable, Optional, Tuple
+
+from ordered_set import OrderedSet
+from pronunciation_dictionary import PronunciationDict, Pronunciations, Word
+from word_to_pronunciation import Options
+
+from dict_from_dragonmapper.chunks import get_max_pending_chunks
+from dict_from_dragonmapper.hanzi_table import prepare_hanzi_table
+from dict_from_dragonmapper.main import create_pool, get_dictionary, iter_pronunciations_with_pool
+from dict_from_dragonmapper.metrics import RunMetrics
+from dict_from_dragonmapper.persistent_cache import PersistentCache
+from dict_from_dragonmapper.transcription import DEFAULT_SYLLABLE_CACHE_SIZE
+
+
+class Transcriber():
+  """Transcribes vocabularies with a pool of processes which is kept running between the calls.
+
+  The processes keep their syllable caches and the hanzi table, therefore only the first call needs
+  to start them. The pool is shut down by `close` or on leaving the context.
+  """
+
+  def __init__(self, n_jobs: int, maxtasksperchild: Optional[int] = None, syllable_cache_size: int = DEFAULT_SYLLABLE_CACHE_SIZE, hanzi_table_path: Optional[Path] = None, preload: bool = True) -> None:
+    if hanzi_table_path is not None:
+      hanzi_table_path = prepare_hanzi_table(hanzi_table_path)
+    self.__max_pending_chunks = get_max_pending_chunks(n_jobs)
+    self.__pool: Optional[Pool] = create_pool(
+      n_jobs, maxtasksperchild, syllable_cache_size, hanzi_table_path, preload)
+
+  def __enter__(self) -> "Transcriber":
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.close()
+
+  @property
+  def is_closed(self) -> bool:
+    return self.__pool is None
+
+  def get_pronunciations(self, vocabulary: OrderedSet[Word], weight: float, options: Options, chunksize: int, persistent_cache: Optional[PersistentCache] = None, max_pronunciations: Optional[int] = None, metrics: Optional[RunMetrics] = None) -> Tuple[PronunciationDict, OrderedSet[Word]]:
+    entries = self.iter_pronunciations(
+      vocabulary, weight, options, chunksize, persistent_cache, max_pronunciations, metrics)
+    resulting_dict, unresolved_words = get_dictionary(entries, metrics)
+    if metrics is not None:
+      metrics.oov_words = len(unresolved_words)
+    return resulting_dict, unresolved_words
+
+  def iter_pronunciations(self, vocabulary: Iterable[Word], weight: float, options: Options, chunksize: int, persistent_cache: Optional[PersistentCache] = None, max_pronunciations: Optional[int] = None, metrics: Optional[RunMetrics] = None) -> Generator[Tuple[Word, Pronunciations], None, None]:
+    if self.__pool is None:
+      raise ValueError("Transcriber is already closed!")
+    result = iter_pronunciations_with_pool(
+      self.__pool, vocabulary, weight, options, chunksize, persistent_cache, max_pronunciations, metrics, self.__max_pending_chunks)
+    return result
+
+  def close(self) -> None:
+    # waits until all processes have finished their current work
+    if self.__pool is None:
+      return
+    self.__pool.close()
+    self.__pool.join()
+    self.__pool = None
+
+  def terminate(self) -> None:
+    # stops all processes immediately
+    if self.__pool is None:
+      return
+    self.__pool.terminate()
+    self.__pool.join()
+    self.__pool = None
@@ -1,12 +1,17 @@
+import heapq
 import itertools
+from functools import lru_cache
 from logging import getLogger
-from typing import Tuple
+from typing import Dict, FrozenSet, Generator, List, Optional, Tuple
 
-from dragonmapper import hanzi
+from dragonmapper import transcriptions
+from dragonmapper.data import load_data_file
+from dragonmapper.transcriptions import numbered_syllable_to_accented
 from ordered_set import OrderedSet
 
-from dict_from_dragonmapper.ipa2symb import merge_fusion_with_ignore, parse_ipa_to_symbols
-from dict_from_dragonmapper.ipa_symbols import SCHWAS, TONES, VOWELS
+from dict_from_dragonmapper.cache import CacheStats, LRUCache
+from dict_from_dragonmapper.ipa2symb import FusionMerger, parse_ipa_to_symbols
+from dict_from_dragonmapper.ipa_symbols import TONE_CHARACTERS, TONES, VOWELS, VOWELS_AND_SCHWAS
 
 # probably does not cover all
 EXCEPTIONS_WHERE_PINYIN_AND_IPA_IS_EQUAL = {
@@ -29,38 +34,197 @@ CHN_PINYIN_MAPPING = {
 }
 # '[ne/nà/nè/na/nuò][nǎ/na/nuó/nǎi/nà/niè/né][hēng/hng][gěng/yǐng/yìng/ńg/ń][fán/fan][nán/nan/nàn]'
 
+PINYIN_TONE_NUMBERS = ("1", "2", "3", "4", "5")
 
-def word_to_ipa(word: str) -> OrderedSet[Tuple[str, ...]]:
+AFFRICATIVE_FUSION_SYMBOLS = frozenset({"ʈ", "ʂ", "t", "s", "ɕ"})
+AFFRICATIVE_IGNORE_SYMBOLS = frozenset({"ʰ"})
+DIPHTHONG_FUSION_SYMBOLS = frozenset(VOWELS - {"y"})
+DIPHTHONG_IGNORE_SYMBOLS = frozenset({"˧", "˩", "˥"})
+
+AFFRICATIVE_MERGER = FusionMerger(AFFRICATIVE_FUSION_SYMBOLS, AFFRICATIVE_IGNORE_SYMBOLS)
+DIPHTHONG_MERGER = FusionMerger(DIPHTHONG_FUSION_SYMBOLS, DIPHTHONG_IGNORE_SYMBOLS)
+
+# transcriptions of all known pinyin syllables; will be built on first use
+PINYIN_TABLE: Optional[Dict[str, Tuple[str, ...]]] = None
+
+# all characters for which dragonmapper knows a reading; will be built on first use
+TRANSCRIBABLE_CHARACTERS: Optional[FrozenSet[str]] = None
+
+# covers all characters of dragonmapper (about 41k)
+DEFAULT_SYLLABLE_CACHE_SIZE = 50000
+
+# contains the IPA transcriptions or None if a syllable couldn't be transcribed
+SYLLABLE_CACHE: LRUCache[Optional[Tuple[Tuple[str, ...], ...]]] = LRUCache(
+  DEFAULT_SYLLABLE_CACHE_SIZE)
+
+
+# precompiled transcriptions of all transcribable characters (see `hanzi_table.py`)
+HANZI_TABLE: Optional[Dict[str, Tuple[Tuple[str, ...], ...]]] = None
+
+# syllables which were taken from the hanzi table, these don't reach the syllable cache
+HANZI_TABLE_HITS = 0
+
+
+def set_hanzi_table(table: Optional[Dict[str, Tuple[Tuple[str, ...], ...]]]) -> None:
+  global HANZI_TABLE
+  HANZI_TABLE = table
+
+
+def configure_syllable_cache(maxsize: int) -> None:
+  global SYLLABLE_CACHE
+  SYLLABLE_CACHE = LRUCache(maxsize)
+
+
+def get_syllable_cache_stats() -> CacheStats:
+  result = CacheStats(table_hits=HANZI_TABLE_HITS)
+  result.update(SYLLABLE_CACHE.stats)
+  return result
+
+
+def pop_syllable_cache_stats() -> CacheStats:
+  global HANZI_TABLE_HITS
+  result = SYLLABLE_CACHE.pop_stats()
+  result.table_hits = HANZI_TABLE_HITS
+  HANZI_TABLE_HITS = 0
+  return result
+
+
+def word_to_ipa(word: str, max_pronunciations: Optional[int] = None) -> OrderedSet[Tuple[str, ...]]:
   # e.g. -> 北风 => p eɪ˧˩˧ f ɤ˥ ŋ
+  result = try_word_to_ipa(word, max_pronunciations)
+  if result is None:
+    raise get_word_error(word)
+  return result
+
+
+def try_word_to_ipa(word: str, max_pronunciations: Optional[int] = None) -> Optional[OrderedSet[Tuple[str, ...]]]:
+  # returns None if the word can't be transcribed
+  syllables_IPAs = get_syllables_ipa(word)
+  if syllables_IPAs is None:
+    return None
+  if max_pronunciations is None:
+    return OrderedSet(iter_unique_combinations(syllables_IPAs))
+  # the ranking ensures that the cap doesn't only vary the readings of the last syllables
+  all_syllable_combinations = OrderedSet(
+    itertools.islice(iter_unique_combinations(syllables_IPAs, ranked=True), max_pronunciations)
+  )
+  return all_syllable_combinations
+
+
+def iter_word_ipa(word: str) -> Generator[Tuple[str, ...], None, None]:
+  # yields the unique combinations of the readings of all syllables ranked by the sum of the indices
+  # of their readings, i.e., the first readings of all syllables come first; this is the order of
+  # `word_to_ipa` if `max_pronunciations` is given
+  syllables_IPAs = get_syllables_ipa(word)
+  if syllables_IPAs is None:
+    raise get_word_error(word)
+  yield from iter_unique_combinations(syllables_IPAs, ranked=True)
+
+
+def get_word_error(word: str) -> ValueError:
+  # creates the error for a word which couldn't be transcribed
+  syllable = next(
+    syllable for syllable in word
+    if get_syllable_ipa(syllable) is None
+  )
+  result = ValueError(f"Syllable \"{syllable}\" couldn't be transcribed!")
+  result.__cause__ = get_syllable_error(syllable)
+  return result
+
+
+def get_syllables_ipa(word: str) -> Optional[List[Tuple[Tuple[str, ...], ...]]]:
+  # returns None if any syllable can't be transcribed
   assert isinstance(word, str)
   assert len(word) > 0
 
   syllables_IPAs = []
   for syllable in word:
-    try:
-      syllable_IPAs = syllable_to_ipa(syllable)
-    except ValueError as error:
-      raise ValueError(f"Syllable \"{syllable}\" couldn't be transcribed!") from error
+    syllable_IPAs = get_syllable_ipa(syllable)
+    if syllable_IPAs is None:
+      return None
     syllables_IPAs.append(syllable_IPAs)
+  return syllables_IPAs
+
+
+def get_syllable_ipa(syllable: str) -> Optional[Tuple[Tuple[str, ...], ...]]:
+  global HANZI_TABLE_HITS
+  if HANZI_TABLE is not None and syllable in HANZI_TABLE:
+    HANZI_TABLE_HITS += 1
+    return HANZI_TABLE[syllable]
+  return get_syllable_ipa_cached(syllable)
+
+
+def iter_unique_combinations(syllables_IPAs: List[Tuple[Tuple[str, ...], ...]], ranked: bool = False) -> Generator[Tuple[str, ...], None, None]:
+  # the combinations are yielded in the order of `itertools.product` or, if they are ranked, ordered
+  # by the sum of the indices of their readings (see `iter_ranked_reading_indices`)
+  # different combinations can result in the same symbols, e.g., ('a',) + ('n', 'a') and ('a', 'n') + ('a',)
+  if ranked:
+    combinations = (
+      tuple(
+        syllable_IPAs[reading_index]
+        for syllable_IPAs, reading_index in zip(syllables_IPAs, reading_indices)
+      )
+      for reading_indices in iter_ranked_reading_indices(tuple(map(len, syllables_IPAs)))
+    )
+  else:
+    combinations = itertools.product(*syllables_IPAs)
+  yielded_combinations = set()
+  for combination in combinations:
+    symbols = tuple(itertools.chain.from_iterable(combination))
+    if symbols not in yielded_combinations:
+      yielded_combinations.add(symbols)
+      yield symbols
+
+
+def iter_ranked_reading_indices(reading_counts: Tuple[int, ...]) -> Generator[Tuple[int, ...], None, None]:
+  # yields all combinations of the reading indices ordered by their sum; combinations with the same
+  # sum are yielded in the order of `itertools.product`, i.e., the last syllable changes first
+  # each combination is only created from the one where the index of its last changed syllable is
+  # one lower, therefore the successors only change that syllable or the ones after it
+  heap = [(0, (0,) * len(reading_counts), 0)]
+  while len(heap) > 0:
+    rank, reading_indices, last_changed = heapq.heappop(heap)
+    yield reading_indices
+    for position in range(last_changed, len(reading_counts)):
+      if reading_indices[position] + 1 < reading_counts[position]:
+        successor = (
+          reading_indices[:position]
+          + (reading_indices[position] + 1,)
+          + reading_indices[position + 1:]
+        )
+        heapq.heappush(heap, (rank + 1, successor, position))
+
+
+def get_syllable_ipa_cached(syllable: str) -> Optional[Tuple[Tuple[str, ...], ...]]:
+  found, result = SYLLABLE_CACHE.lookup(syllable)
+  if not found:
+    syllable_IPAs = try_syllable_to_ipa(syllable)
+    if syllable_IPAs is not None:
+      result = tuple(syllable_IPAs)
+    SYLLABLE_CACHE.add(syllable, result)
+  return result
 
-  all_syllable_combinations = OrderedSet(
-    tuple(itertools.chain.from_iterable(combination))
-    for combination in itertools.product(*syllables_IPAs)
-  )
 
-  return all_syllable_combinations
+def attach_tones_to_last_vowel(syllable_ipa: str) -> Tuple[str, ...]:
+  result = try_attach_tones_to_last_vowel(syllable_ipa)
+  if result is None:
+    raise ValueError(f"Tones couldn't be attached to IPA (\"{syllable_ipa}\")!")
+  return result
 
 
-def attach_tones_to_last_vowel(syllable_ipa: str) -> Tuple[str, ...]:
-  ipa_tones = separate_syllable_ipa_into_phonemes_and_tones(syllable_ipa)
-  syllable_phonemes, tone_ipa = ipa_tones
-  assert syllable_ipa.endswith(tone_ipa)
+def try_attach_tones_to_last_vowel(syllable_ipa: str) -> Optional[Tuple[str, ...]]:
+  # returns None if the IPA is invalid, e.g., "lɤ˥˩n" from "lèn" or "ɻ˥" from "r1"; these are checked
+  # explicitly because the result must not depend on whether assertions are enabled
+  if not TONES.isdisjoint(syllable_ipa.rstrip(TONE_CHARACTERS)):
+    # tones are only allowed at the end
+    return None
+  syllable_phonemes, tone_ipa = separate_syllable_ipa_into_phonemes_and_tones(syllable_ipa)
 
   syllable_ipa_symbols = parse_ipa_to_symbols(syllable_phonemes)
   syllable_vowel_count = get_vowel_count(syllable_ipa_symbols)
-  assert tone_ipa == "" or syllable_vowel_count >= 1
-  if syllable_vowel_count == 0:
-    assert syllable_ipa == "ɻ"
+  if syllable_vowel_count == 0 and syllable_ipa != "ɻ":
+    # tones need a vowel and only "ɻ" is allowed without vowels
+    return None
 
   if len(tone_ipa) == 0:
     syllable_ipa_symbols_with_tones = syllable_ipa_symbols
@@ -80,24 +244,106 @@ def attach_tones_to_last_vowel(syllable_ipa: str) -> Tuple[str, ...]:
 
 
 def merge_affricatives(syllable_ipa: Tuple[str, ...]) -> Tuple[str, ...]:
-  result = merge_fusion_with_ignore(
-    symbols=syllable_ipa,
-    fusion_symbols={"ʈ", "ʂ", "t", "s", "ɕ"},
-    ignore={"ʰ"}
-  )
+  result = AFFRICATIVE_MERGER.merge(syllable_ipa)
   return result
 
 
 def merge_diphthongs(syllable_ipa: Tuple[str, ...]) -> Tuple[str, ...]:
-  result = merge_fusion_with_ignore(
-    symbols=syllable_ipa,
-    fusion_symbols=VOWELS - {"y"},
-    ignore={"˧", "˩", "˥"}
-  )
+  result = DIPHTHONG_MERGER.merge(syllable_ipa)
+  return result
+
+
+def get_all_pinyin() -> OrderedSet[str]:
+  # all toned variants of the pinyin syllables known to dragonmapper and all readings of its characters
+  result = OrderedSet()
+  for line in load_data_file("transcriptions.csv")[1:]:
+    syllable = line.split(",")[0]
+    for tone_number in PINYIN_TONE_NUMBERS:
+      result.add(numbered_syllable_to_accented(syllable + tone_number))
+  for line in load_data_file("hanzi_pinyin_characters.tsv"):
+    readings = line.split("\t")[1]
+    result.update(readings.split("/"))
   return result
 
 
+def build_pinyin_table() -> Dict[str, Tuple[str, ...]]:
+  # only pinyin which could be transcribed are contained, all others are transcribed like before
+  result = {}
+  for pinyin in get_all_pinyin():
+    pinyin_IPA = try_transcribe_pinyin_to_ipa(pinyin)
+    if pinyin_IPA is not None:
+      result[pinyin] = pinyin_IPA
+  return result
+
+
+def get_pinyin_table() -> Dict[str, Tuple[str, ...]]:
+  global PINYIN_TABLE
+  if PINYIN_TABLE is None:
+    PINYIN_TABLE = build_pinyin_table()
+  return PINYIN_TABLE
+
+
+def build_transcribable_characters() -> FrozenSet[str]:
+  # `hanzi.to_pinyin()` looks up single characters in the words and then in the characters
+  result = set()
+  for file_name in ("hanzi_pinyin_words.tsv", "hanzi_pinyin_characters.tsv"):
+    for line in load_data_file(file_name):
+      hanzi = line.split("\t", 1)[0]
+      if len(hanzi) == 1:
+        result.add(hanzi)
+  return frozenset(result)
+
+
+def get_transcribable_characters() -> FrozenSet[str]:
+  global TRANSCRIBABLE_CHARACTERS
+  if TRANSCRIBABLE_CHARACTERS is None:
+    TRANSCRIBABLE_CHARACTERS = build_transcribable_characters()
+  return TRANSCRIBABLE_CHARACTERS
+
+
+def is_transcribable(word: str) -> bool:
+  # words containing characters without a reading, e.g., latin letters, digits or emojis, are
+  # rejected without transcribing any character; the other words can still fail if no reading of a
+  # character can be transcribed
+  return get_transcribable_characters().issuperset(word)
+
+
+def preload_tables() -> None:
+  # loads everything which would otherwise be loaded on first use, e.g., before processes are forked;
+  # characters which are contained in the hanzi table don't need dragonmapper or the pinyin table
+  get_transcribable_characters()
+  if HANZI_TABLE is not None:
+    return
+  get_pinyin_table()
+  # compiles the regular expressions which are used by dragonmapper
+  syllable_to_pinyin("中")
+  transcribe_pinyin_to_ipa("zhōng")
+
+
 def pinyin_to_ipa(syllable_pinyin: str) -> Tuple[str, ...]:
+  result = try_pinyin_to_ipa(syllable_pinyin)
+  if result is None:
+    raise ValueError(f"IPA couldn't be retrieved from Pinyin (\"{syllable_pinyin}\")!")
+  return result
+
+
+def try_pinyin_to_ipa(syllable_pinyin: str) -> Optional[Tuple[str, ...]]:
+  # returns None if the pinyin can't be transcribed
+  pinyin_table = get_pinyin_table()
+  if syllable_pinyin in pinyin_table:
+    return pinyin_table[syllable_pinyin]
+  return try_transcribe_pinyin_to_ipa(syllable_pinyin)
+
+
+def transcribe_pinyin_to_ipa(syllable_pinyin: str) -> Tuple[str, ...]:
+  result = try_transcribe_pinyin_to_ipa(syllable_pinyin)
+  if result is None:
+    raise ValueError(f"IPA couldn't be retrieved from Pinyin (\"{syllable_pinyin}\")!")
+  return result
+
+
+def try_transcribe_pinyin_to_ipa(syllable_pinyin: str) -> Optional[Tuple[str, ...]]:
+  # returns None if the pinyin can't be transcribed
   # some pinyin will result in invalid IPA in the next step which is why it will be considered before for known errors
   # DEBUG    dict_from_dragonmapper.transcription:transcription.py:175 Pinyin 'ň' from syllable '嗯' couldn't be transcribed to IPA!
   # DEBUG    dict_from_dragonmapper.transcription:transcription.py:175 Pinyin 'ǹ' from syllable '嗯' couldn't be transcribed to IPA!
@@ -114,24 +360,26 @@ def pinyin_to_ipa(syllable_pinyin: str) -> Tuple[str, ...]:
   #   return ("x", "ŋ")
 
   try:
-    syllable_ipa = hanzi.pinyin_to_ipa(syllable_pinyin)
-  except ValueError as ex:
-    #print("Error in retrieving IPA from pinyin!", pinyin_str, ex.args[0])
-    raise ValueError(f"IPA couldn't be retrieved from Pinyin (\"{syllable_pinyin}\")!") from ex
+    syllable_ipa = transcriptions.pinyin_to_ipa(syllable_pinyin)
+  except ValueError:
+    # only pinyin which are not contained in the pinyin table reach dragonmapper
+    return None
 
   # some pinyin will result in invalid IPA:
   # therefore filtering:
   no_ipa_to_pinyin_found = syllable_pinyin == syllable_ipa and syllable_pinyin not in EXCEPTIONS_WHERE_PINYIN_AND_IPA_IS_EQUAL
   if no_ipa_to_pinyin_found:
-    raise ValueError(f"IPA couldn't be retrieved from Pinyin (\"{syllable_pinyin}\")!")
+    return None
 
   # 晒 returns "ʂai˥˩" which is incorrect
   if "ai" in syllable_ipa:
     logger = getLogger(__name__)
-    logger.debug(f"fix: replaced wrong 'ai' to 'aɪ' in '{syllable_ipa}'")
+    logger.debug("fix: replaced wrong 'ai' to 'aɪ' in '%s'", syllable_ipa)
     syllable_ipa = syllable_ipa.replace("ai", "aɪ")
 
-  syllable_ipa = attach_tones_to_last_vowel(syllable_ipa)
+  syllable_ipa = try_attach_tones_to_last_vowel(syllable_ipa)
+  if syllable_ipa is None:
+    return None
   syllable_ipa = merge_affricatives(syllable_ipa)
   syllable_ipa = merge_diphthongs(syllable_ipa)
 
@@ -153,17 +401,28 @@ def pinyin_to_ipa(syllable_pinyin: str) -> Tuple[str, ...]:
 
 
 def syllable_to_pinyin(syllable: str) -> OrderedSet[str]:
+  result = try_syllable_to_pinyin(syllable)
+  if result is None:
+    raise ValueError(f"Pinyin couldn't be retrieved from syllable '{syllable}'!")
+  return result
+
+
+def try_syllable_to_pinyin(syllable: str) -> Optional[OrderedSet[str]]:
+  # returns None if dragonmapper has no reading for the syllable
   assert isinstance(syllable, str)
   assert len(syllable) == 1
 
   # if syllable in CHN_PINYIN_MAPPING:
   #   return OrderedSet((CHN_PINYIN_MAPPING[syllable],))
 
+  # importing `hanzi` loads the dictionaries of dragonmapper which takes long, therefore it is only
+  # imported if a character needs to be transcribed
+  from dragonmapper import hanzi
   syllable_pinyin = hanzi.to_pinyin(syllable, delimiter=None, all_readings=True, container="[]")
   no_pinyin_found = syllable_pinyin == syllable
   if no_pinyin_found:
     # print(word_str, "No pinyin!")
-    raise ValueError(f"Pinyin couldn't be retrieved from syllable '{syllable}'!")
+    return None
   readings_without_container = syllable_pinyin[1:-1]
   readings = readings_without_container.split("/")
   result = OrderedSet(readings)
@@ -171,26 +430,42 @@ def syllable_to_pinyin(syllable: str) -> OrderedSet[str]:
 
 
 def syllable_to_ipa(syllable: str) -> OrderedSet[Tuple[str, ...]]:
+  result = try_syllable_to_ipa(syllable)
+  if result is None:
+    raise get_syllable_error(syllable)
+  return result
+
+
+def get_syllable_error(syllable: str) -> ValueError:
+  # creates the error for a syllable which couldn't be transcribed; syllables without a reading fail
+  # on their pinyin, all others on their IPA
+  if not is_transcribable(syllable):
+    return ValueError(f"Pinyin couldn't be retrieved from syllable '{syllable}'!")
+  return ValueError("Syllable could not be converted to IPA!")
+
+
+def try_syllable_to_ipa(syllable: str) -> Optional[OrderedSet[Tuple[str, ...]]]:
+  # returns None if the syllable can't be transcribed
+  syllable_pinyins = try_syllable_to_pinyin(syllable)
+  if syllable_pinyins is None:
+    return None
   result = OrderedSet()
   error_occurred = False
   successfull_pinyin = OrderedSet()
-  for pinyin in syllable_to_pinyin(syllable):
-    try:
-      ipa = pinyin_to_ipa(pinyin)
-    except ValueError as error:
+  for pinyin in syllable_pinyins:
+    ipa = try_pinyin_to_ipa(pinyin)
+    if ipa is None:
       logger = getLogger(__name__)
-      logger.debug(f"Pinyin '{pinyin}' from syllable '{syllable}' couldn't be transcribed to IPA!")
+      logger.debug("Pinyin '%s' from syllable '%s' couldn't be transcribed to IPA!", pinyin, syllable)
       error_occurred = True
       continue
     result.add(ipa)
     successfull_pinyin.add(pinyin)
   if len(result) == 0:
-    raise ValueError("Syllable could not be converted to IPA!")
+    return None
   if error_occurred:
     logger = getLogger(__name__)
-    logger.debug(f"Used other pinyin transcription(s): {', '.join(successfull_pinyin)}.")
-  del successfull_pinyin
-  del error_occurred
+    logger.debug("Used other pinyin transcription(s): %s.", ", ".join(successfull_pinyin))
   return result
 
 
@@ -211,24 +486,19 @@ def syllable_to_ipa(syllable: str) -> OrderedSet[Tuple[str, ...]]:
 
 
 def separate_syllable_ipa_into_phonemes_and_tones(syllable_ipa: str) -> Tuple[str, str]:
-  syllable_phonemes = ""
-  syllable_tones = ""
-  for character in syllable_ipa:
-    if character in TONES:
-      syllable_tones += character
-    else:
-      # No characters after tones allowed
-      assert syllable_tones == ""
-      syllable_phonemes += character
+  syllable_phonemes = syllable_ipa.rstrip(TONE_CHARACTERS)
+  syllable_tones = syllable_ipa[len(syllable_phonemes):]
+  # No characters after tones allowed
+  assert TONES.isdisjoint(syllable_phonemes)
   return syllable_phonemes, syllable_tones
 
 
+@lru_cache(maxsize=None)
 def is_vowel(symbol: str) -> bool:
-  vowels = VOWELS | SCHWAS
-  result = all(sub_symbol in vowels for sub_symbol in tuple(symbol))
+  result = VOWELS_AND_SCHWAS.issuperset(symbol)
   return result
 
 
 def get_vowel_count(symbols: Tuple[str, ...]) -> int:
-  result = sum(1 if is_vowel(symbol) else 0 for symbol in symbols)
+  result = sum(map(is_vowel, symbols))
   return result
@@ -0,0 +1,42 @@
+from pathlib import Path
+from typing import Generator, Iterable, Set
+
+from ordered_set import OrderedSet
+from pronunciation_dictionary import Word
+
+from dict_from_dragonmapper.streams import COMPRESSION_AUTO, open_input
+
+
+def read_vocabulary(path: Path, encoding: str, compression: str = COMPRESSION_AUTO) -> OrderedSet[Word]:
+  result = OrderedSet()
+  add_vocabulary(result, path, encoding, compression)
+  return result
+
+
+def read_vocabularies(paths: Iterable[Path], encoding: str, compression: str = COMPRESSION_AUTO) -> OrderedSet[Word]:
+  # words which are contained in multiple vocabularies are only contained once
+  result = OrderedSet()
+  for path in paths:
+    add_vocabulary(result, path, encoding, compression)
+  return result
+
+
+def add_vocabulary(words: OrderedSet[Word], path: Path, encoding: str, compression: str = COMPRESSION_AUTO) -> None:
+  # the file is read line by line to keep only the unique words in memory
+  with open_input(path, encoding, compression) as file:
+    for line in file:
+      # `splitlines` considers further line boundaries than iterating over the file
+      words.update(line.splitlines())
+
+
+def iter_vocabularies(paths: Iterable[Path], encoding: str, compression: str = COMPRESSION_AUTO) -> Generator[Word, None, None]:
+  # yields the unique words of all vocabularies as soon as they are read, e.g., from stdin; only
+  # the words which were already yielded are kept in memory
+  yielded_words: Set[Word] = set()
+  for path in paths:
+    with open_input(path, encoding, compression) as file:
+      for line in file:
+        for word in line.splitlines():
+          if word not in yielded_words:
+            yielded_words.add(word)
+            yield word
@@ -0,0 +1,139 @@
+import argparse
+import logging
+import sys
+from argparse import ArgumentParser, Namespace
+from logging import getLogger
+from typing import Dict, List, Optional
+
+from ordered_set import OrderedSet
+from pronunciation_dictionary import Word
+
+from dict_from_dragonmapper.argparse_helper import (DEFAULT_CHUNKSIZE, parse_existing_file,
+                                                    parse_non_negative_float,
+                                                    parse_non_negative_integer, parse_path,
+                                                    parse_positive_integer)
+from dict_from_dragonmapper_benchmarks.benchmarks import (get_end_to_end_benchmarks,
+                                                          get_micro_benchmarks, measure)
+from dict_from_dragonmapper_benchmarks.corpus import (DEFAULT_SEED, DEFAULT_SYNTHETIC_CORPUS_SIZE,
+                                                      get_synthetic_corpus, load_test_vocabulary)
+from dict_from_dragonmapper_benchmarks.results import (DEFAULT_THRESHOLD, create_results,
+                                                       get_regressions, load_results, save_results)
+from dict_from_dragonmapper_benchmarks.startup import (HEAVY_MODULES, STARTUP_COMMANDS,
+                                                       get_import_times, get_startup_benchmarks)
+
+
+def formatter(prog):
+  return argparse.ArgumentDefaultsHelpFormatter(prog, max_help_position=40)
+
+
+def run_benchmarks(ns: Namespace) -> bool:
+  logger = getLogger(__name__)
+  vocabulary = load_test_vocabulary()
+  corpora: Dict[str, OrderedSet[Word]] = {"test-vocabulary": vocabulary}
+  if ns.synthetic_size > 0:
+    corpora["synthetic"] = get_synthetic_corpus(vocabulary, ns.synthetic_size, ns.seed)
+
+  benchmarks = []
+  if not ns.skip_micro:
+    benchmarks.extend(get_micro_benchmarks(vocabulary))
+  if not ns.skip_end_to_end:
+    benchmarks.extend(get_end_to_end_benchmarks(corpora, ns.n_jobs, ns.chunksizes))
+  if not ns.skip_startup:
+    benchmarks.extend(get_startup_benchmarks())
+    log_heavy_imports()
+
+  results = {}
+  for benchmark in benchmarks:
+    if ns.filter is not None and ns.filter not in benchmark.name:
+      continue
+    result = measure(benchmark, ns.repeat)
+    results[benchmark.name] = result
+    logger.info(
+      f"{benchmark.name}: {result['min']:.4f}s (median: {result['median']:.4f}s, {benchmark.items} items)")
+
+  save_results(create_results(results), ns.output)
+  logger.info(f"Written results to: \"{ns.output.absolute()}\".")
+  return True
+
+
+def log_heavy_imports() -> None:
+  logger = getLogger(__name__)
+  import_times = get_import_times(STARTUP_COMMANDS["--version"])
+  for module in HEAVY_MODULES:
+    if module in import_times:
+      logger.warning(
+        f"\"--version\" imports \"{module}\" ({import_times[module] / 1000:.1f}ms).")
+
+
+def compare_results(ns: Namespace) -> bool:
+  logger = getLogger(__name__)
+  baseline = load_results(ns.baseline)
+  current = load_results(ns.current)
+  regressions = get_regressions(baseline, current, ns.threshold)
+  for name, ratio in regressions:
+    logger.error(f"{name}: {ratio:.2f}x slower than the baseline.")
+  if len(regressions) > 0:
+    return False
+  logger.info("No regressions found.")
+  return True
+
+
+def get_parser() -> ArgumentParser:
+  parser = ArgumentParser(
+    prog="python -m dict_from_dragonmapper_benchmarks",
+    description="Measure the throughput of the transcription and compare the results of two runs.",
+    formatter_class=formatter,
+  )
+  subparsers = parser.add_subparsers(metavar="COMMAND")
+
+  run_parser = subparsers.add_parser(
+    "run", help="run benchmarks and write the results as JSON", formatter_class=formatter)
+  run_parser.add_argument("output", metavar="OUTPUT-PATH", type=parse_path,
+                          help="path to write the results")
+  run_parser.add_argument("--repeat", type=parse_positive_integer, metavar="NUMBER", default=5,
+                          help="amount of runs per benchmark; the fastest run is compared")
+  run_parser.add_argument("--n-jobs", type=parse_positive_integer, metavar="N", nargs="+",
+                          default=[1], help="amounts of parallel cpu jobs for the end-to-end benchmarks")
+  run_parser.add_argument("--chunksizes", type=parse_positive_integer, metavar="NUMBER", nargs="+",
+                          default=[100, DEFAULT_CHUNKSIZE], help="chunksizes for the end-to-end benchmarks")
+  run_parser.add_argument("--synthetic-size", type=parse_non_negative_integer, metavar="NUMBER",
+                          default=DEFAULT_SYNTHETIC_CORPUS_SIZE, help="amount of words of the synthetic corpus; 0 to skip it")
+  run_parser.add_argument("--seed", type=int, metavar="NUMBER", default=DEFAULT_SEED,
+                          help="seed to create the synthetic corpus")
+  run_parser.add_argument("--filter", type=str, metavar="TEXT", default=None,
+                          help="only run benchmarks whose name contains this text")
+  run_parser.add_argument("--skip-micro", action="store_true", help="skip the micro benchmarks")
+  run_parser.add_argument("--skip-end-to-end", action="store_true",
+                          help="skip the end-to-end benchmarks")
+  run_parser.add_argument("--skip-startup", action="store_true",
+                          help="skip the benchmarks of the start of the CLI")
+  run_parser.set_defaults(invoke_handler=run_benchmarks)
+
+  compare_parser = subparsers.add_parser(
+    "compare", help="compare results and fail if a benchmark got slower", formatter_class=formatter)
+  compare_parser.add_argument("baseline", metavar="BASELINE-PATH", type=parse_existing_file,
+                              help="path to the results of the baseline")
+  compare_parser.add_argument("current", metavar="CURRENT-PATH", type=parse_existing_file,
+                              help="path to the results to compare")
+  compare_parser.add_argument("--threshold", type=parse_non_negative_float, metavar="RATIO",
+                              default=DEFAULT_THRESHOLD, help="allowed slowdown, e.g., 0.1 for 10%%")
+  compare_parser.set_defaults(invoke_handler=compare_results)
+  return parser
+
+
+def main(args: Optional[List[str]] = None) -> None:
+  logging.basicConfig(level=logging.INFO, format="[%(asctime)s] (%(levelname)s) %(message)s")
+  # the transcription logs each fix on debug level
+  getLogger("dict_from_dragonmapper").setLevel(logging.WARNING)
+  parser = get_parser()
+  ns = parser.parse_args(args)
+  if not hasattr(ns, "invoke_handler"):
+    parser.print_help()
+    return
+  success = ns.invoke_handler(ns)
+  if not success:
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,159 @@
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple
+
+from dragonmapper import hanzi
+from ordered_set import OrderedSet
+from pronunciation_dictionary import Word
+from word_to_pronunciation import Options
+
+from dict_from_dragonmapper.argparse_helper import DEFAULT_PUNCTUATION
+from dict_from_dragonmapper.ipa2symb import merge_fusion_with_ignore, parse_ipa_to_symbols
+from dict_from_dragonmapper.main import get_pronunciations
+from dict_from_dragonmapper.transcription import (DEFAULT_SYLLABLE_CACHE_SIZE,
+                                                  configure_syllable_cache, get_all_pinyin,
+                                                  get_pinyin_table, pinyin_to_ipa,
+                                                  separate_syllable_ipa_into_phonemes_and_tones,
+                                                  set_hanzi_table, syllable_to_ipa,
+                                                  transcribe_pinyin_to_ipa, word_to_ipa)
+from dict_from_dragonmapper_benchmarks.corpus import get_characters
+
+# amount of syllables which are joined to one IPA string to benchmark the parsing of long strings
+LONG_IPA_SYLLABLE_COUNT = 20
+
+
+@dataclass()
+class Benchmark():
+  name: str
+  run: Callable[[], Any]
+  # amount of processed items per run, e.g., words
+  items: int
+  # is called before each run and is not measured
+  setup: Optional[Callable[[], None]] = None
+
+
+def measure(benchmark: Benchmark, repeat: int) -> Dict[str, Any]:
+  assert repeat > 0
+  durations: List[float] = []
+  for _ in range(repeat):
+    if benchmark.setup is not None:
+      benchmark.setup()
+    start = time.perf_counter()
+    benchmark.run()
+    durations.append(time.perf_counter() - start)
+  best = min(durations)
+  result = {
+    "items": benchmark.items,
+    "repeat": repeat,
+    "min": best,
+    "median": statistics.median(durations),
+    "max": max(durations),
+    "items_per_second": benchmark.items / best if best > 0 else None,
+  }
+  return result
+
+
+def run_all(functions: Iterable[Callable[[], Any]]) -> None:
+  for function in functions:
+    try:
+      function()
+    # the benchmarks include inputs which can't be transcribed
+    except (ValueError, AssertionError):
+      pass
+
+
+def reset_transcription_state() -> None:
+  set_hanzi_table(None)
+  configure_syllable_cache(DEFAULT_SYLLABLE_CACHE_SIZE)
+
+
+def get_syllable_ipas(pinyins: Iterable[str]) -> List[str]:
+  result = []
+  for pinyin in pinyins:
+    try:
+      syllable_ipa = hanzi.pinyin_to_ipa(pinyin)
+      syllable_phonemes, _ = separate_syllable_ipa_into_phonemes_and_tones(syllable_ipa)
+    except (ValueError, AssertionError):
+      continue
+    result.append(syllable_phonemes)
+  return result
+
+
+def get_micro_benchmarks(vocabulary: OrderedSet[Word]) -> Generator[Benchmark, None, None]:
+  characters = get_characters(vocabulary)
+  yield Benchmark(
+    "syllable_to_ipa",
+    lambda: run_all(partial_calls(syllable_to_ipa, characters)),
+    len(characters),
+  )
+
+  pinyins = list(get_all_pinyin())
+  # the table is built on first use which should not be measured
+  get_pinyin_table()
+  yield Benchmark(
+    "pinyin_to_ipa",
+    lambda: run_all(partial_calls(pinyin_to_ipa, pinyins)),
+    len(pinyins),
+  )
+  yield Benchmark(
+    "transcribe_pinyin_to_ipa",
+    lambda: run_all(partial_calls(transcribe_pinyin_to_ipa, pinyins)),
+    len(pinyins),
+  )
+
+  syllable_ipas = get_syllable_ipas(pinyins)
+  yield Benchmark(
+    "parse_ipa_to_symbols",
+    lambda: run_all(partial_calls(parse_ipa_to_symbols, syllable_ipas)),
+    len(syllable_ipas),
+  )
+  long_ipas = [
+    "".join(syllable_ipas[i:i + LONG_IPA_SYLLABLE_COUNT])
+    for i in range(0, len(syllable_ipas), LONG_IPA_SYLLABLE_COUNT)
+  ]
+  yield Benchmark(
+    "parse_ipa_to_symbols[long]",
+    lambda: run_all(partial_calls(parse_ipa_to_symbols, long_ipas)),
+    len(long_ipas),
+  )
+
+  syllable_symbols = [parse_ipa_to_symbols(syllable_ipa) for syllable_ipa in syllable_ipas]
+  fusion_symbols = {"ʈ", "ʂ", "t", "s", "ɕ"}
+  ignore = {"ʰ"}
+  yield Benchmark(
+    "merge_fusion_with_ignore",
+    lambda: run_all(
+      partial_calls(lambda symbols: merge_fusion_with_ignore(symbols, fusion_symbols, ignore), syllable_symbols)),
+    len(syllable_symbols),
+  )
+
+  yield Benchmark(
+    "word_to_ipa",
+    lambda: run_all(partial_calls(word_to_ipa, vocabulary)),
+    len(vocabulary),
+    setup=reset_transcription_state,
+  )
+
+
+def partial_calls(function: Callable[[Any], Any], inputs: Iterable[Any]) -> Generator[Callable[[], Any], None, None]:
+  for value in inputs:
+    yield lambda value=value: function(value)
+
+
+def get_end_to_end_benchmarks(corpora: Dict[str, OrderedSet[Word]], n_jobs_settings: Iterable[int], chunksizes: Iterable[int]) -> Generator[Benchmark, None, None]:
+  options = Options("".join(DEFAULT_PUNCTUATION), True, False, False, 1.0)
+  settings: List[Tuple[int, int]] = [
+    (n_jobs, chunksize)
+    for n_jobs in n_jobs_settings
+    for chunksize in chunksizes
+  ]
+  for corpus_name, corpus in corpora.items():
+    for n_jobs, chunksize in settings:
+      yield Benchmark(
+        f"get_pronunciations[{corpus_name},n_jobs={n_jobs},chunksize={chunksize}]",
+        lambda corpus=corpus, n_jobs=n_jobs, chunksize=chunksize: get_pronunciations(
+          corpus, 1.0, options, n_jobs, None, chunksize),
+        len(corpus),
+        setup=reset_transcription_state,
+      )
@@ -0,0 +1,40 @@
+import random
+from pathlib import Path
+
+from ordered_set import OrderedSet
+from pronunciation_dictionary import Word
+
+from dict_from_dragonmapper.vocabulary import read_vocabulary
+
+TEST_VOCABULARY_PATH = Path(__file__).parents[2] / "res" / "test-vocabulary.txt"
+
+DEFAULT_SYNTHETIC_CORPUS_SIZE = 100000
+
+DEFAULT_SEED = 1234
+
+
+def load_test_vocabulary() -> OrderedSet[Word]:
+  result = read_vocabulary(TEST_VOCABULARY_PATH, "UTF-8")
+  return result
+
+
+def get_characters(vocabulary: OrderedSet[Word]) -> OrderedSet[str]:
+  result = OrderedSet(
+    character
+    for word in vocabulary
+    for character in word
+  )
+  return result
+
+
+def get_synthetic_corpus(vocabulary: OrderedSet[Word], size: int, seed: int = DEFAULT_SEED) -> OrderedSet[Word]:
+  # contains the vocabulary and words which are made of 2-4 random words of it; the corpus is the
+  # same for the same vocabulary, size and seed
+  assert size > 0
+  rng = random.Random(seed)
+  words = list(vocabulary)
+  result = OrderedSet(words[:size])
+  while len(result) < size:
+    word_count = rng.randint(2, 4)
+    result.add("".join(rng.choice(words) for _ in range(word_count)))
+  return result
@@ -0,0 +1,62 @@
+import json
+import platform
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# needs to be increased if the layout of the results changes
+RESULTS_FORMAT = 1
+
+DEFAULT_THRESHOLD = 0.1
+
+Results = Dict[str, Any]
+
+
+def get_environment() -> Dict[str, Any]:
+  result = {
+    "python": platform.python_version(),
+    "implementation": platform.python_implementation(),
+    "machine": platform.machine(),
+    "system": platform.system(),
+    "dict-from-dragonmapper": version("dict-from-dragonmapper"),
+    "dragonmapper": version("dragonmapper"),
+  }
+  return result
+
+
+def create_results(benchmarks: Dict[str, Dict[str, Any]]) -> Results:
+  result = {
+    "format": RESULTS_FORMAT,
+    "environment": get_environment(),
+    "benchmarks": benchmarks,
+  }
+  return result
+
+
+def save_results(results: Results, path: Path) -> None:
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="UTF-8")
+
+
+def load_results(path: Path) -> Results:
+  result = json.loads(path.read_text(encoding="UTF-8"))
+  if result.get("format") != RESULTS_FORMAT:
+    raise ValueError(f"Results \"{path.absolute()}\" have an unsupported format!")
+  return result
+
+
+def get_regressions(baseline: Results, current: Results, threshold: float) -> List[Tuple[str, float]]:
+  # compares the fastest runs of all benchmarks contained in both results and returns the ones
+  # which are slower by more than the threshold, e.g., 0.1 for 10%, together with their ratio
+  assert threshold >= 0
+  result = []
+  for name, current_result in current["benchmarks"].items():
+    if name not in baseline["benchmarks"]:
+      continue
+    baseline_min = baseline["benchmarks"][name]["min"]
+    if baseline_min <= 0:
+      continue
+    ratio = current_result["min"] / baseline_min
+    if ratio > 1 + threshold:
+      result.append((name, ratio))
+  return result
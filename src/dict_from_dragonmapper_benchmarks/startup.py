@@ -0,0 +1,62 @@
+import subprocess
+import sys
+from typing import Dict, Generator, List
+
+from dict_from_dragonmapper_benchmarks.benchmarks import Benchmark
+
+CLI_MODULE = "dict_from_dragonmapper.cli"
+
+# modules which should only be imported if a transcription is run
+HEAVY_MODULES = (
+  "dragonmapper.hanzi",
+  "multiprocessing.pool",
+  "pronunciation_dictionary",
+  "tqdm",
+  "word_to_pronunciation",
+)
+
+STARTUP_COMMANDS = {
+  "python": ["-c", "pass"],
+  "import": ["-c", "import dict_from_dragonmapper"],
+  "--version": ["-m", CLI_MODULE, "--version"],
+  "--help": ["-m", CLI_MODULE, "--help"],
+  "create --help": ["-m", CLI_MODULE, "create", "--help"],
+}
+
+
+def run_python(args: List[str], *python_options: str) -> subprocess.CompletedProcess:
+  result = subprocess.run(
+    [sys.executable, *python_options, *args],
+    stdout=subprocess.DEVNULL,
+    stderr=subprocess.PIPE,
+    check=True,
+    text=True,
+  )
+  return result
+
+
+def get_import_times(args: List[str]) -> Dict[str, int]:
+  # returns the cumulative import time of each module in microseconds as reported by
+  # `python -X importtime`
+  process = run_python(args, "-X", "importtime")
+  result = {}
+  for line in process.stderr.splitlines():
+    if not line.startswith("import time:"):
+      continue
+    _, cumulative, module = line[len("import time:"):].split("|")
+    cumulative = cumulative.strip()
+    if not cumulative.isdigit():
+      # header line
+      continue
+    result[module.strip()] = int(cumulative)
+  return result
+
+
+def get_startup_benchmarks() -> Generator[Benchmark, None, None]:
+  # the interpreter itself is measured to be able to tell the startup of the package apart
+  for name, args in STARTUP_COMMANDS.items():
+    yield Benchmark(
+      f"startup[{name}]",
+      lambda args=args: run_python(args),
+      1,
+    )
@@ -0,0 +1,36 @@
+from itertools import islice
+from types import GeneratorType
+
+import pytest
+
+from dict_from_dragonmapper.api import iter_word_ipa, word_to_ipa
+
+
+def test_returns_same_entries_in_same_order_as_word_to_ipa_with_max():
+  res = list(iter_word_ipa("行重长和"))
+  assert res == list(word_to_ipa("行重长和", max_pronunciations=len(res)))
+
+
+def test_first_entries_are_yielded_without_creating_all_combinations():
+  # contains more than 10^20 combinations
+  word = "行重长和" * 10
+  res = iter_word_ipa(word)
+  assert isinstance(res, GeneratorType)
+  assert list(islice(res, 3)) == list(word_to_ipa(word, max_pronunciations=3))
+
+
+def test_last_syllable_changes_first():
+  res = list(islice(iter_word_ipa("晒吗"), 2))
+  assert res == [
+    ('ʂ', 'aɪ˥˩', 'm', 'a'),
+    ('ʂ', 'aɪ˥˩', 'm', 'a˧˥'),
+  ]
+
+
+def test_untranscribable_word_raises_value_error():
+  with pytest.raises(ValueError):
+    list(iter_word_ipa("北x"))
+
+
+def test_empty_word_returns_no_entries():
+  assert list(iter_word_ipa("")) == []
@@ -0,0 +1,9 @@
+from ordered_set import OrderedSet
+
+from dict_from_dragonmapper.api import word_to_ipa
+
+
+def test_empty_word_returns_empty_ordered_set():
+  res = word_to_ipa("")
+  assert isinstance(res, OrderedSet)
+  assert len(res) == 0
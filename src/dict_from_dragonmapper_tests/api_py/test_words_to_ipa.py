@@ -0,0 +1,53 @@
+from multiprocessing.pool import Pool
+
+import pytest
+from ordered_set import OrderedSet
+
+from dict_from_dragonmapper.api import iter_words_to_ipa, word_to_ipa, words_to_ipa
+
+
+def test_results_are_aligned_with_input():
+  res = words_to_ipa(["北风", "x", "北风", ""])
+  assert res == [
+    word_to_ipa("北风"),
+    OrderedSet(),
+    word_to_ipa("北风"),
+    OrderedSet(),
+  ]
+
+
+def test_max_pronunciations_is_applied():
+  res = words_to_ipa(["北风"], max_pronunciations=1)
+  assert res == [OrderedSet([('p', 'eɪ˧˩˧', 'f', 'ɤ˥', 'ŋ')])]
+
+
+def test_word_containing_space_raises_error():
+  with pytest.raises(ValueError):
+    words_to_ipa(["北风", "北 风"])
+
+
+def test_iter_with_pool_returns_same_as_without_pool():
+  words = ["北风", "x", "晒吗", "北风", "嗯"]
+  with Pool(1) as pool:
+    res = list(iter_words_to_ipa(words, pool=pool, chunksize=2))
+  assert res == list(iter_words_to_ipa(words))
+
+
+def test_iter_with_pool_reads_words_while_results_are_taken():
+  read_words = []
+
+  def iter_words():
+    for word in ["北风"] * 100:
+      read_words.append(word)
+      yield word
+
+  with Pool(1) as pool:
+    results = iter_words_to_ipa(iter_words(), pool=pool, chunksize=1, n_jobs=1)
+    next(results)
+    assert len(read_words) < 100
+    results.close()
+
+
+def test_iter_with_invalid_n_jobs_raises_value_error():
+  with pytest.raises(ValueError):
+    list(iter_words_to_ipa(["北风"], n_jobs=0))
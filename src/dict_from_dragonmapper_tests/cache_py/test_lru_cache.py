@@ -0,0 +1,44 @@
+from dict_from_dragonmapper.cache import CacheStats, LRUCache
+
+
+def test_lookup_after_add_is_hit():
+  cache = LRUCache(2)
+  cache.add("a", 1)
+  res = cache.lookup("a")
+  assert res == (True, 1)
+  assert cache.stats == CacheStats(hits=1, misses=0, evictions=0)
+
+
+def test_lookup_of_missing_key_is_miss():
+  cache = LRUCache(2)
+  res = cache.lookup("a")
+  assert res == (False, None)
+  assert cache.stats == CacheStats(hits=0, misses=1, evictions=0)
+
+
+def test_least_recently_used_is_evicted():
+  cache = LRUCache(2)
+  cache.add("a", 1)
+  cache.add("b", 2)
+  cache.lookup("a")
+  cache.add("c", 3)
+  assert len(cache) == 2
+  assert cache.lookup("b") == (False, None)
+  assert cache.lookup("a") == (True, 1)
+  assert cache.lookup("c") == (True, 3)
+  assert cache.stats.evictions == 1
+
+
+def test_size_zero_stores_nothing():
+  cache = LRUCache(0)
+  cache.add("a", 1)
+  assert len(cache) == 0
+  assert cache.lookup("a") == (False, None)
+
+
+def test_pop_stats_resets_stats():
+  cache = LRUCache(2)
+  cache.lookup("a")
+  res = cache.pop_stats()
+  assert res == CacheStats(hits=0, misses=1, evictions=0)
+  assert cache.stats == CacheStats()
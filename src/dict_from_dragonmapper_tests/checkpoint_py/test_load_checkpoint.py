@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from dict_from_dragonmapper.checkpoint import (Checkpoint, get_checkpoint_key, load_checkpoint,
+                                               save_checkpoint)
+from dict_from_dragonmapper.dictionary_writer import WriterCheckpoint
+
+
+def test_saved_checkpoint_is_loaded_again(tmp_path: Path):
+  path = tmp_path / "checkpoint.json"
+  checkpoint = Checkpoint(10, WriterCheckpoint(100, None, 9, 1), get_checkpoint_key("a", Path("b")))
+
+  save_checkpoint(checkpoint, path)
+  res = load_checkpoint(path)
+
+  assert res == checkpoint
+  assert list(tmp_path.iterdir()) == [path]
+
+
+def test_other_format_returns_none(tmp_path: Path):
+  path = tmp_path / "checkpoint.json"
+  path.write_text('{"format": 0}', "UTF-8")
+  res = load_checkpoint(path)
+  assert res is None
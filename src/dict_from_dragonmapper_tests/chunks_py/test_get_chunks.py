@@ -0,0 +1,11 @@
+from dict_from_dragonmapper.chunks import get_chunks
+
+
+def test_last_chunk_contains_remaining_words():
+  res = list(get_chunks(["a", "b", "c", "d", "e"], 2))
+  assert res == [("a", "b"), ("c", "d"), ("e",)]
+
+
+def test_no_words_returns_no_chunks():
+  res = list(get_chunks([], 2))
+  assert res == []
@@ -0,0 +1,56 @@
+from itertools import count
+from queue import Queue
+from threading import enumerate as enumerate_threads
+from typing import Generator
+
+import pytest
+
+from dict_from_dragonmapper.chunks import get_streamed_chunks
+
+
+def test_full_chunks_and_remaining_words_are_yielded():
+  res = [
+    chunk for chunk in get_streamed_chunks(iter(["a", "b", "c", "d", "e"]), 2, 1.0)
+    if chunk is not None
+  ]
+  assert res == [("a", "b"), ("c", "d"), ("e",)]
+
+
+def test_words_are_yielded_before_chunk_is_full():
+  words: Queue = Queue()
+
+  def iter_words() -> Generator[str, None, None]:
+    while (word := words.get()) is not None:
+      yield word
+
+  chunks = get_streamed_chunks(iter_words(), 1000, 0.01)
+  words.put("a")
+  res = next(chunk for chunk in chunks if chunk is not None)
+  assert res == ("a",)
+  assert next(chunks) is None
+  words.put(None)
+  assert list(chunks) == []
+
+
+def test_error_while_reading_is_raised_after_read_words():
+  def iter_words() -> Generator[str, None, None]:
+    yield "a"
+    raise UnicodeDecodeError("utf-8", b"", 0, 1, "invalid")
+
+  chunks = get_streamed_chunks(iter_words(), 2, 1.0)
+  assert next(chunk for chunk in chunks if chunk is not None) == ("a",)
+  with pytest.raises(UnicodeDecodeError):
+    list(chunks)
+
+
+def test_reading_stops_if_generator_is_closed():
+  threads_before = set(enumerate_threads())
+  words = (str(i) for i in count())
+  chunks = get_streamed_chunks(words, 2, 1.0)
+  assert next(chunks) == ("0", "1")
+  reader_threads = set(enumerate_threads()) - threads_before
+  chunks.close()
+  for thread in reader_threads:
+    thread.join(5.0)
+  assert len(reader_threads) == 1
+  assert not any(thread.is_alive() for thread in reader_threads)
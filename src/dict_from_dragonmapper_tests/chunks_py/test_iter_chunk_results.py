@@ -0,0 +1,28 @@
+from multiprocessing.pool import ThreadPool
+
+from dict_from_dragonmapper.chunks import iter_chunk_results
+
+
+def get_length(chunk):
+  return len(chunk)
+
+
+def test_results_are_in_order_of_chunks():
+  chunks = [("a",), ("b", "c"), ("d", "e", "f"), ("g",)]
+  with ThreadPool(2) as pool:
+    res = list(iter_chunk_results(pool, get_length, chunks, 2))
+  assert res == [(("a",), 1), (("b", "c"), 2), (("d", "e", "f"), 3), (("g",), 1)]
+
+
+def test_chunks_are_taken_only_if_results_are_retrieved():
+  taken_chunks = []
+
+  def get_chunks():
+    for chunk in [("a",), ("b",), ("c",), ("d",)]:
+      taken_chunks.append(chunk)
+      yield chunk
+
+  with ThreadPool(1) as pool:
+    iterator = iter_chunk_results(pool, get_length, get_chunks(), 2)
+    next(iterator)
+    assert len(taken_chunks) <= 2
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_words_from_stdin_are_written_to_stdout(tmp_path: Path):
+  oov_path = tmp_path / "oov.txt"
+  process = subprocess.run(
+    [sys.executable, "-m", "dict_from_dragonmapper.cli", "-", "-", "--oov-out", str(oov_path),
+     "--no-hanzi-table", "-j", "1", "--chunksize", "1"],
+    input="北风\nx\n北风\n", capture_output=True, check=True, encoding="UTF-8",
+  )
+  assert process.stdout.splitlines() == ["北风  p eɪ˧˩˧ f ɤ˥ ŋ", "北风  p eɪ˥˩ f ɤ˥ ŋ"]
+  assert oov_path.read_text("UTF-8") == "x"
+
+
+def test_dictionary_and_oov_to_stdout_fails():
+  process = subprocess.run(
+    [sys.executable, "-m", "dict_from_dragonmapper.cli", "-", "-", "--oov-out", "-"],
+    input="北风\n", capture_output=True, encoding="UTF-8",
+  )
+  assert process.returncode == 1
+  assert process.stdout == ""
+
+
+def test_entry_is_written_before_next_word_is_read():
+  process = subprocess.Popen(
+    [sys.executable, "-m", "dict_from_dragonmapper.cli", "-", "-",
+     "--no-hanzi-table", "-j", "1"],
+    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, encoding="UTF-8",
+  )
+  try:
+    process.stdin.write("码\n")
+    process.stdin.flush()
+    # the line would not be completed until further words are read or stdin is closed
+    assert process.stdout.readline() == "码  m a˧˩˧\n"
+  finally:
+    process.stdin.close()
+    process.wait(timeout=60)
+
+
+def test_existing_entry_is_written_before_next_word_is_read(tmp_path: Path):
+  existing_dictionary_path = tmp_path / "existing.dict"
+  existing_dictionary_path.write_text("一  i˥", "UTF-8")
+  process = subprocess.Popen(
+    [sys.executable, "-m", "dict_from_dragonmapper.cli", "-", "-",
+     "--existing-dictionary", str(existing_dictionary_path), "--prune",
+     "--no-hanzi-table", "-j", "1"],
+    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, encoding="UTF-8",
+  )
+  try:
+    process.stdin.write("一\n")
+    process.stdin.flush()
+    assert process.stdout.readline() == "一  i˥\n"
+  finally:
+    process.stdin.close()
+    process.wait(timeout=60)
@@ -0,0 +1,76 @@
+import subprocess
+import sys
+from typing import List, Set
+
+HEAVY_MODULES = {
+  "dragonmapper.hanzi",
+  "multiprocessing.pool",
+  "pronunciation_dictionary",
+  "tqdm",
+  "word_to_pronunciation",
+  "dict_from_dragonmapper.main",
+}
+
+
+def get_imported_modules(code: str) -> Set[str]:
+  # a new interpreter is needed because the tests already imported all modules
+  code += "\nprint('\\n'.join(sys.modules))"
+  process = subprocess.run(
+    [sys.executable, "-c", "import sys\n" + code],
+    capture_output=True, check=True, text=True,
+  )
+  return set(process.stdout.splitlines())
+
+
+def get_imported_modules_of_cli(args: List[str]) -> Set[str]:
+  code = (
+    "from dict_from_dragonmapper.cli import parse_args\n"
+    "try:\n"
+    f"  parse_args({args!r}, True)\n"
+    "except SystemExit:\n"
+    "  pass"
+  )
+  return get_imported_modules(code)
+
+
+def test_version__imports_no_heavy_modules():
+  modules = get_imported_modules_of_cli(["--version"])
+  assert "dict_from_dragonmapper.cli" in modules
+  assert modules.isdisjoint(HEAVY_MODULES)
+
+
+def test_help__imports_no_heavy_modules():
+  modules = get_imported_modules_of_cli(["--help"])
+  assert modules.isdisjoint(HEAVY_MODULES)
+
+
+def test_command_help__imports_main():
+  modules = get_imported_modules_of_cli(["build-table", "--help"])
+  assert "dict_from_dragonmapper.main" in modules
+
+
+def test_import_package__imports_no_heavy_modules():
+  modules = get_imported_modules("import dict_from_dragonmapper")
+  assert modules.isdisjoint(HEAVY_MODULES)
+
+
+def test_word_to_ipa__is_imported_on_access():
+  modules = get_imported_modules("from dict_from_dragonmapper import word_to_ipa")
+  assert "dict_from_dragonmapper.api" in modules
+
+
+def test_word_to_ipa__imports_no_heavy_modules():
+  modules = get_imported_modules("from dict_from_dragonmapper import word_to_ipa")
+  assert modules.isdisjoint(HEAVY_MODULES | {"multiprocessing", "sqlite3"})
+
+
+def test_version_attribute__is_resolved_on_access():
+  from importlib.metadata import version
+
+  from dict_from_dragonmapper.cli import __version__
+  assert __version__ == version("dict-from-dragonmapper")
+
+
+def test_import_cli__imports_no_metadata():
+  modules = get_imported_modules("import dict_from_dragonmapper.cli")
+  assert "importlib.metadata" not in modules
@@ -0,0 +1,80 @@
+from collections import OrderedDict
+from pathlib import Path
+
+from pronunciation_dictionary import SerializationOptions, save_dict
+
+from dict_from_dragonmapper.dictionary_writer import DictionaryWriter
+
+
+def test_same_output_as_save_dict(tmp_path: Path):
+  dictionary = OrderedDict((
+    ("晒吗", OrderedDict((
+      (("ʂ", "aɪ˥˩", "m", "a"), 1.0),
+      (("ʂ", "aɪ˥˩", "m", "a˧˥"), 0.5),
+    ))),
+    ("晋", OrderedDict((
+      (("tɕ", "i˥˩", "n"), 1.0),
+    ))),
+  ))
+  options = SerializationOptions("DOUBLE-SPACE", True, True)
+  expected_path = tmp_path / "expected.dict"
+  save_dict(dictionary, expected_path, "UTF-8", options)
+
+  path = tmp_path / "result.dict"
+  oov_path = tmp_path / "oov.txt"
+  with DictionaryWriter(path, "UTF-8", options, oov_path, "UTF-8") as writer:
+    writer.write_entry("晒吗", dictionary["晒吗"])
+    writer.write_oov("abc")
+    writer.write_entry("晋", dictionary["晋"])
+    writer.write_oov("x")
+
+  assert path.read_text("UTF-8") == expected_path.read_text("UTF-8")
+  assert oov_path.read_text("UTF-8") == "abc\nx"
+  assert writer.written_entries == 2
+  assert writer.written_oov_words == 2
+
+
+def test_oov_file_is_not_created_without_oov_words(tmp_path: Path):
+  options = SerializationOptions("DOUBLE-SPACE", False, False)
+  oov_path = tmp_path / "oov.txt"
+  with DictionaryWriter(tmp_path / "result.dict", "UTF-8", options, oov_path, "UTF-8") as writer:
+    writer.write_entry("晋", OrderedDict(((("tɕ", "i˥˩", "n"), 1.0),)))
+
+  assert not oov_path.exists()
+
+
+def test_writer_with_checkpoint_removes_everything_written_afterwards(tmp_path: Path):
+  options = SerializationOptions("DOUBLE-SPACE", False, False)
+  path = tmp_path / "result.dict"
+  oov_path = tmp_path / "oov.txt"
+  pronunciations = OrderedDict(((("tɕ", "i˥˩", "n"), 1.0),))
+  with DictionaryWriter(path, "UTF-8", options, oov_path, "UTF-8") as writer:
+    writer.write_entry("晋", pronunciations)
+    writer.write_oov("x")
+    checkpoint = writer.get_checkpoint()
+    writer.write_entry("晋晋", pronunciations)
+    writer.write_oov("y")
+
+  with DictionaryWriter(path, "UTF-8", options, oov_path, "UTF-8", checkpoint=checkpoint) as writer:
+    writer.write_entry("晋晋晋", pronunciations)
+    writer.write_oov("z")
+
+  assert path.read_text("UTF-8") == "晋  tɕ i˥˩ n\n晋晋晋  tɕ i˥˩ n"
+  assert oov_path.read_text("UTF-8") == "x\nz"
+  assert writer.written_entries == 2
+  assert writer.written_oov_words == 2
+
+
+def test_writer_with_checkpoint_without_oov_words_removes_oov_file(tmp_path: Path):
+  options = SerializationOptions("DOUBLE-SPACE", False, False)
+  path = tmp_path / "result.dict"
+  oov_path = tmp_path / "oov.txt"
+  with DictionaryWriter(path, "UTF-8", options, oov_path, "UTF-8") as writer:
+    checkpoint = writer.get_checkpoint()
+    writer.write_oov("x")
+
+  with DictionaryWriter(path, "UTF-8", options, oov_path, "UTF-8", checkpoint=checkpoint) as writer:
+    pass
+
+  assert path.read_text("UTF-8") == ""
+  assert not oov_path.exists()
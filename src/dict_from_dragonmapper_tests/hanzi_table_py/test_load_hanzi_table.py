@@ -0,0 +1,49 @@
+import gzip
+import json
+from pathlib import Path
+
+from pytest import raises
+
+from dict_from_dragonmapper.hanzi_table import (get_hanzi_table_version, get_transcription_hash,
+                                                load_hanzi_table, save_hanzi_table)
+
+
+def test_saved_table_is_loaded_again(tmp_path: Path):
+  table = {
+    "晒": (("ʂ", "aɪ˥˩"),),
+    "吗": (("m", "a"), ("m", "a˧˥")),
+    "码": (("m", "a˧˩˧"),),
+  }
+  path = tmp_path / "table.json.gz"
+  save_hanzi_table(table, path)
+  res = load_hanzi_table(path)
+  assert res == table
+
+
+def test_outdated_table_returns_none(tmp_path: Path):
+  path = tmp_path / "table.json.gz"
+  with gzip.open(path, mode="wt", encoding="UTF-8") as file:
+    json.dump({"version": "0", "syllables": [], "table": {}}, file)
+  res = load_hanzi_table(path)
+  assert res is None
+
+
+def test_version_contains_transcription_hash():
+  res = get_hanzi_table_version()
+  assert res.endswith(f"-{get_transcription_hash()}")
+
+
+def test_table_which_is_no_object_raises_value_error(tmp_path: Path):
+  path = tmp_path / "table.json.gz"
+  with gzip.open(path, mode="wt", encoding="UTF-8") as file:
+    json.dump([], file)
+  with raises(ValueError):
+    load_hanzi_table(path)
+
+
+def test_table_with_invalid_format_raises_value_error(tmp_path: Path):
+  path = tmp_path / "table.json.gz"
+  with gzip.open(path, mode="wt", encoding="UTF-8") as file:
+    json.dump({"version": get_hanzi_table_version(), "syllables": [], "table": []}, file)
+  with raises(ValueError):
+    load_hanzi_table(path)
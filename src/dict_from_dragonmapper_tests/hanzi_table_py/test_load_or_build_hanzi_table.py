@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from dict_from_dragonmapper.hanzi_table import load_or_build_hanzi_table, save_hanzi_table
+
+
+def test_table_in_unwritable_directory_is_not_saved(tmp_path: Path):
+  # a file blocks the creation of the directory of the table
+  (tmp_path / "file").write_text("")
+  table, is_saved = load_or_build_hanzi_table(tmp_path / "file" / "table.json.gz")
+  assert len(table) > 0
+  assert not is_saved
+
+
+def test_saved_table_is_returned(tmp_path: Path):
+  path = tmp_path / "table.json.gz"
+  save_hanzi_table({"码": (("m", "a˧˩˧"),)}, path)
+  table, is_saved = load_or_build_hanzi_table(path)
+  assert table == {"码": (("m", "a˧˩˧"),)}
+  assert is_saved
+
+
+def test_truncated_table_is_rebuilt(tmp_path: Path):
+  path = tmp_path / "table.json.gz"
+  save_hanzi_table({"码": (("m", "a˧˩˧"),)}, path)
+  content = path.read_bytes()
+  path.write_bytes(content[:len(content) // 2])
+  table, is_saved = load_or_build_hanzi_table(path)
+  assert len(table) > 1
+  assert is_saved
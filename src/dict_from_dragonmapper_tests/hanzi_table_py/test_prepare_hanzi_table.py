@@ -0,0 +1,31 @@
+from pathlib import Path
+
+from dict_from_dragonmapper import transcription
+from dict_from_dragonmapper.hanzi_table import prepare_hanzi_table, save_hanzi_table
+from dict_from_dragonmapper.transcription import set_hanzi_table
+
+
+def test_saved_table_is_set_and_path_is_returned(tmp_path: Path):
+  path = tmp_path / "table.json.gz"
+  save_hanzi_table({"码": (("m", "a˧˩˧"),)}, path)
+  previous_table = transcription.HANZI_TABLE
+  try:
+    res = prepare_hanzi_table(path)
+    table = transcription.HANZI_TABLE
+  finally:
+    set_hanzi_table(previous_table)
+  assert res == path
+  assert table == {"码": (("m", "a˧˩˧"),)}
+
+
+def test_table_in_unwritable_directory_returns_no_path(tmp_path: Path):
+  # a file blocks the creation of the directory of the table
+  (tmp_path / "file").write_text("")
+  previous_table = transcription.HANZI_TABLE
+  try:
+    res = prepare_hanzi_table(tmp_path / "file" / "table.json.gz")
+    table = transcription.HANZI_TABLE
+  finally:
+    set_hanzi_table(previous_table)
+  assert res is None
+  assert len(table) > 0
@@ -0,0 +1,25 @@
+from dict_from_dragonmapper.ipa2symb import FusionMerger, get_fusion_merger, merge_fusion_with_ignore
+
+
+def test_fusion_symbols_with_ignore_are_merged():
+  res = merge_fusion_with_ignore(("t", "sʰ", "a"), {"t", "s"}, {"ʰ"})
+  assert res == ("tsʰ", "a")
+
+
+def test_merger__returns_same_symbols_as_merge_fusion_with_ignore():
+  merger = FusionMerger({"t", "s"}, {"ʰ"})
+  res = merger.merge(("a", "t", "sʰ", "a", "s"))
+  assert res == merge_fusion_with_ignore(("a", "t", "sʰ", "a", "s"), {"t", "s"}, {"ʰ"})
+  assert res == ("a", "tsʰ", "a", "s")
+
+
+def test_merger__symbols_are_merged_again_after_cache_is_full():
+  merger = FusionMerger({"y"}, {"ʰ"}, cache_size=1)
+  assert merger.merge(("x", "yʰ", "y", "z")) == ("x", "yʰy", "z")
+  assert merger.merge(("x", "yʰ", "y", "z")) == ("x", "yʰy", "z")
+
+
+def test_get_fusion_merger__returns_same_merger_for_same_symbols():
+  res = get_fusion_merger({"t", "s"}, {"ʰ"})
+  assert get_fusion_merger(frozenset({"s", "t"}), frozenset({"ʰ"})) is res
+  assert get_fusion_merger({"t"}, {"ʰ"}) is not res
@@ -0,0 +1,48 @@
+import random
+
+from dict_from_dragonmapper.ipa2symb import (merge_fusion_with_ignore, merge_left, merge_right,
+                                             merge_together, parse_ipa_symbols_to_symbols,
+                                             parse_ipa_to_symbols)
+from dict_from_dragonmapper.ipa_symbols import (APPENDIX, PUNCTUATION_AND_WHITESPACE, STRESSES,
+                                                TIES, VOWELS)
+from dict_from_dragonmapper_tests.ipa2symb_py import legacy_ipa2symb
+
+ALPHABET = sorted(TIES | APPENDIX | STRESSES) + list(".,- \n|#") + list("aeiouptkʂɕʈs")
+
+
+def get_random_sentences(count: int, max_length: int):
+  rng = random.Random(1234)
+  for _ in range(count):
+    yield "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, max_length)))
+
+
+def test_affricate_with_tie_and_appendix():
+  res = parse_ipa_to_symbols("ʈ͡ʂʰaː˥")
+  assert res == ("ʈ͡ʂʰ", "aː˥")
+
+
+def test_stresses_are_merged_to_next_symbol():
+  res = parse_ipa_to_symbols("ˈˌa. ˈ")
+  assert res == ("ˈˌa", ".", " ", "ˈ")
+
+
+def test_same_as_former_implementation():
+  for sentence in get_random_sentences(5000, 15):
+    expected = legacy_ipa2symb.parse_ipa_to_symbols(sentence)
+    assert parse_ipa_to_symbols(sentence) == expected, sentence
+    assert parse_ipa_symbols_to_symbols(tuple(sentence)) == expected, sentence
+
+
+def test_merge_methods_same_as_former_implementation():
+  for sentence in get_random_sentences(2000, 15):
+    symbols = tuple(sentence) + ("ʈʂ", "aɪ", "tʰ")
+    for insert_symbol in (None, "+"):
+      assert merge_left(symbols, STRESSES, PUNCTUATION_AND_WHITESPACE, insert_symbol) == legacy_ipa2symb.merge_left(
+        symbols, STRESSES, PUNCTUATION_AND_WHITESPACE, insert_symbol)
+      assert merge_right(symbols, APPENDIX, PUNCTUATION_AND_WHITESPACE, insert_symbol) == legacy_ipa2symb.merge_right(
+        symbols, APPENDIX, PUNCTUATION_AND_WHITESPACE, insert_symbol)
+    assert merge_together(symbols, TIES, PUNCTUATION_AND_WHITESPACE) == legacy_ipa2symb.merge_together(
+      symbols, TIES, PUNCTUATION_AND_WHITESPACE)
+    for fusion_symbols, ignore in (({"ʈ", "ʂ", "t", "s", "ɕ"}, {"ʰ"}), (VOWELS, {"˧", "˩", "˥"}), ({"a"}, {"tʰ", "ʰ"})):
+      assert merge_fusion_with_ignore(symbols, fusion_symbols, ignore) == legacy_ipa2symb.merge_fusion_with_ignore(
+        symbols, fusion_symbols, ignore)
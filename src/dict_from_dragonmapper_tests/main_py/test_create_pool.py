@@ -0,0 +1,68 @@
+import gc
+from multiprocessing import get_start_method
+from pathlib import Path
+
+import pytest
+from ordered_set import OrderedSet
+
+from dict_from_dragonmapper import transcription
+from dict_from_dragonmapper.main import create_pool
+from dict_from_dragonmapper.metrics import RunMetrics
+
+
+@pytest.mark.skipif(get_start_method() != "fork", reason="tables are only preloaded for forked processes")
+def test_preload_builds_pinyin_table_in_main_process():
+  transcription.PINYIN_TABLE = None
+  with create_pool(2, None, 10, None, preload=True):
+    pass
+  assert transcription.PINYIN_TABLE is not None
+  assert gc.get_freeze_count() == 0
+
+
+def test_no_preload_does_not_build_pinyin_table():
+  transcription.PINYIN_TABLE = None
+  with create_pool(1, None, 10, None, preload=False):
+    pass
+  assert transcription.PINYIN_TABLE is None
+
+
+def test_missing_hanzi_table_transcribes_without_table(tmp_path: Path):
+  hanzi_table = transcription.HANZI_TABLE
+  transcription.HANZI_TABLE = None
+  try:
+    with create_pool(1, None, 10, tmp_path / "missing.json.gz", preload=False) as pool:
+      res = pool.apply_async(transcription.word_to_ipa, ("码",)).get(timeout=60)
+  finally:
+    transcription.HANZI_TABLE = hanzi_table
+  assert res == OrderedSet([("m", "a˧˩˧")])
+
+
+@pytest.mark.skipif(get_start_method() != "fork", reason="tables are only preloaded for forked processes")
+def test_preload_is_measured_apart_from_start_of_pool():
+  metrics = RunMetrics()
+  with create_pool(2, None, 10, None, preload=True, metrics=metrics):
+    pass
+  assert set(metrics.phases) == {"preload_tables", "start_pool"}
+
+
+def test_single_process_does_not_preload():
+  transcription.PINYIN_TABLE = None
+  metrics = RunMetrics()
+  with create_pool(1, None, 10, None, preload=True, metrics=metrics):
+    pass
+  assert transcription.PINYIN_TABLE is None
+  assert set(metrics.phases) == {"start_pool"}
+
+
+@pytest.mark.skipif(get_start_method() != "fork", reason="tables are only preloaded for forked processes")
+def test_preload_with_hanzi_table_does_not_build_pinyin_table():
+  hanzi_table = transcription.HANZI_TABLE
+  transcription.HANZI_TABLE = {"码": (("m", "a˧˩˧"),)}
+  transcription.PINYIN_TABLE = None
+  try:
+    with create_pool(2, None, 10, None, preload=True):
+      pass
+  finally:
+    transcription.HANZI_TABLE = hanzi_table
+  assert transcription.PINYIN_TABLE is None
+  assert transcription.TRANSCRIBABLE_CHARACTERS is not None
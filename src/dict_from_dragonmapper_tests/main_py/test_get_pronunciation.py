@@ -0,0 +1,30 @@
+from word_to_pronunciation import Options
+
+from dict_from_dragonmapper.main import get_pronunciation
+
+
+def test_lookups_are_shared_between_words():
+  options = Options("『？", True, False, False, 1.0)
+  lookups = {}
+
+  results = [
+    get_pronunciation(word, 1.0, options, None, lookups)
+    for word in ("『机具", "机具？", "机具")
+  ]
+
+  assert list(lookups) == ["机具"]
+  pronunciations = list(lookups["机具"])
+  assert len(pronunciations) > 0
+  assert list(results[0]) == [("『",) + p for p in pronunciations]
+  assert list(results[1]) == [p + ("？",) for p in pronunciations]
+  assert list(results[2]) == pronunciations
+
+
+def test_hyphen_parts_are_looked_up_once():
+  options = Options("", True, False, False, 1.0)
+  lookups = {}
+
+  pronunciations = get_pronunciation("鲜-鲜", 1.0, options, None, lookups)
+
+  assert list(lookups) == ["鲜"]
+  assert len(pronunciations) == len(lookups["鲜"]) ** 2
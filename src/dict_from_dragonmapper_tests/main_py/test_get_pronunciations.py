@@ -2,6 +2,7 @@ from ordered_set import OrderedSet
 from word_to_pronunciation import Options
 
 from dict_from_dragonmapper.main import get_pronunciations
+from dict_from_dragonmapper.metrics import RunMetrics
 
 
 def test_component():
@@ -18,3 +19,39 @@ def test_component():
 
   assert len(result_dict) == 4
   assert len(unresolved) == 1
+
+
+def test_small_chunks_keep_order_of_vocabulary():
+  vocabulary = OrderedSet((
+    "社会语言学?",
+    "x",
+    "鲜-亮.",
+    "㐻,",
+    "y",
+    "\"㑐",
+  ))
+  options = Options("?,\".", True, False, False, 1.0)
+
+  result_dict, unresolved = get_pronunciations(vocabulary, 1.0, options, 1, None, 4)
+
+  assert list(result_dict.keys()) == ["社会语言学?", "鲜-亮.", "㐻,", "\"㑐"]
+  assert unresolved == OrderedSet(("x", "y"))
+
+
+def test_metrics_contain_all_words_and_phases():
+  vocabulary = OrderedSet((
+    "社会语言学?",
+    "x",
+    "鲜-亮.",
+  ))
+  options = Options("?,\".", True, False, False, 1.0)
+  metrics = RunMetrics()
+
+  get_pronunciations(vocabulary, 1.0, options, 1, None, 2, metrics=metrics)
+
+  assert metrics.words == 3
+  assert metrics.oov_words == 1
+  assert sum(worker.chunks for worker in metrics.workers.values()) == 2
+  assert metrics.phases["transcribe"].calls == 3
+  assert metrics.phases["get_dictionary"].calls == 3
+  assert "start_pool" in metrics.phases
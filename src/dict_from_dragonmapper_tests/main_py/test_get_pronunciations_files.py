@@ -0,0 +1,19 @@
+from argparse import ArgumentParser
+from pathlib import Path
+
+from dict_from_dragonmapper.main import get_app_try_add_vocabulary_from_pronunciations_parser
+
+
+def test_dictionary_per_vocabulary_with_existing_dictionary_needs_prune(tmp_path: Path):
+  vocabulary_path = tmp_path / "vocabulary.txt"
+  vocabulary_path.write_text("北风", "UTF-8")
+  existing_dictionary_path = tmp_path / "existing.dict"
+  existing_dictionary_path.write_text("码  m a˧˩˧", "UTF-8")
+  parser = ArgumentParser()
+  method = get_app_try_add_vocabulary_from_pronunciations_parser(parser)
+  ns = parser.parse_args([
+    str(vocabulary_path), str(tmp_path / "out"), "--dictionary-per-vocabulary",
+    "--existing-dictionary", str(existing_dictionary_path), "--no-hanzi-table",
+  ])
+  assert not method(ns)
+  assert not (tmp_path / "out").exists()
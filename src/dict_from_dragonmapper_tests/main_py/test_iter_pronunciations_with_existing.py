@@ -0,0 +1,67 @@
+from collections import OrderedDict
+
+from ordered_set import OrderedSet
+
+from dict_from_dragonmapper.main import iter_pronunciations_with_existing
+
+
+def get_entries(words, known_entries=None):
+  for word in words:
+    if known_entries is not None and word in known_entries:
+      yield word, known_entries[word]
+    else:
+      yield word, OrderedDict((((word, "new"), 1.0),))
+
+
+def get_existing_dictionary():
+  result = OrderedDict((
+    ("x", OrderedDict(((("x",), 1.0),))),
+    ("b", OrderedDict(((("b",), 1.0),))),
+  ))
+  return result
+
+
+def test_prune__yields_words_in_order_of_vocabulary():
+  transcribed_words = []
+
+  def get_recorded_entries(words, known_entries=None):
+    for word, pronunciations in get_entries(words, known_entries):
+      if known_entries is None or word not in known_entries:
+        transcribed_words.append(word)
+      yield word, pronunciations
+
+  res = list(iter_pronunciations_with_existing(
+    iter(["a", "b", "c"]), get_existing_dictionary(), get_recorded_entries, prune=True))
+
+  assert [word for word, _ in res] == ["a", "b", "c"]
+  assert res[1][1] == OrderedDict(((("b",), 1.0),))
+  assert transcribed_words == ["a", "c"]
+
+
+def test_no_prune__yields_remaining_existing_words_at_end():
+  res = list(iter_pronunciations_with_existing(
+    iter(["b", "a"]), get_existing_dictionary(), get_entries, prune=False))
+
+  assert [word for word, _ in res] == ["b", "a", "x"]
+
+
+def test_only_existing_words__transcribes_nothing():
+  res = list(iter_pronunciations_with_existing(
+    iter(["x", "b"]), get_existing_dictionary(), get_entries, prune=True))
+
+  assert [word for word, _ in res] == ["x", "b"]
+
+
+def test_sized_vocabulary__passes_missing_words_at_once():
+  passed_words = []
+
+  def get_recorded_entries(words):
+    passed_words.append(words)
+    yield from get_entries(words)
+
+  res = list(iter_pronunciations_with_existing(
+    OrderedSet(["a", "b", "c"]), get_existing_dictionary(), get_recorded_entries, prune=False))
+
+  assert [word for word, _ in res] == ["a", "b", "c", "x"]
+  assert res[1][1] == OrderedDict(((("b",), 1.0),))
+  assert passed_words == [OrderedSet(["a", "c"])]
@@ -0,0 +1,46 @@
+from argparse import Namespace
+from pathlib import Path
+
+import pytest
+
+from dict_from_dragonmapper.hanzi_table import (HanziTable, build_hanzi_table, load_pinyin_table,
+                                                save_hanzi_table)
+from dict_from_dragonmapper.main import verify_tables
+from dict_from_dragonmapper.transcription import get_pinyin_table
+
+
+@pytest.fixture(scope="module")
+def hanzi_table() -> HanziTable:
+  return build_hanzi_table()
+
+
+def test_built_tables_are_valid(tmp_path: Path, hanzi_table: HanziTable):
+  path = tmp_path / "table.json.gz"
+  save_hanzi_table(hanzi_table, path)
+  assert verify_tables(Namespace(hanzi_table=path))
+
+
+def test_changed_pinyin_is_invalid(tmp_path: Path, hanzi_table: HanziTable):
+  path = tmp_path / "table.json.gz"
+  pinyin_table = dict(get_pinyin_table())
+  pinyin_table["mǎ"] = ("m", "a˥")
+  save_hanzi_table(hanzi_table, path, pinyin_table)
+  assert not verify_tables(Namespace(hanzi_table=path))
+
+
+def test_missing_pinyin_is_invalid(tmp_path: Path, hanzi_table: HanziTable):
+  path = tmp_path / "table.json.gz"
+  pinyin_table = dict(get_pinyin_table())
+  del pinyin_table["mǎ"]
+  save_hanzi_table(hanzi_table, path, pinyin_table)
+  assert not verify_tables(Namespace(hanzi_table=path))
+
+
+def test_pinyin_table_is_stored_with_hanzi_table(tmp_path: Path):
+  path = tmp_path / "table.json.gz"
+  save_hanzi_table({"码": (("m", "a˧˩˧"),)}, path, {"mǎ": ("m", "a˧˩˧")})
+  assert load_pinyin_table(path) == {"mǎ": ("m", "a˧˩˧")}
+
+
+def test_missing_table_is_invalid(tmp_path: Path):
+  assert not verify_tables(Namespace(hanzi_table=tmp_path / "table.json.gz"))
@@ -0,0 +1,38 @@
+from collections import OrderedDict
+from pathlib import Path
+
+from ordered_set import OrderedSet
+from pronunciation_dictionary import SerializationOptions
+
+from dict_from_dragonmapper.main import get_dictionary_paths, write_dictionary_per_vocabulary
+
+
+def test_each_dictionary_keeps_order_of_its_vocabulary(tmp_path: Path):
+  entries = [
+    ("a", OrderedDict(((("a",), 1.0),))),
+    ("b", OrderedDict(((("b",), 1.0),))),
+    ("x", OrderedDict()),
+    ("c", OrderedDict(((("c",), 1.0),))),
+  ]
+  vocabularies = [OrderedSet(("a", "b", "x")), OrderedSet(("c", "a"))]
+  dictionary_paths = [tmp_path / "1.dict", tmp_path / "2.dict"]
+  oov_path = tmp_path / "oov.txt"
+  options = SerializationOptions("TAB", False, False)
+
+  res = write_dictionary_per_vocabulary(
+    entries, vocabularies, dictionary_paths, "UTF-8", options, oov_path, "UTF-8")
+
+  assert res == 1
+  assert dictionary_paths[0].read_text("UTF-8") == "a\ta\nb\tb"
+  assert dictionary_paths[1].read_text("UTF-8") == "c\tc\na\ta"
+  assert oov_path.read_text("UTF-8") == "x"
+
+
+def test_get_dictionary_paths__removes_compression_extension():
+  res = get_dictionary_paths([Path("a/x.txt.gz"), Path("y.txt")], Path("out"))
+  assert res == [Path("out/x.dict"), Path("out/y.dict")]
+
+
+def test_get_dictionary_paths__adds_given_compression():
+  res = get_dictionary_paths([Path("x.txt")], Path("out"), "bz2")
+  assert res == [Path("out/x.dict.bz2")]
@@ -0,0 +1,45 @@
+import json
+
+from dict_from_dragonmapper.cache import CacheStats
+from dict_from_dragonmapper.metrics import ChunkStats, RunMetrics, save_metrics
+
+
+def test_measure_sums_up_phase():
+  metrics = RunMetrics()
+  with metrics.measure("a"):
+    pass
+  with metrics.measure("a"):
+    pass
+  assert metrics.phases["a"].calls == 2
+  assert metrics.phases["a"].wall >= 0
+
+
+def test_iter_measured_returns_all_items():
+  metrics = RunMetrics()
+  res = list(metrics.iter_measured("a", [1, 2, 3]))
+  assert res == [1, 2, 3]
+  # includes the call which detected the end
+  assert metrics.phases["a"].calls == 4
+
+
+def test_add_chunk_aggregates_per_worker():
+  metrics = RunMetrics()
+  metrics.add_chunk(ChunkStats(1, 10, 0.5, 0.25, CacheStats(hits=1, misses=2, evictions=0)))
+  metrics.add_chunk(ChunkStats(1, 5, 0.5, 0.25, CacheStats(hits=3, misses=0, evictions=1)))
+  metrics.add_chunk(ChunkStats(2, 1, 0.1, 0.1))
+  assert metrics.words == 16
+  assert metrics.workers[1].chunks == 2
+  assert metrics.workers[1].words == 15
+  assert metrics.workers[1].wall == 1.0
+  assert metrics.workers[2].words == 1
+  assert metrics.syllable_cache_stats == CacheStats(hits=4, misses=2, evictions=1)
+
+
+def test_save_metrics_writes_json(tmp_path):
+  metrics = RunMetrics()
+  metrics.add_chunk(ChunkStats(1, 10, 0.5, 0.25))
+  path = tmp_path / "metrics.json"
+  save_metrics(metrics, path)
+  res = json.loads(path.read_text(encoding="UTF-8"))
+  assert res["words"] == 10
+  assert res["workers"]["1"]["words"] == 10
@@ -0,0 +1,73 @@
+from collections import OrderedDict
+from pathlib import Path
+
+from word_to_pronunciation import Options
+
+from dict_from_dragonmapper.persistent_cache import PersistentCache, get_options_key
+
+
+def test_added_words_are_returned_in_later_runs(tmp_path: Path):
+  path = tmp_path / "cache.db"
+  pronunciations = OrderedDict((
+    (("m", "a"), 1.0),
+    (("m", "a˧˥"), 0.5),
+  ))
+  with PersistentCache(path, "options", None) as cache:
+    cache.add_many([("吗", pronunciations), ("x", OrderedDict())])
+
+  with PersistentCache(path, "options", None) as cache:
+    res = cache.get_many(["吗", "x", "y"])
+
+  assert res == {
+    "吗": pronunciations,
+    "x": OrderedDict(),
+  }
+  assert list(res["吗"].items()) == list(pronunciations.items())
+
+
+def test_words_of_other_options_are_not_returned(tmp_path: Path):
+  path = tmp_path / "cache.db"
+  with PersistentCache(path, "options1", None) as cache:
+    cache.add_many([("吗", OrderedDict(((("m", "a"), 1.0),)))])
+
+  with PersistentCache(path, "options2", None) as cache:
+    res = cache.get_many(["吗"])
+
+  assert res == {}
+
+
+def test_least_recently_used_words_are_pruned(tmp_path: Path):
+  path = tmp_path / "cache.db"
+  pronunciations = OrderedDict(((("a",), 1.0),))
+  with PersistentCache(path, "options", 2) as cache:
+    cache.add_many([("a", pronunciations), ("b", pronunciations)])
+    cache.touch_many(["a"])
+    cache.add_many([("c", pronunciations)])
+    cache.prune(2)
+    res = cache.get_many(["a", "b", "c"])
+
+  assert set(res) == {"a", "c"}
+
+
+def test_read_only_cache_returns_added_words(tmp_path: Path):
+  path = tmp_path / "cache.db"
+  pronunciations = OrderedDict(((("a",), 1.0),))
+  with PersistentCache(path, "options", None) as cache:
+    cache.add_many([("a", pronunciations)])
+    with PersistentCache(path, "options", None, read_only=True) as read_only_cache:
+      assert read_only_cache.get_many(["a", "b"]) == {"a": pronunciations}
+
+
+def test_words_of_other_transcription_hash_are_not_returned(tmp_path: Path):
+  path = tmp_path / "cache.db"
+  options = Options("?,\".", True, False, False, 1.0)
+  options_key1 = get_options_key(options, 1.0, None, "0123456789abcdef")
+  options_key2 = get_options_key(options, 1.0, None, "fedcba9876543210")
+  with PersistentCache(path, options_key1, None) as cache:
+    cache.add_many([("吗", OrderedDict(((("m", "a"), 1.0),)))])
+
+  with PersistentCache(path, options_key2, None) as cache:
+    res = cache.get_many(["吗"])
+
+  assert options_key1 != options_key2
+  assert res == {}
@@ -0,0 +1,28 @@
+import gzip
+from pathlib import Path
+
+from dict_from_dragonmapper.shards import get_shard_range, merge_files
+
+
+def test_get_shard_range__shards_cover_all_words_once():
+  ranges = [get_shard_range(10, shard, 3) for shard in range(1, 4)]
+  assert ranges == [(0, 3), (3, 6), (6, 10)]
+
+
+def test_get_shard_range__more_shards_than_words_returns_empty_shards():
+  ranges = [get_shard_range(1, shard, 3) for shard in range(1, 4)]
+  assert ranges == [(0, 0), (0, 0), (0, 1)]
+
+
+def test_merge_files__joins_lines_and_skips_empty_files(tmp_path: Path):
+  paths = [tmp_path / "1.dict", tmp_path / "2.dict", tmp_path / "3.dict"]
+  paths[0].write_text("a  a\nb  b", "UTF-8")
+  paths[1].write_text("", "UTF-8")
+  paths[2].write_text("c  c", "UTF-8")
+  output_path = tmp_path / "result.dict.gz"
+
+  res = merge_files(paths, output_path, "UTF-8")
+
+  assert res == 2
+  with gzip.open(output_path, mode="rt", encoding="UTF-8") as file:
+    assert file.read() == "a  a\nb  b\nc  c"
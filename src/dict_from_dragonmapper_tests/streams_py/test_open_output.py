@@ -0,0 +1,31 @@
+import gzip
+import lzma
+from pathlib import Path
+
+import pytest
+
+from dict_from_dragonmapper.streams import open_input, open_output
+
+
+@pytest.mark.parametrize("extension", [".gz", ".bz2", ".xz", ".txt"])
+def test_written_text_is_read_again(tmp_path: Path, extension: str):
+  path = tmp_path / f"test{extension}"
+  with open_output(path, "UTF-8") as file:
+    file.write("北风\n吗")
+  with open_input(path, "UTF-8") as file:
+    res = file.read()
+  assert res == "北风\n吗"
+
+
+def test_compression_is_detected_from_extension(tmp_path: Path):
+  path = tmp_path / "sub" / "test.GZ"
+  with open_output(path, "UTF-8") as file:
+    file.write("北风")
+  assert gzip.decompress(path.read_bytes()) == "北风".encode("UTF-8")
+
+
+def test_given_compression_overrides_extension(tmp_path: Path):
+  path = tmp_path / "test.txt"
+  with open_output(path, "UTF-8", "xz") as file:
+    file.write("北风")
+  assert lzma.decompress(path.read_bytes()) == "北风".encode("UTF-8")
@@ -0,0 +1,26 @@
+import pytest
+from ordered_set import OrderedSet
+from word_to_pronunciation import Options
+
+from dict_from_dragonmapper.main import get_pronunciations
+from dict_from_dragonmapper.transcriber import Transcriber
+
+
+def test_pool_is_reused_for_multiple_calls():
+  options = Options("?,\".", True, False, False, 1.0)
+  vocabularies = [
+    OrderedSet(("社会语言学?", "x", "鲜-亮.")),
+    OrderedSet(("㐻,", "\"㑐", "y")),
+  ]
+  with Transcriber(1) as transcriber:
+    for vocabulary in vocabularies:
+      res = transcriber.get_pronunciations(vocabulary, 1.0, options, 2)
+      assert res == get_pronunciations(vocabulary, 1.0, options, 1, None, 2)
+  assert transcriber.is_closed
+
+
+def test_closed_transcriber_raises_error():
+  transcriber = Transcriber(1)
+  transcriber.close()
+  with pytest.raises(ValueError):
+    transcriber.iter_pronunciations(OrderedSet(("x",)), 1.0, Options("", False, False, False, 1.0), 1)
@@ -0,0 +1,24 @@
+from dict_from_dragonmapper.transcription import (build_pinyin_table, get_all_pinyin,
+                                                  transcribe_pinyin_to_ipa)
+
+
+def test_contains_all_tones_of_a_syllable():
+  res = build_pinyin_table()
+  assert res["mā"] == ("m", "a˥")
+  assert res["má"] == ("m", "a˧˥")
+  assert res["mǎ"] == ("m", "a˧˩˧")
+  assert res["mà"] == ("m", "a˥˩")
+  assert res["ma"] == ("m", "a")
+
+
+def test_pinyin_which_can_not_be_transcribed_are_not_contained():
+  res = build_pinyin_table()
+  assert "hng" in get_all_pinyin()
+  assert "hng" not in res
+
+
+def test_all_entries_match_transcription():
+  res = build_pinyin_table()
+  assert len(res) > 1600
+  for pinyin, pinyin_IPA in res.items():
+    assert pinyin_IPA == transcribe_pinyin_to_ipa(pinyin)
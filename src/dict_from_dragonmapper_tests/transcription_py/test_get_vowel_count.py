@@ -0,0 +1,6 @@
+from dict_from_dragonmapper.transcription import get_vowel_count
+
+
+def test_diphthongs_and_schwas_are_counted_once():
+  res = get_vowel_count(("ʂ", "aɪ", "n", "ə", "ɪ˥"))
+  assert res == 2
@@ -0,0 +1,15 @@
+from dict_from_dragonmapper.transcription import is_transcribable
+
+
+def test_chinese_word__returns_true():
+  assert is_transcribable("北风")
+
+
+def test_latin_digits_and_emojis__return_false():
+  assert not is_transcribable("abc")
+  assert not is_transcribable("2023")
+  assert not is_transcribable("😀")
+
+
+def test_chinese_word_with_punctuation__returns_false():
+  assert not is_transcribable("北风。")
@@ -0,0 +1,63 @@
+from itertools import islice
+
+from dict_from_dragonmapper.transcription import iter_unique_combinations
+
+
+def test_combinations_of_first_readings_come_first():
+  res = list(iter_unique_combinations([
+    (("a",), ("b",)),
+    (("c",), ("d",)),
+  ]))
+  assert res == [("a", "c"), ("a", "d"), ("b", "c"), ("b", "d")]
+
+
+def test_combinations_are_yielded_in_product_order():
+  res = list(iter_unique_combinations([
+    (("a",), ("b",)),
+    (("c",), ("d",), ("e",)),
+  ]))
+  assert res == [
+    ("a", "c"),
+    ("a", "d"),
+    ("a", "e"),
+    ("b", "c"),
+    ("b", "d"),
+    ("b", "e"),
+  ]
+
+
+def test_ranked__combinations_are_ranked_by_sum_of_reading_indices():
+  res = list(iter_unique_combinations([
+    (("a",), ("b",)),
+    (("c",), ("d",), ("e",)),
+  ], ranked=True))
+  assert res == [
+    ("a", "c"),
+    ("a", "d"),
+    ("b", "c"),
+    ("a", "e"),
+    ("b", "d"),
+    ("b", "e"),
+  ]
+
+
+def test_ranked__later_readings_of_first_syllable_are_reached_early():
+  syllables_IPAs = [(("a",), ("b",))] + [(("c",), ("d",))] * 30
+  res = list(islice(iter_unique_combinations(syllables_IPAs, ranked=True), 32))
+  assert ("b",) + ("c",) * 30 in res
+
+
+def test_duplicate_combinations_are_removed():
+  res = list(iter_unique_combinations([
+    (("a",), ("a", "n")),
+    (("n", "a"), ("a",)),
+  ]))
+  assert res == [("a", "n", "a"), ("a", "a"), ("a", "n", "n", "a")]
+
+
+def test_ranked__duplicate_combinations_are_removed():
+  res = list(iter_unique_combinations([
+    (("a",), ("a", "n")),
+    (("n", "a"), ("a",)),
+  ], ranked=True))
+  assert res == [("a", "n", "a"), ("a", "a"), ("a", "n", "n", "a")]
@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from logging import getLogger
 from pathlib import Path
 
@@ -5,7 +7,8 @@ from ordered_set import OrderedSet
 from pytest import raises
 from tqdm import tqdm
 
-from dict_from_dragonmapper.transcription import pinyin_to_ipa, syllable_to_pinyin
+from dict_from_dragonmapper.transcription import (pinyin_to_ipa, syllable_to_pinyin,
+                                                  try_transcribe_pinyin_to_ipa)
 
 
 def test_晒_transcribes_ai_to_aɪ():
@@ -38,6 +41,29 @@ def test_english_alphabet_raises_value_error():
   assert error.value.args[0] == 'IPA couldn\'t be retrieved from Pinyin ("X")!'
 
 
+def test_try__lèn_with_tones_before_consonant_returns_none():
+  # 啉
+  res = try_transcribe_pinyin_to_ipa("lèn")
+  assert res is None
+
+
+def test_try__r1_with_tones_without_vowel_returns_none():
+  res = try_transcribe_pinyin_to_ipa("r1")
+  assert res is None
+
+
+def test_try__invalid_ipa_returns_none_without_assertions():
+  code = (
+    "from dict_from_dragonmapper.transcription import try_transcribe_pinyin_to_ipa\n"
+    "print(try_transcribe_pinyin_to_ipa('lèn'), try_transcribe_pinyin_to_ipa('r1'))"
+  )
+  process = subprocess.run(
+    [sys.executable, "-O", "-c", code],
+    capture_output=True, check=True, text=True,
+  )
+  assert process.stdout == "None None\n"
+
+
 def test_all_transcribed_syllables_from_test_vocabulary_contain_valid_IPA():
   voc = Path("res/test-vocabulary.txt").read_text("UTF-8")
   voc_syllables = {syllable for syllable in voc if syllable not in {"\n", "。", "？"}}
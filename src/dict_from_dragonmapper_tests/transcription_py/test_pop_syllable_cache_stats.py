@@ -0,0 +1,22 @@
+from dict_from_dragonmapper import transcription
+from dict_from_dragonmapper.cache import CacheStats
+from dict_from_dragonmapper.transcription import (DEFAULT_SYLLABLE_CACHE_SIZE,
+                                                  configure_syllable_cache, get_syllable_ipa,
+                                                  pop_syllable_cache_stats, set_hanzi_table)
+
+
+def test_syllables_of_hanzi_table_are_counted_as_table_hits():
+  previous_table = transcription.HANZI_TABLE
+  configure_syllable_cache(10)
+  set_hanzi_table({"北": (("p", "eɪ˧˩˧"),)})
+  pop_syllable_cache_stats()
+  try:
+    get_syllable_ipa("北")
+    get_syllable_ipa("风")
+    get_syllable_ipa("风")
+    res = pop_syllable_cache_stats()
+  finally:
+    set_hanzi_table(previous_table)
+    configure_syllable_cache(DEFAULT_SYLLABLE_CACHE_SIZE)
+  assert res == CacheStats(hits=1, misses=1, evictions=0, table_hits=1)
+  assert pop_syllable_cache_stats() == CacheStats()
@@ -0,0 +1,18 @@
+import pytest
+
+from dict_from_dragonmapper.transcription import separate_syllable_ipa_into_phonemes_and_tones
+
+
+def test_tones_are_separated():
+  res = separate_syllable_ipa_into_phonemes_and_tones("ʂai˥˩")
+  assert res == ("ʂai", "˥˩")
+
+
+def test_without_tones_returns_empty_tones():
+  res = separate_syllable_ipa_into_phonemes_and_tones("ʂai")
+  assert res == ("ʂai", "")
+
+
+def test_characters_after_tones_raise_error():
+  with pytest.raises(AssertionError):
+    separate_syllable_ipa_into_phonemes_and_tones("ʂa˥i")
@@ -1,7 +1,10 @@
 
+import itertools
+
 from ordered_set import OrderedSet
+from pytest import raises
 
-from dict_from_dragonmapper.transcription import word_to_ipa
+from dict_from_dragonmapper.transcription import syllable_to_ipa, try_word_to_ipa, word_to_ipa
 
 
 def test_晒吗_returns_two_entries():
@@ -20,3 +23,55 @@ def test_北风嗯_returns_two_entries():
     ('p', 'eɪ˥˩', 'f', 'ɤ˥', 'ŋ', 'n'),
     ('p', 'eɪ˥˩', 'f', 'ɤ˥', 'ŋ', 'ŋ')
   ])
+
+
+def test_polyphonic_word_without_max_returns_entries_in_product_order():
+  # the order is the same as before the pronunciations could be limited
+  word = "行重长和"
+  res = word_to_ipa(word)
+  assert list(res) == list(OrderedSet(
+    tuple(itertools.chain.from_iterable(combination))
+    for combination in itertools.product(*map(syllable_to_ipa, word))
+  ))
+
+
+def test_polyphonic_word_with_max_varies_readings_of_first_syllable():
+  word = "行重长和"
+  res = word_to_ipa(word, max_pronunciations=len(word) + 1)
+  assert len({pronunciation[:2] for pronunciation in res}) > 1
+
+
+def test_晒吗_max_one_returns_first_entry():
+  res = word_to_ipa("晒吗", max_pronunciations=1)
+  assert res == OrderedSet([
+    ('ʂ', 'aɪ˥˩', 'm', 'a'),
+  ])
+
+
+def test_long_polyphonic_word_max_two_returns_two_entries():
+  res = word_to_ipa("行重长和" * 20, max_pronunciations=2)
+  assert len(res) == 2
+
+
+def test_untranscribable_syllable_raises_value_error():
+  with raises(ValueError) as error:
+    word_to_ipa("北x")
+  assert error.value.args[0] == "Syllable \"x\" couldn't be transcribed!"
+  assert error.value.__cause__.args[0] == "Pinyin couldn't be retrieved from syllable 'x'!"
+
+
+def test_try__untranscribable_syllable_returns_none():
+  assert try_word_to_ipa("北x") is None
+
+
+def test_try__returns_same_entries():
+  assert try_word_to_ipa("晒吗", max_pronunciations=1) == word_to_ipa("晒吗", max_pronunciations=1)
+
+
+def test_try__啉_skips_pinyin_failing_on_assertion():
+  # the pinyin "lèn" fails on an assertion
+  res = try_word_to_ipa("啉")
+  assert res == OrderedSet([
+    ('l', 'a˧˥', 'n'),
+    ('l', 'i˧˥', 'n'),
+  ])
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+from ordered_set import OrderedSet
+
+from dict_from_dragonmapper.vocabulary import iter_vocabularies, read_vocabularies, read_vocabulary
+
+
+def test_duplicates_are_removed(tmp_path: Path):
+  path = tmp_path / "vocabulary.txt"
+  path.write_text("北风\n吗\n北风\n", "UTF-8")
+  res = read_vocabulary(path, "UTF-8")
+  assert res == OrderedSet(("北风", "吗"))
+
+
+def test_same_lines_as_splitlines(tmp_path: Path):
+  content = "a\r\nb\rc\n\nd\x1ce f\n\ng"
+  path = tmp_path / "vocabulary.txt"
+  path.write_bytes(content.encode("UTF-8"))
+  res = read_vocabulary(path, "UTF-8")
+  assert res == OrderedSet(content.splitlines())
+
+
+def test_iter_vocabularies__yields_unique_words_in_order(tmp_path: Path):
+  path1 = tmp_path / "vocabulary1.txt"
+  path1.write_text("北风\n吗\n北风\r\n吗\n是", "UTF-8")
+  path2 = tmp_path / "vocabulary2.txt"
+  path2.write_text("吗\n不", "UTF-8")
+  res = list(iter_vocabularies([path1, path2], "UTF-8"))
+  assert res == ["北风", "吗", "是", "不"]
+
+
+def test_read_vocabularies__removes_duplicates_across_files(tmp_path: Path):
+  path1 = tmp_path / "vocabulary1.txt"
+  path1.write_text("北风\n吗", "UTF-8")
+  path2 = tmp_path / "vocabulary2.txt"
+  path2.write_text("是\n北风\n", "UTF-8")
+  res = read_vocabularies([path1, path2], "UTF-8")
+  assert res == OrderedSet(("北风", "吗", "是"))